@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field
@@ -50,6 +51,17 @@ class BaseModelAdapter(ABC):
         """
         pass
 
+    async def agenerate(self, prompt: str, **kwargs) -> ModelResponse:
+        """
+        Async variant of generate.
+
+        The default runs the blocking generate in a worker thread so adapters
+        without a native async client (e.g. DummyAdapter) can still be driven
+        from an asyncio engine. HTTP adapters override this with a pooled
+        httpx.AsyncClient.
+        """
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
 class BaseVisionAdapter(BaseModelAdapter):
     """
     Abstract base class for vision model adapters (T2I).
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import weakref
+from typing import Dict
+import httpx
+
+# Connection limits for the shared async clients. Sized so a single process can
+# keep a few hundred requests in flight without opening a socket per request.
+ASYNC_POOL_LIMITS = httpx.Limits(
+    max_connections=256,
+    max_keepalive_connections=64,
+    keepalive_expiry=30.0,
+)
+
+# httpx.AsyncClient is bound to the event loop it was first used on, so pools are
+# kept per loop and dropped together with it.
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+def get_async_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Returns the pooled AsyncClient for base_url on the running event loop.
+
+    Clients carry no credentials; adapters pass their headers per request so
+    several adapters (or API keys) can share one pool per endpoint.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _loop_clients.setdefault(loop, {})
+        client = clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                http2=True,
+                limits=ASYNC_POOL_LIMITS,
+            )
+            clients[base_url] = client
+        return client
+
+async def aclose_async_clients():
+    """
+    Closes every pooled client owned by the running event loop.
+    Call this before the loop shuts down (e.g. at the end of asyncio.run).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _loop_clients.pop(loop, {})
+    for client in clients.values():
+        await client.aclose()
@@ -3,26 +3,66 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from core.settings import settings
 from adapters.base import BaseModelAdapter, ModelResponse
+from adapters.http_pool import get_async_client
+from adapters.rate_limit import get_rate_limiter
 
 class MarberAdapter(BaseModelAdapter):
     """
     Adapter for Marber API (Gateway/Proxy).
     """
-    
+
     def __init__(self, model_name: str, **kwargs):
         super().__init__(model_name, **kwargs)
         self.api_key = settings.MARBER_API_KEY
         self.base_url = settings.MARBER_API_URL
-        
+
         headers = {}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
         headers["Content-Type"] = "application/json"
-            
+        self.headers = headers
+        self.timeout = kwargs.get("timeout", 30.0)
+
+        self.rate_limiter = get_rate_limiter("marber")
         self.client = httpx.Client(
             base_url=self.base_url,
             headers=headers,
-            timeout=kwargs.get("timeout", 30.0)
+            timeout=self.timeout
+        )
+
+    def _build_payload(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "prompt": prompt, # Assuming Marber accepts a simple prompt or messages
+            # If Marber follows OpenAI chat format, we might need to wrap in messages
+            # For now, assuming a generic payload based on prompt description
+            "messages": [{"role": "user", "content": prompt}],
+            "parameters": {
+                "temperature": kwargs.get("temperature", 0.0),
+                "max_tokens": kwargs.get("max_tokens", 1000),
+            }
+        }
+
+    def _parse_response(self, data: Dict[str, Any]) -> ModelResponse:
+        # Normalize Response: text + raw + usage
+        # Assuming standard response format or mapping it
+        content = ""
+        if "choices" in data and len(data["choices"]) > 0:
+             content = data["choices"][0]["message"]["content"]
+        elif "text" in data:
+             content = data["text"]
+
+        usage = data.get("usage", {})
+
+        return ModelResponse(
+            content=content,
+            raw_output=data,
+            metadata={
+                "usage": usage,
+                "provider": "marber",
+                "request_id": data.get("id")
+            },
+            model_name=self.model_name
         )
 
     @retry(
@@ -36,51 +76,36 @@ class MarberAdapter(BaseModelAdapter):
         Generates a response using Marber API.
         Payload structure assumed to be model-agnostic but similar to common standards.
         """
-        payload = {
-            "model": self.model_name,
-            "prompt": prompt, # Assuming Marber accepts a simple prompt or messages
-            # If Marber follows OpenAI chat format, we might need to wrap in messages
-            # For now, assuming a generic payload based on prompt description
-            "messages": [{"role": "user", "content": prompt}], 
-            "parameters": {
-                "temperature": kwargs.get("temperature", 0.0),
-                "max_tokens": kwargs.get("max_tokens", 1000),
-            }
-        }
-        
-        try:
-            # Assuming Marber endpoint is /chat/completions or similar
-            # Adjusting to generic /generate or similar if specified. 
-            # Prompt doesn't specify Marber endpoint structure, assuming standard /v1/chat/completions compatible or custom
-            # Prompt says: "payload: prompt + parameters + requested model"
-            
-            # Let's assume a generic endpoint since it's a proxy
+        payload = self._build_payload(prompt, **kwargs)
+        estimated_tokens = self.rate_limiter.estimate_tokens(prompt, kwargs.get("max_tokens", 1000))
+
+        # 429/503 shrink the provider's concurrency window and pause admissions
+        # until Retry-After; tenacity then retries through the limiter.
+        with self.rate_limiter.limit(estimated_tokens) as slot:
+            # Assuming a generic OpenAI-compatible endpoint since it's a proxy
             response = self.client.post("/chat/completions", json=payload)
             response.raise_for_status()
             data = response.json()
-            
-            # Normalize Response: text + raw + usage
-            # Assuming standard response format or mapping it
-            content = ""
-            if "choices" in data and len(data["choices"]) > 0:
-                 content = data["choices"][0]["message"]["content"]
-            elif "text" in data:
-                 content = data["text"]
-            
-            usage = data.get("usage", {})
-            
-            return ModelResponse(
-                content=content,
-                raw_output=data,
-                metadata={
-                    "usage": usage,
-                    "provider": "marber",
-                    "request_id": data.get("id")
-                },
-                model_name=self.model_name
-            )
-            
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                pass 
-            raise e
+            slot.tokens_used = data.get("usage", {}).get("total_tokens")
+        return self._parse_response(data)
+
+    @retry(
+        retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True
+    )
+    async def agenerate(self, prompt: str, **kwargs) -> ModelResponse:
+        """
+        Generates a response using Marber API over the shared async pool.
+        """
+        payload = self._build_payload(prompt, **kwargs)
+        estimated_tokens = self.rate_limiter.estimate_tokens(prompt, kwargs.get("max_tokens", 1000))
+        client = get_async_client(self.base_url)
+
+        async with self.rate_limiter.alimit(estimated_tokens) as slot:
+            response = await client.post("/chat/completions", json=payload, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+            slot.tokens_used = data.get("usage", {}).get("total_tokens")
+        return self._parse_response(data)
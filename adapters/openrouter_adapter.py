@@ -3,27 +3,59 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from core.settings import settings
 from adapters.base import BaseModelAdapter, ModelResponse
+from adapters.http_pool import get_async_client
+from adapters.rate_limit import get_rate_limiter
 
 class OpenRouterAdapter(BaseModelAdapter):
     """
     Adapter for OpenRouter API.
     Compatible with OpenAI's Chat Completions API but allows for provider routing.
     """
-    
+
     def __init__(self, model_name: str, **kwargs):
         super().__init__(model_name, **kwargs)
         self.api_key = settings.OPENROUTER_API_KEY
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable is not set.")
         self.base_url = settings.OPENROUTER_BASE_URL
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "https://semantiq.benchmarks", # Required by OpenRouter
+            "X-Title": "SemantIQ Benchmarks", # Optional
+        }
+        self.timeout = kwargs.get("timeout", 30.0)
+        self.rate_limiter = get_rate_limiter("openrouter")
         self.client = httpx.Client(
             base_url=self.base_url,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "HTTP-Referer": "https://semantiq.benchmarks", # Required by OpenRouter
-                "X-Title": "SemantIQ Benchmarks", # Optional
+            headers=self.headers,
+            timeout=self.timeout
+        )
+
+    def _build_payload(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        # Pass through other kwargs that might be relevant for OpenRouter
+        # (e.g. top_p, repetition_penalty if supported by the underlying model)
+        return {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": kwargs.get("temperature", 0.0),
+            "max_tokens": kwargs.get("max_tokens", 1000),
+        }
+
+    def _parse_response(self, data: Dict[str, Any]) -> ModelResponse:
+        # OpenRouter response structure is similar to OpenAI
+        content = data["choices"][0]["message"]["content"]
+        usage = data.get("usage", {})
+
+        return ModelResponse(
+            content=content,
+            raw_output=data,
+            metadata={
+                "usage": usage,
+                "finish_reason": data["choices"][0].get("finish_reason"),
+                "request_id": data.get("id"),
+                "provider": "openrouter"
             },
-            timeout=kwargs.get("timeout", 30.0)
+            model_name=self.model_name
         )
 
     @retry(
@@ -36,38 +68,35 @@ class OpenRouterAdapter(BaseModelAdapter):
         """
         Generates a response using OpenRouter.
         """
-        payload = {
-            "model": self.model_name,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": kwargs.get("temperature", 0.0),
-            "max_tokens": kwargs.get("max_tokens", 1000),
-        }
-        
-        # Pass through other kwargs that might be relevant for OpenRouter
-        # (e.g. top_p, repetition_penalty if supported by the underlying model)
-        
-        try:
+        payload = self._build_payload(prompt, **kwargs)
+        estimated_tokens = self.rate_limiter.estimate_tokens(prompt, kwargs.get("max_tokens", 1000))
+
+        # 429/503 shrink the provider's concurrency window and pause admissions
+        # until Retry-After; tenacity then retries through the limiter.
+        with self.rate_limiter.limit(estimated_tokens) as slot:
             response = self.client.post("/chat/completions", json=payload)
             response.raise_for_status()
             data = response.json()
-            
-            # OpenRouter response structure is similar to OpenAI
-            content = data["choices"][0]["message"]["content"]
-            usage = data.get("usage", {})
-            
-            return ModelResponse(
-                content=content,
-                raw_output=data,
-                metadata={
-                    "usage": usage,
-                    "finish_reason": data["choices"][0].get("finish_reason"),
-                    "request_id": data.get("id"),
-                    "provider": "openrouter"
-                },
-                model_name=self.model_name
-            )
-            
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                pass # Tenacity handles this
-            raise e
+            slot.tokens_used = data.get("usage", {}).get("total_tokens")
+        return self._parse_response(data)
+
+    @retry(
+        retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True
+    )
+    async def agenerate(self, prompt: str, **kwargs) -> ModelResponse:
+        """
+        Generates a response using OpenRouter over the shared async pool.
+        """
+        payload = self._build_payload(prompt, **kwargs)
+        estimated_tokens = self.rate_limiter.estimate_tokens(prompt, kwargs.get("max_tokens", 1000))
+        client = get_async_client(self.base_url)
+
+        async with self.rate_limiter.alimit(estimated_tokens) as slot:
+            response = await client.post("/chat/completions", json=payload, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+            slot.tokens_used = data.get("usage", {}).get("total_tokens")
+        return self._parse_response(data)
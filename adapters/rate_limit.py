@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+import httpx
+from core.settings import settings
+
+# Status codes treated as a congestion signal (multiplicative decrease).
+THROTTLE_STATUS_CODES = (429, 503)
+# Pause applied on a throttle response without a usable Retry-After header.
+DEFAULT_THROTTLE_PAUSE = 5.0
+
+def parse_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """
+    Returns the Retry-After delay in seconds (delta-seconds or HTTP-date form).
+    """
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RequestSlot:
+    """
+    Handle for one admitted request. Set tokens_used from the provider's usage
+    report so the token budget is corrected for the real cost.
+    """
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.tokens_used: Optional[int] = None
+
+class ProviderRateLimiter:
+    """
+    Per-provider admission control shared by every adapter instance.
+
+    Two token buckets enforce the requests/min and tokens/min budgets, and an
+    AIMD window bounds in-flight requests: each success grows the window by
+    roughly one slot per window's worth of requests, while a 429/503 halves it
+    and pauses all admissions until Retry-After has elapsed. Works from
+    threads (acquire) and coroutines (aacquire) alike.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        initial_concurrency: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(initial_concurrency or max(min_concurrency, max_concurrency // 2))
+        self.in_flight = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        now = clock()
+        self._request_tokens = float(requests_per_minute)
+        self._token_tokens = float(tokens_per_minute)
+        self._last_refill = now
+        self._paused_until = now
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_tokens: int) -> int:
+        # ~4 characters per token for the prompt, plus the completion budget
+        return len(prompt) // 4 + max_tokens
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._request_tokens = min(self.requests_per_minute, self._request_tokens + elapsed * self.requests_per_minute / 60.0)
+            self._token_tokens = min(self.tokens_per_minute, self._token_tokens + elapsed * self.tokens_per_minute / 60.0)
+            self._last_refill = now
+
+    def try_acquire(self, estimated_tokens: int) -> float:
+        """
+        Admits the request if possible and returns 0.0; otherwise returns how
+        long to wait before trying again.
+        """
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.in_flight >= int(self.concurrency):
+                return 0.05
+            self._refill(now)
+            # A request larger than the whole budget is admitted on a full bucket
+            needed_tokens = min(estimated_tokens, self.tokens_per_minute)
+            waits = []
+            if self._request_tokens < 1:
+                waits.append((1 - self._request_tokens) * 60.0 / self.requests_per_minute)
+            if self._token_tokens < needed_tokens:
+                waits.append((needed_tokens - self._token_tokens) * 60.0 / self.tokens_per_minute)
+            if waits:
+                return max(waits)
+            self._request_tokens -= 1
+            self._token_tokens -= estimated_tokens
+            self.in_flight += 1
+            return 0.0
+
+    def release(self, slot: RequestSlot, response: Optional[httpx.Response] = None, failed: bool = False):
+        """
+        Returns the slot and feeds the outcome into the AIMD window.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if slot.tokens_used is not None:
+                # Refund (or charge) the difference to the estimate
+                self._token_tokens = min(self.tokens_per_minute, self._token_tokens + slot.estimated_tokens - slot.tokens_used)
+
+            status = response.status_code if response is not None else None
+            if status in THROTTLE_STATUS_CODES:
+                self.concurrency = max(float(self.min_concurrency), self.concurrency / 2)
+                pause = parse_retry_after(response)
+                self._paused_until = max(self._paused_until, self._clock() + (pause if pause is not None else DEFAULT_THROTTLE_PAUSE))
+            elif not failed:
+                self.concurrency = min(float(self.max_concurrency), self.concurrency + 1.0 / self.concurrency)
+
+    def acquire(self, estimated_tokens: int) -> RequestSlot:
+        while True:
+            wait = self.try_acquire(estimated_tokens)
+            if wait <= 0:
+                return RequestSlot(estimated_tokens)
+            time.sleep(wait)
+
+    async def aacquire(self, estimated_tokens: int) -> RequestSlot:
+        while True:
+            wait = self.try_acquire(estimated_tokens)
+            if wait <= 0:
+                return RequestSlot(estimated_tokens)
+            await asyncio.sleep(wait)
+
+    @contextmanager
+    def limit(self, estimated_tokens: int):
+        slot = self.acquire(estimated_tokens)
+        try:
+            yield slot
+        except httpx.HTTPStatusError as e:
+            self.release(slot, e.response, failed=True)
+            raise
+        except BaseException:
+            self.release(slot, failed=True)
+            raise
+        else:
+            self.release(slot)
+
+    @asynccontextmanager
+    async def alimit(self, estimated_tokens: int):
+        slot = await self.aacquire(estimated_tokens)
+        try:
+            yield slot
+        except httpx.HTTPStatusError as e:
+            self.release(slot, e.response, failed=True)
+            raise
+        except BaseException:
+            self.release(slot, failed=True)
+            raise
+        else:
+            self.release(slot)
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """
+    Returns the process-wide limiter for a provider, configured from
+    <PROVIDER>_REQUESTS_PER_MINUTE / _TOKENS_PER_MINUTE / _MAX_CONCURRENCY.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            prefix = provider.upper()
+            limiter = ProviderRateLimiter(
+                requests_per_minute=getattr(settings, f"{prefix}_REQUESTS_PER_MINUTE"),
+                tokens_per_minute=getattr(settings, f"{prefix}_TOKENS_PER_MINUTE"),
+                max_concurrency=getattr(settings, f"{prefix}_MAX_CONCURRENCY"),
+            )
+            _limiters[provider] = limiter
+        return limiter
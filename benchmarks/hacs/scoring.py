@@ -1,7 +1,10 @@
 import re
 import statistics
 import math
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Any, Optional, Tuple
 from pydantic import BaseModel, Field
 
 # --- Data Models ---
@@ -33,12 +36,82 @@ class OverallReport(BaseModel):
     maturity_level: str
     module_summaries: Dict[str, ModuleAggregation]
 
+# --- Shared Lexical Features ---
+
+@dataclass(frozen=True)
+class LexicalFeatures:
+    """
+    Everything the heuristic scorers read from a response, computed once.
+    """
+    text: str
+    lower: str
+    words: List[str]
+    word_count: int
+    unique_word_count: int
+    is_lower: bool
+    line_count: int
+    line_lengths: List[int]  # lengths of the non-blank lines
+    marker_hits: FrozenSet[str]
+
+    def has(self, marker: str) -> bool:
+        return marker in self.marker_hits
+
+class LexicalFeatureExtractor:
+    """
+    Builds LexicalFeatures for a fixed set of markers. Markers are literal
+    substrings looked up in the lowercased response; raw_markers are matched
+    case-sensitively against the response as-is. Each distinct marker is
+    looked up once per response, however many scorers use it.
+    """
+
+    def __init__(self, markers: Iterable[str] = (), raw_markers: Iterable[str] = ()):
+        self.markers = tuple(sorted(set(markers)))
+        self.raw_markers = tuple(sorted(set(raw_markers)))
+
+    def extract(self, response: str) -> LexicalFeatures:
+        lower = response.lower()
+        words = response.split()
+        lines = response.split('\n')
+        # Substring search runs in C; it beats a combined regex scan here
+        hits = [m for m in self.markers if m in lower]
+        hits.extend(m for m in self.raw_markers if m in response)
+        return LexicalFeatures(
+            text=response,
+            lower=lower,
+            words=words,
+            word_count=len(words),
+            unique_word_count=len(set(words)),
+            is_lower=response.islower(),
+            line_count=len(lines),
+            line_lengths=[len(l) for l in lines if l.strip()],
+            marker_hits=frozenset(hits),
+        )
+
+@lru_cache(maxsize=None)
+def get_feature_extractor(markers: Tuple[str, ...], raw_markers: Tuple[str, ...] = ()) -> LexicalFeatureExtractor:
+    return LexicalFeatureExtractor(markers, raw_markers)
+
 # --- Base Scorer ---
 
 class HACSBaseScorer:
-    def score(self, response: str, question: Dict[str, Any]) -> ScoreDetail:
+    # Lowercase substrings looked up in the lowercased response
+    markers: Tuple[str, ...] = ()
+    # Substrings matched case-sensitively in the raw response
+    raw_markers: Tuple[str, ...] = ()
+
+    def score(self, response: str, question: Dict[str, Any], features: Optional[LexicalFeatures] = None) -> ScoreDetail:
+        """
+        Scores one response. features, when given, must come from an
+        extractor covering this scorer's markers (HACSScoringEngine passes
+        one shared instance to every scorer); otherwise they are computed.
+        """
         raise NotImplementedError
 
+    def get_features(self, response: str, features: Optional[LexicalFeatures] = None) -> LexicalFeatures:
+        if features is None:
+            features = get_feature_extractor(self.markers, self.raw_markers).extract(response)
+        return features
+
 # --- Heuristic Scorers (MVP) ---
 
 class ClarityScorer(HACSBaseScorer):
@@ -46,15 +119,17 @@ class ClarityScorer(HACSBaseScorer):
     Evaluates conceptual clarity and precision.
     Heuristic: Readability, sentence structure, lack of ambiguity markers.
     """
-    def score(self, response: str, question: Dict[str, Any]) -> ScoreDetail:
-        text = response.strip()
-        if not text:
+    vague_markers = ("maybe", "sort of", "kind of", "stuff", "things", "basically")
+    markers = vague_markers
+
+    def score(self, response: str, question: Dict[str, Any], features: Optional[LexicalFeatures] = None) -> ScoreDetail:
+        features = self.get_features(response, features)
+        if not features.word_count:
             return ScoreDetail(score=0.0, flags=["empty_response"], notes="No response provided.")
 
         # Heuristic 1: Length check (too short = unclear/vague, too long = rambling)
         # Ideal length depends on question, but assuming standard paragraph (~50-150 words)
-        words = text.split()
-        word_count = len(words)
+        word_count = features.word_count
         
         score = 0.8  # Start with solid baseline
         flags = []
@@ -70,15 +145,14 @@ class ClarityScorer(HACSBaseScorer):
             notes_parts.append("Response is potentially verbose.")
 
         # Heuristic 2: Vague words
-        vague_markers = ["maybe", "sort of", "kind of", "stuff", "things", "basically"]
-        vague_count = sum(1 for w in vague_markers if w in text.lower())
+        vague_count = sum(1 for w in self.vague_markers if features.has(w))
         if vague_count > 2:
             score -= 0.1 * vague_count
             flags.append("vague_language")
             notes_parts.append(f"Found {vague_count} vague terms.")
 
         # Heuristic 3: Structural clarity (paragraphs, capitalization)
-        if text.islower():
+        if features.is_lower:
             score -= 0.2
             flags.append("bad_casing")
             notes_parts.append("Text lacks capitalization.")
@@ -94,23 +168,25 @@ class ConsistencyScorer(HACSBaseScorer):
     Evaluates internal coherence and absence of contradiction.
     Heuristic: Logical connectors, absence of "correction" markers mid-text.
     """
-    def score(self, response: str, question: Dict[str, Any]) -> ScoreDetail:
-        text = response.lower()
+    contradictions = ("actually no", "i meant", "sorry, i was wrong", "correction:")
+    connectors = ("therefore", "however", "consequently", "because", "thus")
+    markers = contradictions + connectors
+
+    def score(self, response: str, question: Dict[str, Any], features: Optional[LexicalFeatures] = None) -> ScoreDetail:
+        features = self.get_features(response, features)
         score = 0.8
         flags = []
         notes = []
 
         # Heuristic 1: Contradiction markers
-        contradictions = ["actually no", "i meant", "sorry, i was wrong", "correction:"]
-        for marker in contradictions:
-            if marker in text:
+        for marker in self.contradictions:
+            if features.has(marker):
                 score -= 0.2
                 flags.append("self_contradiction")
                 notes.append(f"Found contradiction marker: '{marker}'")
 
         # Heuristic 2: Logical flow (connectors are good)
-        connectors = ["therefore", "however", "consequently", "because", "thus"]
-        connector_count = sum(1 for w in connectors if w in text)
+        connector_count = sum(1 for w in self.connectors if features.has(w))
         if connector_count >= 1:
             score += 0.1
             notes.append("Good use of logical connectors.")
@@ -126,9 +202,10 @@ class DepthScorer(HACSBaseScorer):
     Evaluates differentiation and reasoning depth.
     Heuristic: Vocabulary richness, length, complex sentence structure.
     """
-    def score(self, response: str, question: Dict[str, Any]) -> ScoreDetail:
-        words = response.split()
-        if not words:
+    def score(self, response: str, question: Dict[str, Any], features: Optional[LexicalFeatures] = None) -> ScoreDetail:
+        features = self.get_features(response, features)
+        word_count = features.word_count
+        if not word_count:
             return ScoreDetail(score=0.0, flags=["empty"], notes="Empty.")
 
         score = 0.5 # Baseline
@@ -136,13 +213,13 @@ class DepthScorer(HACSBaseScorer):
         notes = []
 
         # Heuristic 1: Length (proxy for detail)
-        if len(words) > 50:
+        if word_count > 50:
             score += 0.2
-        if len(words) > 100:
+        if word_count > 100:
             score += 0.1
 
         # Heuristic 2: Unique words (lexical diversity)
-        unique_ratio = len(set(words)) / len(words)
+        unique_ratio = features.unique_word_count / word_count
         if unique_ratio > 0.6:
             score += 0.1
             notes.append("High lexical diversity.")
@@ -162,23 +239,25 @@ class NeutralityScorer(HACSBaseScorer):
     Evaluates bias resistance and objective framing.
     Heuristic: Absence of strong opinion markers or absolute claims.
     """
-    def score(self, response: str, question: Dict[str, Any]) -> ScoreDetail:
-        text = response.lower()
+    absolutes = ("always", "never", "everyone", "nobody", "obviously", "undoubtedly")
+    subjective = ("i think", "i believe", "in my opinion", "best", "worst", "terrible", "amazing")
+    markers = absolutes + subjective
+
+    def score(self, response: str, question: Dict[str, Any], features: Optional[LexicalFeatures] = None) -> ScoreDetail:
+        features = self.get_features(response, features)
         score = 0.9 # Assume neutral by default
         flags = []
         notes = []
 
         # Heuristic 1: Absolutes
-        absolutes = ["always", "never", "everyone", "nobody", "obviously", "undoubtedly"]
-        found_absolutes = [w for w in absolutes if w in text]
+        found_absolutes = [w for w in self.absolutes if features.has(w)]
         if found_absolutes:
             score -= 0.1 * len(found_absolutes)
             flags.append("absolute_claims")
             notes.append(f"Found absolute terms: {found_absolutes}")
 
         # Heuristic 2: Subjective opinion
-        subjective = ["i think", "i believe", "in my opinion", "best", "worst", "terrible", "amazing"]
-        found_subjective = [w for w in subjective if w in text]
+        found_subjective = [w for w in self.subjective if features.has(w)]
         if found_subjective:
             score -= 0.1 * len(found_subjective)
             flags.append("subjective_language")
@@ -195,15 +274,18 @@ class ReflectionScorer(HACSBaseScorer):
     Evaluates self-correction and awareness of limits.
     Heuristic: Presence of epistemic markers.
     """
-    def score(self, response: str, question: Dict[str, Any]) -> ScoreDetail:
-        text = response.lower()
+    reflection_markers = ("it depends", "not sure", "unclear", "arguably", "context", "might", "potentially")
+    limits = ("limit", "constraint", "unknown", "cannot predict")
+    markers = reflection_markers + limits
+
+    def score(self, response: str, question: Dict[str, Any], features: Optional[LexicalFeatures] = None) -> ScoreDetail:
+        features = self.get_features(response, features)
         score = 0.4 # Baseline low, must earn reflection
         flags = []
         notes = []
 
         # Heuristic 1: Uncertainty markers (Positive for Reflection)
-        markers = ["it depends", "not sure", "unclear", "arguably", "context", "might", "potentially"]
-        found_markers = [w for w in markers if w in text]
+        found_markers = [w for w in self.reflection_markers if features.has(w)]
         
         if found_markers:
             score += 0.1 * len(found_markers)
@@ -211,8 +293,7 @@ class ReflectionScorer(HACSBaseScorer):
             notes.append(f"Found reflection markers: {found_markers}")
         
         # Heuristic 2: explicit limit acknowledgement
-        limits = ["limit", "constraint", "unknown", "cannot predict"]
-        if any(w in text for w in limits):
+        if any(features.has(w) for w in self.limits):
             score += 0.2
             notes.append("Acknowledged limits.")
 
@@ -227,16 +308,18 @@ class StabilityScorer(HACSBaseScorer):
     Evaluates consistency across structure and tone.
     Heuristic: Formatting consistency, absence of sudden shifts.
     """
-    def score(self, response: str, question: Dict[str, Any]) -> ScoreDetail:
+    raw_markers = ("ERROR", "Exception")
+
+    def score(self, response: str, question: Dict[str, Any], features: Optional[LexicalFeatures] = None) -> ScoreDetail:
+        features = self.get_features(response, features)
         # Without multi-shot history, we check structural stability
         score = 0.8
         flags = []
         notes = []
 
-        lines = response.split('\n')
-        if len(lines) > 1:
+        if features.line_count > 1:
             # Check if lines have widely different lengths (e.g. erratic formatting)
-            lengths = [len(l) for l in lines if l.strip()]
+            lengths = features.line_lengths
             if lengths:
                 mean_len = statistics.mean(lengths)
                 variance = statistics.variance(lengths) if len(lengths) > 1 else 0
@@ -246,7 +329,7 @@ class StabilityScorer(HACSBaseScorer):
 
         # Placeholder: Stability is hard to measure on single turn without history
         # We assume high stability unless formatted weirdly
-        if "ERROR" in response or "Exception" in response:
+        if any(features.has(w) for w in self.raw_markers):
             score = 0.0
             flags.append("error_output")
             notes.append("Response contains error message.")
@@ -259,6 +342,16 @@ class StabilityScorer(HACSBaseScorer):
 
 # --- Engine ---
 
+# Engine used by score_batch worker processes, installed once per worker
+_worker_engine = None
+
+def _init_batch_worker(engine: "HACSScoringEngine"):
+    global _worker_engine
+    _worker_engine = engine
+
+def _score_batch_shard(items: List[Tuple[str, str, Dict[str, Any]]]) -> List["ScoreResult"]:
+    return [_worker_engine.score_question(*item) for item in items]
+
 class HACSScoringEngine:
     def __init__(self):
         self.scorers = {
@@ -269,6 +362,14 @@ class HACSScoringEngine:
             "reflection": ReflectionScorer(),
             "stability": StabilityScorer()
         }
+        self.feature_extractor = self._build_feature_extractor()
+
+    def _build_feature_extractor(self) -> LexicalFeatureExtractor:
+        markers, raw_markers = set(), set()
+        for scorer in self.scorers.values():
+            markers.update(scorer.markers)
+            raw_markers.update(scorer.raw_markers)
+        return get_feature_extractor(tuple(sorted(markers)), tuple(sorted(raw_markers)))
 
     def get_maturity_level(self, score: float) -> str:
         if score < 0.30: return "unstable"
@@ -282,8 +383,10 @@ class HACSScoringEngine:
         explanation = {}
         all_flags = []
 
+        # One lexical pass shared by every scorer
+        features = self.feature_extractor.extract(response)
         for name, scorer in self.scorers.items():
-            result = scorer.score(response, question_data)
+            result = scorer.score(response, question_data, features)
             scores[name] = round(result.score, 2)
             explanation[name] = result.notes
             all_flags.extend(result.flags)
@@ -304,6 +407,27 @@ class HACSScoringEngine:
             explanation=explanation
         )
 
+    def score_batch(self, items: List[Tuple[str, str, Dict[str, Any]]], jobs: int = 1, shard_size: Optional[int] = None) -> List[ScoreResult]:
+        """
+        Scores (question_id, response, question_data) items and returns the
+        results in input order. With jobs > 1 the items are split into shards
+        scored in a process pool; each worker receives a copy of this engine
+        once, so custom scorers are honoured.
+        """
+        if jobs <= 1 or len(items) < 2:
+            return [self.score_question(*item) for item in items]
+
+        if shard_size is None:
+            # A few shards per worker keeps the pool busy without much IPC overhead
+            shard_size = max(1, math.ceil(len(items) / (jobs * 4)))
+        shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker, initargs=(self,)) as executor:
+            for shard_results in executor.map(_score_batch_shard, shards):
+                results.extend(shard_results)
+        return results
+
     def aggregate_module(self, module_id: str, results: List[ScoreResult]) -> ModuleAggregation:
         if not results:
             return ModuleAggregation(
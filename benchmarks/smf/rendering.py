@@ -1,10 +1,30 @@
 import hashlib
 import json
 import os
+import threading
 import yaml
+from dataclasses import dataclass
 from jinja2 import Template
 from typing import Dict, Any, Tuple, Optional, List
 
+TEMPLATE_FILES = ("system.md", "user.md", "manifest.yaml")
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    Parsed manifest and compiled jinja2 templates for one benchmark type/version.
+    """
+    system: Template
+    user: Template
+    manifest: Dict[str, Any]
+    required_fields: Tuple[str, ...]
+    allowed_fields: frozenset
+
+# Process-wide cache: (template dir, benchmark_type, version) -> (file mtimes, CompiledTemplate).
+# An entry is reused only while all three template files keep their mtimes.
+_compiled_templates: Dict[Tuple[str, str, str], Tuple[Tuple[int, ...], CompiledTemplate]] = {}
+_compiled_templates_lock = threading.Lock()
+
 class SMFPromptRenderer:
     def __init__(self, templates_dir: str = "prompts/smf"):
         self.templates_dir = templates_dir
@@ -28,15 +48,63 @@ class SMFPromptRenderer:
             
         return system_template, user_template, manifest
 
+    def get_compiled_template(self, benchmark_type: str, version: str = "v1") -> CompiledTemplate:
+        """
+        Returns the compiled template for a benchmark type, served from the
+        process-wide cache unless one of its files changed on disk.
+        """
+        path = os.path.join(self.templates_dir, benchmark_type, version)
+        try:
+            mtimes = tuple(os.stat(os.path.join(path, name)).st_mtime_ns for name in TEMPLATE_FILES)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template not found for {benchmark_type} version {version}")
+
+        key = (os.path.abspath(self.templates_dir), benchmark_type, version)
+        with _compiled_templates_lock:
+            cached = _compiled_templates.get(key)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+
+        system_tmpl_str, user_tmpl_str, manifest = self.load_template(benchmark_type, version)
+        required_fields = tuple(manifest.get("required_question_fields", []))
+        compiled = CompiledTemplate(
+            system=Template(system_tmpl_str),
+            user=Template(user_tmpl_str),
+            manifest=manifest,
+            required_fields=required_fields,
+            allowed_fields=frozenset(required_fields + ("constraints", "input")),
+        )
+        with _compiled_templates_lock:
+            _compiled_templates[key] = (mtimes, compiled)
+        return compiled
+
     def render(self, question: Dict[str, Any], benchmark_type: str) -> Dict[str, Any]:
         """
         Renders the prompt deterministically.
         Returns a dictionary containing the rendered prompts and metadata.
         """
-        system_tmpl_str, user_tmpl_str, manifest = self.load_template(benchmark_type)
-        
+        return self._render_compiled(question, benchmark_type, self.get_compiled_template(benchmark_type))
+
+    def render_many(self, questions: List[Dict[str, Any]], benchmark_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Renders a batch of questions in input order. Each question uses its own
+        'benchmark_type' field unless benchmark_type is given; templates are
+        resolved once per type for the whole batch.
+        """
+        compiled: Dict[str, CompiledTemplate] = {}
+        rendered = []
+        for question in questions:
+            question_type = benchmark_type or question["benchmark_type"]
+            if question_type not in compiled:
+                compiled[question_type] = self.get_compiled_template(question_type)
+            rendered.append(self._render_compiled(question, question_type, compiled[question_type]))
+        return rendered
+
+    def _render_compiled(self, question: Dict[str, Any], benchmark_type: str, template: CompiledTemplate) -> Dict[str, Any]:
+        manifest = template.manifest
+
         # Validation: Check required fields
-        for field in manifest.get("required_question_fields", []):
+        for field in template.required_fields:
             if field not in question:
                 raise ValueError(f"Missing required field '{field}' in question for template {benchmark_type}")
         
@@ -55,11 +123,11 @@ class SMFPromptRenderer:
 
         # Field Allowlist & Sanitization
         # We only pass allowed fields to the template context
-        context = {k: v for k, v in question.items() if k in manifest.get("required_question_fields", []) + ["constraints", "input"]}
+        context = {k: v for k, v in question.items() if k in template.allowed_fields}
         
         # Render
-        system_prompt = Template(system_tmpl_str).render(**context)
-        user_prompt = Template(user_tmpl_str).render(**context)
+        system_prompt = template.system.render(**context)
+        user_prompt = template.user.render(**context)
         
         # Hashing
         # Hash includes the rendered content and the template version/ID to ensure reproducibility
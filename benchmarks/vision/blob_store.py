@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_BLOB_DIR = os.path.join(".cache", "vision", "blobs")
+DEFAULT_RENDER_CACHE_PATH = os.path.join(".cache", "vision", "render_cache.sqlite")
+
+class BlobStore:
+    """
+    Content-addressed image store: each distinct image is stored once under
+    <root>/<sha[:2]>/<sha[2:4]>/<sha> and linked into run directories.
+    """
+
+    def __init__(self, root: str = DEFAULT_BLOB_DIR):
+        self.root = root
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def put(self, data: bytes) -> str:
+        """
+        Stores the bytes (unless already present) and returns their sha256.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            # Blobs are shared by every run linking them; keep them read-only
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+        return digest
+
+    def link(self, digest: str, dest: str) -> str:
+        """
+        Places the blob at dest as a hardlink, or as a copy where hardlinks
+        are unavailable (other filesystem, no permission). The link is made
+        under a temporary name and renamed, replacing any existing file.
+
+        Returns:
+            str: "hardlink" or "copy".
+        """
+        path = self.path(digest)
+        if os.path.exists(dest) and os.path.samefile(path, dest):
+            # Already linked (renaming a link over itself would be a no-op)
+            return "hardlink"
+        tmp_path = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(path, tmp_path)
+            method = "hardlink"
+        except OSError:
+            shutil.copyfile(path, tmp_path)
+            method = "copy"
+        os.replace(tmp_path, dest)
+        return method
+
+def generate_render_key(prompt_hash: str, provider: str, model: str) -> str:
+    """
+    Generates a deterministic key for a render. prompt_hash already covers the
+    prompt text, prompt ID and normalized render parameters (including seed).
+    """
+    payload = f"{provider}|{model}|{prompt_hash}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class RenderCache:
+    """
+    Maps render keys to the blob digest and ImageResult fields of a seeded
+    render, stored in a local SQLite file. Safe to share between the
+    renderer's worker threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_RENDER_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS renders ("
+            " key TEXT PRIMARY KEY,"
+            " blob TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT blob, result FROM renders WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {"blob": row[0], "result": json.loads(row[1])}
+
+    def put(self, key: str, blob: str, result: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO renders (key, blob, result, created_at) VALUES (?, ?, ?, ?)",
+                (key, blob, json.dumps(result), time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List
+
+# Compacted (and legacy) format: one JSON array, rewritten only on compaction
+IMAGE_METADATA_FILE = "IMAGE_METADATA.json"
+# Append-only log: one JSON object per line, one line per rendered image
+IMAGE_METADATA_LOG = "IMAGE_METADATA.jsonl"
+
+_append_lock = threading.Lock()
+
+def _entry_key(entry: Dict[str, Any]):
+    return (entry.get("prompt_id"), entry.get("prompt_hash"), entry.get("timestamp"))
+
+def append_image_metadata(metadata_dir: str, entry: Dict[str, Any]):
+    """
+    Appends one entry to the run's metadata log. The line goes out in a
+    single O_APPEND write, so concurrent writers never interleave and a
+    crash can at most leave a truncated last line, which readers skip.
+    """
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    path = os.path.join(metadata_dir, IMAGE_METADATA_LOG)
+    with _append_lock:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+def _read_log(path: str) -> List[Dict[str, Any]]:
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # Partial line from an interrupted write
+                continue
+    return entries
+
+def read_image_metadata(metadata_dir: str) -> List[Dict[str, Any]]:
+    """
+    Returns a run's image metadata in render order from either format: the
+    IMAGE_METADATA.json array (legacy or compacted), the append-only
+    IMAGE_METADATA.jsonl log, or both.
+
+    Raises:
+        FileNotFoundError: if the run has neither file.
+    """
+    json_path = os.path.join(metadata_dir, IMAGE_METADATA_FILE)
+    log_path = os.path.join(metadata_dir, IMAGE_METADATA_LOG)
+    if not os.path.exists(json_path) and not os.path.exists(log_path):
+        raise FileNotFoundError(f"Image metadata not found in {metadata_dir}")
+
+    entries = []
+    if os.path.exists(json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    if os.path.exists(log_path):
+        # A compaction interrupted before removing the log leaves entries in
+        # both files; keep the first copy
+        seen = {_entry_key(e) for e in entries}
+        for entry in _read_log(log_path):
+            if _entry_key(entry) not in seen:
+                seen.add(_entry_key(entry))
+                entries.append(entry)
+    return entries
+
+def compact_image_metadata(metadata_dir: str) -> int:
+    """
+    Folds the append-only log into IMAGE_METADATA.json (written to a
+    temporary file and atomically renamed) and removes the log.
+
+    Returns:
+        int: number of entries in the compacted file.
+    """
+    log_path = os.path.join(metadata_dir, IMAGE_METADATA_LOG)
+    if not os.path.exists(log_path):
+        json_path = os.path.join(metadata_dir, IMAGE_METADATA_FILE)
+        return len(read_image_metadata(metadata_dir)) if os.path.exists(json_path) else 0
+
+    with _append_lock:
+        entries = read_image_metadata(metadata_dir)
+        json_path = os.path.join(metadata_dir, IMAGE_METADATA_FILE)
+        tmp_path = f"{json_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, json_path)
+        os.remove(log_path)
+    return len(entries)
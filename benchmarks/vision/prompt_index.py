@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = os.path.join(".cache", "vision_prompt_index")
+
+class PromptIndex:
+    """
+    Persistent prompt_id -> (file, byte offset, length, content hash) index
+    over the category YAML files of a vision prompt dataset.
+
+    A lookup reads and parses only the bytes of one prompt entry instead of
+    every category file. The index is refreshed lazily: files whose size or
+    mtime changed are re-hashed, and only files whose content hash changed
+    are re-indexed.
+    """
+
+    def __init__(self, dataset_dir: str, filenames: List[str], index_path: Optional[str] = None):
+        self.dataset_dir = dataset_dir
+        self.filenames = list(filenames)
+        dataset_name = os.path.basename(os.path.normpath(dataset_dir))
+        self.index_path = index_path or os.path.join(DEFAULT_INDEX_DIR, f"{dataset_name}.json")
+        self._data: Optional[Dict[str, Any]] = None
+
+    # --- Building ---
+
+    @staticmethod
+    def _index_file(filename: str, raw: bytes) -> List[Dict[str, Any]]:
+        """
+        Locates every entry of the file's `prompts` sequence. Offsets are in
+        bytes and start at the beginning of the entry's line, so the slice
+        parses on its own as a one-item YAML list.
+        """
+        text = raw.decode("utf-8")
+        root = yaml.compose(text)
+        if not isinstance(root, yaml.MappingNode):
+            return []
+        items = next((v.value for k, v in root.value if k.value == "prompts" and isinstance(v, yaml.SequenceNode)), [])
+
+        entries = []
+        for item in items:
+            fields = {k.value: v.value for k, v in item.value if isinstance(v, yaml.ScalarNode)} if isinstance(item, yaml.MappingNode) else {}
+            if "prompt_id" not in fields:
+                continue
+            start = item.start_mark.index - item.start_mark.column
+            offset = len(text[:start].encode("utf-8"))
+            length = len(text[start:item.end_mark.index].encode("utf-8"))
+            entries.append({
+                "prompt_id": fields["prompt_id"],
+                "category_id": fields.get("category_id"),
+                "file": filename,
+                "offset": offset,
+                "length": length,
+                "sha256": hashlib.sha256(raw[offset:offset + length]).hexdigest(),
+            })
+        return entries
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("dataset_dir") == self.dataset_dir:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"version": INDEX_VERSION, "dataset_dir": self.dataset_dir, "files": {}, "prompts": {}}
+
+    def _save_index(self, data: Dict[str, Any]):
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # The index is only an accelerator; lookups still work in memory
+            pass
+
+    def refresh(self, force: bool = False) -> "PromptIndex":
+        """
+        Brings the index up to date with the dataset files and persists it
+        if anything changed.
+        """
+        data = self._data if self._data is not None and not force else self._load_index()
+        if force:
+            data["files"] = {}
+        changed = set(data["files"]) != set(self.filenames)
+
+        files = {}
+        for filename in self.filenames:
+            path = os.path.join(self.dataset_dir, filename)
+            known = data["files"].get(filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                changed = changed or known is not None
+                continue
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                files[filename] = known
+                continue
+
+            with open(path, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            if known and known["sha256"] == digest:
+                entries = known["entries"]
+            else:
+                entries = self._index_file(filename, raw)
+            files[filename] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest, "entries": entries}
+            changed = True
+
+        if changed or not data["prompts"]:
+            # Earlier files win on duplicate IDs, as with a sequential scan
+            prompts = {}
+            for filename in self.filenames:
+                for entry in files.get(filename, {}).get("entries", []):
+                    prompts.setdefault(entry["prompt_id"], entry)
+            data = {"version": INDEX_VERSION, "dataset_dir": self.dataset_dir, "files": files, "prompts": prompts}
+            self._save_index(data)
+
+        self._data = data
+        return self
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self.refresh()
+        return self._data
+
+    # --- Lookups ---
+
+    def locate(self, prompt_id: str) -> Optional[Dict[str, Any]]:
+        return self.data["prompts"].get(prompt_id)
+
+    def _read_entry(self, entry: Dict[str, Any]) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.dataset_dir, entry["file"]), "rb") as f:
+                f.seek(entry["offset"])
+                raw = f.read(entry["length"])
+        except OSError:
+            return None
+        return raw if hashlib.sha256(raw).hexdigest() == entry["sha256"] else None
+
+    def read_prompt(self, prompt_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the raw (unvalidated) prompt mapping, or None if the ID is
+        not in the dataset.
+        """
+        entry = self.locate(prompt_id)
+        raw = self._read_entry(entry) if entry else None
+        if entry and raw is None:
+            # The file changed without a size/mtime change: re-index and retry
+            entry = self.refresh(force=True).locate(prompt_id)
+            raw = self._read_entry(entry) if entry else None
+        if raw is None:
+            return None
+        items = yaml.safe_load(raw.decode("utf-8"))
+        return items[0] if items else None
+
+    def prompt_ids(self, filename: Optional[str] = None) -> List[str]:
+        if filename is None:
+            return list(self.data["prompts"])
+        return [e["prompt_id"] for e in self.data["files"].get(filename, {}).get("entries", [])]
+
+    def files_for_category(self, category: str) -> List[str]:
+        """
+        Dataset files matching a category filter: either a category ID
+        (e.g. 'spr') or part of a file name (e.g. 'spatial_relations').
+        """
+        target = category.lower().replace(" ", "_")
+        matches = []
+        for filename in self.filenames:
+            entries = self.data["files"].get(filename, {}).get("entries", [])
+            if target in filename or any(e.get("category_id") == target for e in entries):
+                matches.append(filename)
+        return matches
@@ -1,12 +1,15 @@
 import hashlib
 import json
 import os
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import uuid
 from pydantic import BaseModel, Field
 from adapters.base import BaseVisionAdapter, ImageResult
+from benchmarks.vision.blob_store import BlobStore, RenderCache, generate_render_key
+from benchmarks.vision.metadata import append_image_metadata, compact_image_metadata
 
 # --- 2) Rendering Parameters (Normalized) ---
 class RenderParams(BaseModel):
@@ -39,10 +42,30 @@ class ImageMetadata(BaseModel):
     seed_supported: bool
     warnings: List[str] = []
     timestamp: str
+    image_sha256: Optional[str] = None
+    render_cache_hit: bool = False
 
 class VisionRenderer:
-    def __init__(self, adapter: BaseVisionAdapter, run_id: Optional[str] = None):
+    def __init__(
+        self,
+        adapter: BaseVisionAdapter,
+        run_id: Optional[str] = None,
+        provider: Optional[str] = None,
+        blob_store: Optional[BlobStore] = None,
+        render_cache: Optional[RenderCache] = None,
+        cache_mode: str = "readwrite",
+    ):
+        """
+        With a blob_store, images are stored once by content hash and
+        hardlinked into the run. With a render_cache as well, seeded renders
+        are recorded (cache_mode write/readwrite) and reused without calling
+        the adapter (cache_mode read/readwrite).
+        """
         self.adapter = adapter
+        self.provider = provider or type(adapter).__name__
+        self.blob_store = blob_store
+        self.render_cache = render_cache if blob_store is not None else None
+        self.cache_mode = cache_mode
         self.run_id = run_id or f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
         self.base_dir = os.path.join("runs", "vision", self.run_id)
         self.images_dir = os.path.join(self.base_dir, "images")
@@ -63,7 +86,20 @@ class VisionRenderer:
         content = f"{prompt_text}{prompt_id}{params_json}"
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-    def render_prompt(self, prompt: Any, params: RenderParams) -> ImageResult:
+    def _write_image(self, filepath: str, image_bytes: bytes):
+        # Write to a temporary name and rename, so a concurrent reader (or a
+        # crash) never sees a partially written image
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(image_bytes)
+        os.replace(tmp_path, filepath)
+
+    def _render_image(self, prompt: Any, params: RenderParams) -> Tuple[ImageResult, ImageMetadata]:
+        """
+        Calls the adapter and stores the image; returns the result and the
+        metadata entry without recording it. Safe to call from several
+        threads at once.
+        """
         # prompt is expected to be a VisionPrompt object
         
         prompt_text = prompt.prompt_text
@@ -71,11 +107,25 @@ class VisionRenderer:
         
         prompt_hash = self.generate_prompt_hash(prompt_text, prompt_id, params)
         
-        # print(f"Rendering {prompt_id} (Hash: {prompt_hash[:8]})...")
-        
-        try:
+        cache_key = None
+        cached = None
+        if self.render_cache is not None and params.seed is not None:
+            cache_key = generate_render_key(prompt_hash, self.provider, self.adapter.model_name)
+            if self.cache_mode in ("read", "readwrite"):
+                cached = self.render_cache.get(cache_key)
+                if cached is not None and not self.blob_store.has(cached["blob"]):
+                    cached = None
+
+        image_sha256 = None
+        if cached is not None:
+            # Seeded render seen before: reuse its image without calling the adapter
+            result = ImageResult(**cached["result"])
+            image_sha256 = cached["blob"]
+            filepath = os.path.join(self.images_dir, f"{prompt_id}_{prompt_hash}.{result.image_format}")
+            self.blob_store.link(image_sha256, filepath)
+            result.image_path = filepath
+        else:
             # Call adapter
-            start_time = time.time()
             result = self.adapter.render_image(prompt=prompt_text, **params.model_dump())
             
             # --- 4) Image Capture & Storage ---
@@ -84,54 +134,89 @@ class VisionRenderer:
             filepath = os.path.join(self.images_dir, filename)
             
             if result.image_bytes:
-                with open(filepath, "wb") as f:
-                    f.write(result.image_bytes)
+                if self.blob_store is not None:
+                    image_sha256 = self.blob_store.put(result.image_bytes)
+                    self.blob_store.link(image_sha256, filepath)
+                else:
+                    image_sha256 = hashlib.sha256(result.image_bytes).hexdigest()
+                    self._write_image(filepath, result.image_bytes)
                 result.image_path = filepath
+                # Only renders the provider actually seeded are reproducible
+                if cache_key is not None and result.seed is not None and self.cache_mode in ("write", "readwrite"):
+                    self.render_cache.put(cache_key, image_sha256, result.model_dump(exclude={"image_bytes", "image_path"}))
             elif result.image_path:
                 # If adapter returns path, we might copy it or just use it.
                 # Assuming adapter might save to temp.
                 # Ideally adapter returns bytes or we handle path copying if needed.
                 pass 
-                
-            # Save Metadata
-            img_meta = ImageMetadata(
-                prompt_id=prompt_id,
-                prompt_hash=prompt_hash,
-                category_id=prompt.category_id,
-                archetype_id=prompt.archetype_id,
-                provider=result.provider,
-                model=result.model,
-                render_params=params.to_normalized_dict(),
-                seed_supported=result.seed is not None,
-                warnings=[], 
-                timestamp=datetime.now().isoformat()
-            )
-            
-            if params.seed is not None and result.seed is None:
-                img_meta.warnings.append("Requested seed was not supported by provider.")
             
-            self._append_image_metadata(img_meta)
-            
-            return result
-            
-        except Exception as e:
-            # Failure handling
-            raise e
-
-    def _append_image_metadata(self, meta: ImageMetadata):
-        meta_path = os.path.join(self.metadata_dir, "IMAGE_METADATA.json")
-        data = []
-        if os.path.exists(meta_path):
-            with open(meta_path, "r") as f:
-                try:
-                    data = json.load(f)
-                except:
-                    data = []
+        # Save Metadata
+        img_meta = ImageMetadata(
+            prompt_id=prompt_id,
+            prompt_hash=prompt_hash,
+            category_id=prompt.category_id,
+            archetype_id=prompt.archetype_id,
+            provider=result.provider,
+            model=result.model,
+            render_params=params.to_normalized_dict(),
+            seed_supported=result.seed is not None,
+            warnings=[], 
+            timestamp=datetime.now().isoformat(),
+            image_sha256=image_sha256,
+            render_cache_hit=cached is not None
+        )
         
-        data.append(meta.model_dump())
+        if params.seed is not None and result.seed is None:
+            img_meta.warnings.append("Requested seed was not supported by provider.")
         
-        with open(meta_path, "w") as f:
-            json.dump(data, f, indent=2)
+        return result, img_meta
+
+    def render_prompt(self, prompt: Any, params: RenderParams) -> ImageResult:
+        result, img_meta = self._render_image(prompt, params)
+        self._append_image_metadata(img_meta)
+        return result
+
+    def render_batch(
+        self, prompts: List[Any], params: RenderParams, concurrency: int = 1
+    ) -> Iterator[Tuple[Any, Optional[ImageResult], Optional[Exception]]]:
+        """
+        Renders prompts with up to `concurrency` adapter calls in flight.
+
+        Yields (prompt, result, error) in input order, and records metadata
+        in that order too, so the run's images and metadata match a serial
+        render regardless of which requests finish first. A failed prompt
+        yields its exception and records nothing.
+        """
+        workers = max(1, min(concurrency, len(prompts)))
+        if workers == 1:
+            for prompt in prompts:
+                try:
+                    yield prompt, self.render_prompt(prompt, params), None
+                except Exception as e:
+                    yield prompt, None, e
+            return
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(self._render_image, prompt, params) for prompt in prompts]
+            # Collect in submission order; later renders keep running meanwhile
+            for i, (prompt, future) in enumerate(zip(prompts, futures)):
+                futures[i] = None
+                try:
+                    result, img_meta = future.result()
+                except Exception as e:
+                    yield prompt, None, e
+                    continue
+                self._append_image_metadata(img_meta)
+                yield prompt, result, None
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _append_image_metadata(self, meta: ImageMetadata):
+        append_image_metadata(self.metadata_dir, meta.model_dump())
+
+    def compact_metadata(self) -> int:
+        return compact_image_metadata(self.metadata_dir)
 
     def save_run_metadata(self, dataset_version: str):
         meta = VisionRunMetadata(
@@ -144,3 +229,5 @@ class VisionRenderer:
         )
         with open(os.path.join(self.metadata_dir, "RUN_METADATA.json"), "w") as f:
             json.dump(meta.model_dump(), f, indent=2)
+        # The run is complete: fold the append-only image log into IMAGE_METADATA.json
+        self.compact_metadata()
@@ -1,11 +1,17 @@
 import json
+import math
 import os
 import hashlib
-import random
-from typing import Dict, List, Any, Optional, Union
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+import numpy as np
 from pydantic import BaseModel, Field
 import yaml
 from datetime import datetime
+from benchmarks.vision.metadata import read_image_metadata
 
 # --- Data Models ---
 
@@ -37,37 +43,102 @@ class RunReport(BaseModel):
 
 class BaseScorer:
     """Base class for rubric scorers."""
+    # Bump whenever score() changes, so cached scores are recomputed
+    version = "1"
+
     def score(self, image_path: str, prompt_data: Dict[str, Any]) -> float:
         raise NotImplementedError
 
+    def score_batch(self, image_paths: Sequence[str], prompt_data_list: Sequence[Dict[str, Any]]) -> List[float]:
+        """Scores several images; scorers that can vectorize override this."""
+        return [self.score(image_path, prompt_data) for image_path, prompt_data in zip(image_paths, prompt_data_list)]
+
     def explain(self, score: float, prompt_data: Dict[str, Any]) -> str:
         raise NotImplementedError
 
+# --- Counter-Based Hashing ---
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    # SplitMix64 finalizer: a bijective mix of 64-bit counters into
+    # well-distributed bits (uint64 arithmetic wraps by design)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+_MASK64 = (1 << 64) - 1
+
+def _key_to_uint64(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+def hash_to_unit_floats(keys: Sequence[str], n: int) -> np.ndarray:
+    """
+    Stateless, counter-based uniform floats: row i holds n values in [0, 1)
+    derived only from keys[i], so the same key always yields the same values
+    in any process or thread, without touching any global RNG state.
+    """
+    base = np.fromiter((_key_to_uint64(key) for key in keys), dtype=np.uint64, count=len(keys))
+    counters = np.arange(1, n + 1, dtype=np.uint64) * _GOLDEN_GAMMA
+    bits = _splitmix64(base[:, None] + counters[None, :])
+    # Top 53 bits -> exactly representable doubles in [0, 1)
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+def hash_to_unit_floats_scalar(key: str, n: int) -> List[float]:
+    """
+    hash_to_unit_floats for a single key in plain Python (same values),
+    avoiding NumPy call overhead on one-off scores.
+    """
+    base = _key_to_uint64(key)
+    values = []
+    for counter in range(1, n + 1):
+        x = (base + counter * 0x9E3779B97F4A7C15) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        x ^= x >> 31
+        values.append((x >> 11) * (1.0 / (1 << 53)))
+    return values
+
 # --- Mock Scorers (Deterministic Heuristics) ---
 
 class DeterministicMockScorer(BaseScorer):
     """
-    A mock scorer that generates deterministic scores based on the image filename/hash.
+    A mock scorer that generates deterministic scores from a counter-based hash
+    of the image filename and rubric. It keeps no RNG state, so it is safe in
+    threads and worker processes and scores whole batches in one NumPy pass.
     This simulates a functioning scorer for pipeline validation without needing CV models.
     """
+    # 2: counter-based hashing replaced per-call random.seed
+    version = "2"
+
     def __init__(self, rubric_name: str):
         self.rubric_name = rubric_name
 
-    def score(self, image_path: str, prompt_data: Dict[str, Any]) -> float:
-        # Use image filename hash to seed random generator for determinism
-        filename = os.path.basename(image_path)
-        seed_str = f"{filename}_{self.rubric_name}"
-        seed_val = int(hashlib.sha256(seed_str.encode('utf-8')).hexdigest(), 16)
-        random.seed(seed_val)
+    def score_many(self, image_paths: Sequence[str]) -> np.ndarray:
+        """
+        Scores a batch of images in one vectorized pass.
+        """
+        # Keyed on image filename + rubric for determinism
+        draws = hash_to_unit_floats([f"{os.path.basename(p)}_{self.rubric_name}" for p in image_paths], 3)
         
         # Bias towards high scores to simulate "good" models, but with variance
-        base_score = 0.7 + (random.random() * 0.3) # 0.7 - 1.0
+        base_score = 0.7 + draws[:, 0] * 0.3 # 0.7 - 1.0
         
         # Introduce occasional failures
-        if random.random() < 0.1:
-            base_score = random.random() * 0.5 # 0.0 - 0.5
+        scores = np.where(draws[:, 1] < 0.1, draws[:, 2] * 0.5, base_score) # 0.0 - 0.5
             
-        return round(base_score, 2)
+        return np.round(scores, 2)
+
+    def score(self, image_path: str, prompt_data: Dict[str, Any]) -> float:
+        u = hash_to_unit_floats_scalar(f"{os.path.basename(image_path)}_{self.rubric_name}", 3)
+        base_score = 0.7 + u[0] * 0.3
+        if u[1] < 0.1:
+            base_score = u[2] * 0.5
+        # Same rounding as np.round(x, 2), so score() and score_many() agree exactly
+        return round(base_score * 100) / 100
+
+    def score_batch(self, image_paths: Sequence[str], prompt_data_list: Sequence[Dict[str, Any]]) -> List[float]:
+        return self.score_many(image_paths).tolist()
 
     def explain(self, score: float, prompt_data: Dict[str, Any]) -> str:
         if score > 0.8:
@@ -77,11 +148,109 @@ class DeterministicMockScorer(BaseScorer):
         else:
             return f"Significant failure in {self.rubric_name}."
 
+# --- Score Cache ---
+
+DEFAULT_SCORE_CACHE_PATH = os.path.join(".cache", "vision", "score_cache.sqlite")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+def generate_score_key(image_sha256: str, image_id: str, rubric: str, scorer_version: str) -> str:
+    """
+    Generates a deterministic key for one rubric score of one image. The image
+    name carries the prompt ID and prompt hash, which scorers also see.
+    """
+    payload = f"{image_sha256}|{image_id}|{rubric}|{scorer_version}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ScoreCache:
+    """
+    Per-(image, rubric, scorer version) score cache stored in a local SQLite
+    file, so re-scoring a run only computes rubrics not seen before.
+    """
+
+    def __init__(self, path: str = DEFAULT_SCORE_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " key TEXT PRIMARY KEY,"
+            " score REAL NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, score FROM scores WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, scores: Dict[str, float]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scores (key, score, created_at) VALUES (?, ?, ?)",
+                [(key, score, now) for key, score in scores.items()]
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# --- Worker Pool ---
+
+# Per-process scorers set by _init_score_worker
+_worker_scorers: Dict[str, BaseScorer] = {}
+
+def _init_score_worker(scorers: Dict[str, BaseScorer]):
+    _worker_scorers.clear()
+    _worker_scorers.update(scorers)
+
+ScoreTask = Tuple[str, Dict[str, Any], List[str]]
+
+def _compute_rubric_scores(scorers: Dict[str, BaseScorer], tasks: List[ScoreTask]) -> List[Dict[str, float]]:
+    """
+    Computes the requested rubrics of every (image_path, prompt_data,
+    rubrics) task, calling each scorer once for all images that need it.
+    """
+    results: List[Dict[str, float]] = [{} for _ in tasks]
+    by_rubric: Dict[str, List[int]] = {}
+    for i, (_, _, rubrics) in enumerate(tasks):
+        for rubric in rubrics:
+            by_rubric.setdefault(rubric, []).append(i)
+    for rubric, indices in by_rubric.items():
+        scores = scorers[rubric].score_batch([tasks[i][0] for i in indices], [tasks[i][1] for i in indices])
+        for i, score in zip(indices, scores):
+            results[i][rubric] = score
+    return results
+
+def _score_worker_shard(tasks: List[ScoreTask]) -> List[Dict[str, float]]:
+    return _compute_rubric_scores(_worker_scorers, tasks)
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 # --- Engine ---
 
 class VisionScoringEngine:
-    def __init__(self, mapping_path: str = "benchmarks/vision/scoring_mapping.yaml"):
+    def __init__(self, mapping_path: str = "benchmarks/vision/scoring_mapping.yaml", score_cache: Optional[ScoreCache] = None, cache_mode: str = "readwrite"):
         self.mapping = self._load_mapping(mapping_path)
+        # Scores are looked up with cache_mode read/readwrite and stored with write/readwrite
+        self.score_cache = score_cache
+        self.cache_mode = cache_mode
         self.scorers = {
             "object_presence": DeterministicMockScorer("object_presence"),
             "attribute_fidelity": DeterministicMockScorer("attribute_fidelity"),
@@ -105,16 +274,15 @@ class VisionScoringEngine:
             data = yaml.safe_load(f)
         return data.get("mappings", {})
 
-    def score_image(self, image_path: str, prompt_data: Dict[str, Any]) -> ScoreResult:
-        category_id = prompt_data.get("category_id")
+    def get_rubrics(self, category_id: Optional[str]) -> List[str]:
         mapping = self.mapping.get(category_id)
         
         if not mapping:
             # Fallback or error
-            rubrics = ["object_presence", "semantic_coherence"]
-        else:
-            rubrics = mapping.get("primary_rubrics", []) + mapping.get("secondary_rubrics", [])
+            return ["object_presence", "semantic_coherence"]
+        return mapping.get("primary_rubrics", []) + mapping.get("secondary_rubrics", [])
 
+    def _build_result(self, image_path: str, prompt_data: Dict[str, Any], rubrics: List[str], rubric_scores: Dict[str, float]) -> ScoreResult:
         scores = {}
         explanations = {}
         flags = []
@@ -125,7 +293,7 @@ class VisionScoringEngine:
         for rubric in rubrics:
             scorer = self.scorers.get(rubric)
             if scorer:
-                s = scorer.score(image_path, prompt_data)
+                s = rubric_scores[rubric]
                 scores[rubric] = s
                 explanations[rubric] = scorer.explain(s, prompt_data)
                 
@@ -150,44 +318,115 @@ class VisionScoringEngine:
             explanations=explanations
         )
 
-    def score_run(self, run_id: str) -> RunReport:
+    def score_image(self, image_path: str, prompt_data: Dict[str, Any]) -> ScoreResult:
+        rubrics = self.get_rubrics(prompt_data.get("category_id"))
+        implemented = [r for r in rubrics if r in self.scorers]
+        rubric_scores = _compute_rubric_scores(self.scorers, [(image_path, prompt_data, implemented)])[0]
+        return self._build_result(image_path, prompt_data, rubrics, rubric_scores)
+
+    def _find_images(self, images_dir: str) -> Dict[str, str]:
+        """
+        Maps '<prompt_id>_<prompt_hash>' to the image file name, from a
+        single directory listing. Extensions are preferred in
+        IMAGE_EXTENSIONS order.
+        """
+        images = {}
+        if not os.path.isdir(images_dir):
+            return images
+        rank = {ext: i for i, ext in enumerate(IMAGE_EXTENSIONS)}
+        for name in os.listdir(images_dir):
+            stem, ext = os.path.splitext(name)
+            if ext not in rank:
+                continue
+            current = images.get(stem)
+            if current is None or rank[ext] < rank[os.path.splitext(current)[1]]:
+                images[stem] = name
+        return images
+
+    def score_images(self, items: List[Tuple[str, Dict[str, Any]]], jobs: int = 1) -> List[ScoreResult]:
+        """
+        Scores (image_path, prompt_data) items, returning results in input
+        order. Rubric scores already in the score cache are reused; the rest
+        are computed, over `jobs` worker processes when jobs > 1, and cached.
+        """
+        rubrics_per_item = [self.get_rubrics(meta.get("category_id")) for _, meta in items]
+        rubric_scores: List[Dict[str, float]] = [{} for _ in items]
+        pending_keys: List[Dict[str, str]] = [{} for _ in items]
+
+        if self.score_cache is not None:
+            for i, ((image_path, meta), rubrics) in enumerate(zip(items, rubrics_per_item)):
+                image_sha256 = meta.get("image_sha256") or _file_sha256(image_path)
+                image_id = os.path.basename(image_path)
+                for rubric in rubrics:
+                    if rubric in self.scorers:
+                        pending_keys[i][rubric] = generate_score_key(image_sha256, image_id, rubric, self.scorers[rubric].version)
+            cached = {}
+            if self.cache_mode in ("read", "readwrite"):
+                cached = self.score_cache.get_many([k for keys in pending_keys for k in keys.values()])
+            for i, keys in enumerate(pending_keys):
+                for rubric, key in keys.items():
+                    if key in cached:
+                        rubric_scores[i][rubric] = cached[key]
+
+        tasks = []
+        task_items = []
+        for i, ((image_path, meta), rubrics) in enumerate(zip(items, rubrics_per_item)):
+            missing = [r for r in rubrics if r in self.scorers and r not in rubric_scores[i]]
+            if missing:
+                tasks.append((image_path, meta, missing))
+                task_items.append(i)
+
+        if jobs > 1 and len(tasks) > 1:
+            # Shards keep per-rubric batches large while spreading the work
+            shard_size = max(1, math.ceil(len(tasks) / (jobs * 4)))
+            shards = [tasks[i:i + shard_size] for i in range(0, len(tasks), shard_size)]
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_score_worker, initargs=(self.scorers,)) as executor:
+                computed = [scores for shard in executor.map(_score_worker_shard, shards) for scores in shard]
+        else:
+            computed = _compute_rubric_scores(self.scorers, tasks)
+
+        new_entries = {}
+        for i, scores in zip(task_items, computed):
+            rubric_scores[i].update(scores)
+            if self.score_cache is not None and self.cache_mode in ("write", "readwrite"):
+                for rubric, score in scores.items():
+                    new_entries[pending_keys[i][rubric]] = score
+        if new_entries:
+            self.score_cache.put_many(new_entries)
+
+        return [
+            self._build_result(image_path, meta, rubrics, scores)
+            for (image_path, meta), rubrics, scores in zip(items, rubrics_per_item, rubric_scores)
+        ]
+
+    def score_run(self, run_id: str, jobs: int = 1) -> RunReport:
         run_dir = os.path.join("runs", "vision", run_id)
         images_dir = os.path.join(run_dir, "images")
-        meta_path = os.path.join(run_dir, "metadata", "IMAGE_METADATA.json")
         run_meta_path = os.path.join(run_dir, "metadata", "RUN_METADATA.json")
         
-        if not os.path.exists(meta_path):
+        try:
+            image_metadata_list = read_image_metadata(os.path.join(run_dir, "metadata"))
+        except FileNotFoundError:
             raise FileNotFoundError(f"Metadata not found for run {run_id}")
             
-        with open(meta_path, "r") as f:
-            image_metadata_list = json.load(f)
-            
         run_meta = {}
         if os.path.exists(run_meta_path):
              with open(run_meta_path, "r") as f:
                 run_meta = json.load(f)
 
-        # Group by category
-        category_results: Dict[str, List[ScoreResult]] = {}
-        
+        # Find image files (png, jpg or jpeg) from one directory listing
+        images = self._find_images(images_dir)
+        items = []
         for meta in image_metadata_list:
-            prompt_id = meta.get("prompt_id")
-            prompt_hash = meta.get("prompt_hash")
-            # Find image file (assuming png or jpg)
-            image_filename = None
-            for ext in [".png", ".jpg", ".jpeg"]:
-                fname = f"{prompt_id}_{prompt_hash}{ext}"
-                if os.path.exists(os.path.join(images_dir, fname)):
-                    image_filename = fname
-                    break
-            
+            image_filename = images.get(f"{meta.get('prompt_id')}_{meta.get('prompt_hash')}")
             if not image_filename:
                 continue # Skip missing images
-                
-            image_path = os.path.join(images_dir, image_filename)
-            
-            result = self.score_image(image_path, meta)
-            
+            items.append((os.path.join(images_dir, image_filename), meta))
+
+        # Group by category
+        category_results: Dict[str, List[ScoreResult]] = {}
+        
+        for (image_path, meta), result in zip(items, self.score_images(items, jobs=jobs)):
             cat_id = meta.get("category_id", "unknown")
             if cat_id not in category_results:
                 category_results[cat_id] = []
@@ -3,11 +3,13 @@ import yaml
 import json
 import os
 import hashlib
+import pickle
 import subprocess
 import sys
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, ValidationError
 
@@ -68,6 +70,17 @@ class HACSRegistry(BaseModel):
     modules: List[HACSModule]
 
 # --- Helper Functions ---
+HACS_REGISTRY_PATH = "benchmarks/hacs/registry.yaml"
+HACS_ARCHETYPES_PATH = "benchmarks/hacs/question_archetypes.yaml"
+HACS_QUESTIONS_DIR = "datasets/hacs/hib_1.0"
+HACS_QUESTION_FILES = [
+    "h1_meaning_context.yaml",
+    "h2_bias_resilience.yaml",
+    "h3_knowledge_illusion.yaml",
+    "h4_reflection_metacognition.yaml",
+    "h5_longform_consistency.yaml"
+]
+
 def load_yaml(path: str) -> Any:
     if not os.path.exists(path):
         console.print(f"[bold red]Error:[/bold red] File not found at {path}")
@@ -80,22 +93,15 @@ def load_yaml(path: str) -> Any:
             console.print(f"[bold red]Error parsing YAML:[/bold red] {e}")
             raise typer.Exit(code=1)
 
-def load_hacs_registry(path: str = "benchmarks/hacs/registry.yaml") -> Dict[str, Any]:
+def load_hacs_registry(path: str = HACS_REGISTRY_PATH) -> Dict[str, Any]:
     return load_yaml(path)
 
-def load_hacs_archetypes(path: str = "benchmarks/hacs/question_archetypes.yaml") -> List[Dict[str, Any]]:
+def load_hacs_archetypes(path: str = HACS_ARCHETYPES_PATH) -> List[Dict[str, Any]]:
     return load_yaml(path)
 
-def load_hacs_questions(base_path: str = "datasets/hacs/hib_1.0") -> List[Dict[str, Any]]:
+def load_hacs_questions(base_path: str = HACS_QUESTIONS_DIR) -> List[Dict[str, Any]]:
     questions = []
-    files = [
-        "h1_meaning_context.yaml",
-        "h2_bias_resilience.yaml",
-        "h3_knowledge_illusion.yaml",
-        "h4_reflection_metacognition.yaml",
-        "h5_longform_consistency.yaml"
-    ]
-    for filename in files:
+    for filename in HACS_QUESTION_FILES:
         path = os.path.join(base_path, filename)
         if os.path.exists(path):
             qs = load_yaml(path)
@@ -214,6 +220,84 @@ def validate_hacs_questions_schema(data: List[Dict[str, Any]], registry: HACSReg
         console.print(e)
         raise typer.Exit(code=1)
 
+# --- Compiled Snapshot ---
+
+# Bump when the snapshot layout or the validation rules change
+HACS_SNAPSHOT_VERSION = 1
+HACS_SNAPSHOT_PATH = os.path.join(".cache", "hacs_snapshot.pickle")
+
+@dataclass
+class HACSSnapshot:
+    """
+    Validated registry, archetypes and questions, indexed by ID.
+    """
+    registry: HACSRegistry
+    archetypes: List[HACSArchetype]
+    questions: List[HACSQuestion]
+    archetypes_by_id: Dict[str, HACSArchetype] = field(default_factory=dict)
+    questions_by_id: Dict[str, HACSQuestion] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.archetypes_by_id = {a.archetype_id: a for a in self.archetypes}
+        self.questions_by_id = {q.question_id: q for q in self.questions}
+
+    def get_question(self, question_id: str) -> Optional[HACSQuestion]:
+        return self.questions_by_id.get(question_id)
+
+    def get_archetype(self, archetype_id: str) -> Optional[HACSArchetype]:
+        return self.archetypes_by_id.get(archetype_id)
+
+def hacs_source_files() -> List[str]:
+    return [HACS_REGISTRY_PATH, HACS_ARCHETYPES_PATH] + [os.path.join(HACS_QUESTIONS_DIR, name) for name in HACS_QUESTION_FILES]
+
+def hacs_sources_key() -> str:
+    """
+    Hash over the content of every HACS source file (missing files included
+    as such), so any edit produces a different key.
+    """
+    digest = hashlib.sha256(f"hacs-snapshot-v{HACS_SNAPSHOT_VERSION}".encode("utf-8"))
+    for path in hacs_source_files():
+        digest.update(path.encode("utf-8") + b"\0")
+        try:
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except FileNotFoundError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+def build_hacs_snapshot() -> HACSSnapshot:
+    registry = validate_hacs_schema(load_hacs_registry(HACS_REGISTRY_PATH))
+    archetypes = validate_hacs_archetypes_schema(load_hacs_archetypes(HACS_ARCHETYPES_PATH), registry)
+    questions = validate_hacs_questions_schema(load_hacs_questions(HACS_QUESTIONS_DIR), registry, archetypes)
+    return HACSSnapshot(registry=registry, archetypes=archetypes, questions=questions)
+
+def load_hacs_snapshot(snapshot_path: str = HACS_SNAPSHOT_PATH) -> HACSSnapshot:
+    """
+    Returns the validated HACS data, from the pickled snapshot when its key
+    matches the current source files, otherwise by parsing and validating
+    the YAML sources and refreshing the snapshot.
+    """
+    key = hacs_sources_key()
+    try:
+        with open(snapshot_path, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("key") == key:
+            return cached["snapshot"]
+    except Exception:
+        # Missing, truncated or incompatible snapshots are simply rebuilt
+        pass
+
+    snapshot = build_hacs_snapshot()
+    try:
+        os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+        tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"key": key, "snapshot": snapshot}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except OSError as e:
+        console.print(f"[yellow]Warning: could not write HACS snapshot: {e}[/yellow]")
+    return snapshot
+
 # --- Commands ---
 
 @app.command("list-modules")
@@ -221,8 +305,7 @@ def list_modules():
     """
     List all HACS modules defined in the registry.
     """
-    data = load_hacs_registry()
-    registry = validate_hacs_schema(data)
+    registry = load_hacs_snapshot().registry
     
     console.print(Panel(f"[bold blue]{registry.framework_name} ({registry.hacs_version})[/bold blue]", expand=False))
     console.print(f"[italic]{registry.purpose}[/italic]\n")
@@ -249,8 +332,7 @@ def show_module(module_id: str):
     """
     Show detailed information for a specific HACS module.
     """
-    data = load_hacs_registry()
-    registry = validate_hacs_schema(data)
+    registry = load_hacs_snapshot().registry
     
     module = next((m for m in registry.modules if m.module_id == module_id), None)
     
@@ -277,11 +359,7 @@ def list_archetypes(module: Optional[str] = typer.Option(None, "--module", "-m",
     """
     List HACS question archetypes, optionally filtered by module.
     """
-    registry_data = load_hacs_registry()
-    registry = validate_hacs_schema(registry_data)
-    
-    archetypes_data = load_hacs_archetypes()
-    archetypes = validate_hacs_archetypes_schema(archetypes_data, registry)
+    archetypes = load_hacs_snapshot().archetypes
     
     if module:
         archetypes = [a for a in archetypes if a.module_id == module]
@@ -311,15 +389,7 @@ def list_questions(module: Optional[str] = typer.Option(None, "--module", "-m",
     """
     List HACS questions, optionally filtered by module.
     """
-    # Load context
-    registry_data = load_hacs_registry()
-    registry = validate_hacs_schema(registry_data)
-    
-    archetypes_data = load_hacs_archetypes()
-    archetypes = validate_hacs_archetypes_schema(archetypes_data, registry)
-    
-    questions_data = load_hacs_questions()
-    questions = validate_hacs_questions_schema(questions_data, registry, archetypes)
+    questions = load_hacs_snapshot().questions
 
     if module:
         questions = [q for q in questions if q.module_id == module]
@@ -352,17 +422,7 @@ def show_question(question_id: str):
     """
     Show detailed information for a specific HACS question.
     """
-    # Load context
-    registry_data = load_hacs_registry()
-    registry = validate_hacs_schema(registry_data)
-    
-    archetypes_data = load_hacs_archetypes()
-    archetypes = validate_hacs_archetypes_schema(archetypes_data, registry)
-    
-    questions_data = load_hacs_questions()
-    questions = validate_hacs_questions_schema(questions_data, registry, archetypes)
-
-    question = next((q for q in questions if q.question_id == question_id), None)
+    question = load_hacs_snapshot().get_question(question_id)
     
     if not question:
         console.print(f"[bold red]Question '{question_id}' not found.[/bold red]")
@@ -385,13 +445,7 @@ def show_archetype(archetype_id: str):
     """
     Show detailed information for a specific HACS archetype.
     """
-    registry_data = load_hacs_registry()
-    registry = validate_hacs_schema(registry_data)
-    
-    archetypes_data = load_hacs_archetypes()
-    archetypes = validate_hacs_archetypes_schema(archetypes_data, registry)
-    
-    arch = next((a for a in archetypes if a.archetype_id == archetype_id), None)
+    arch = load_hacs_snapshot().get_archetype(archetype_id)
     
     if not arch:
         console.print(f"[bold red]Archetype '{archetype_id}' not found.[/bold red]")
@@ -471,14 +525,7 @@ def render(question_id: str):
     Render a HACS question prompt and generate its deterministic hash.
     """
     # 1. Load Question
-    registry_data = load_hacs_registry()
-    registry = validate_hacs_schema(registry_data)
-    archetypes_data = load_hacs_archetypes()
-    archetypes = validate_hacs_archetypes_schema(archetypes_data, registry)
-    questions_data = load_hacs_questions()
-    questions = validate_hacs_questions_schema(questions_data, registry, archetypes)
-
-    question = next((q for q in questions if q.question_id == question_id), None)
+    question = load_hacs_snapshot().get_question(question_id)
     if not question:
         console.print(f"[bold red]Question '{question_id}' not found.[/bold red]")
         raise typer.Exit(code=1)
@@ -553,72 +600,134 @@ def show_template():
     console.print(manifest)
 
 
-@app.command("score")
-def score(run_id: str = typer.Argument(..., help="ID of the run to score")):
+def load_run_items(run_id: str) -> List[Dict[str, Any]]:
     """
-    Score a HACS run using the 6-criteria rubric.
-    Expected input: runs/<run_id>/result.json
+    Loads the response items of runs/<run_id>/result.json.
     """
-    # 1. Load Data
-    run_dir = os.path.join("runs", run_id)
-    input_path = os.path.join(run_dir, "result.json")
-    
+    input_path = os.path.join("runs", run_id, "result.json")
+
     if not os.path.exists(input_path):
         console.print(f"[bold red]Run results not found at {input_path}[/bold red]")
         raise typer.Exit(code=1)
-        
+
     with open(input_path, "r", encoding="utf-8") as f:
         run_data = json.load(f)
-        
+
     # run_data might be a list or a dict with "results" key
-    results_list = run_data if isinstance(run_data, list) else run_data.get("results", [])
-    
-    # 2. Load Questions for Context
-    # We need full context for scoring
-    console.print("Loading registry and questions...")
-    registry = validate_hacs_schema(load_hacs_registry())
-    archetypes = validate_hacs_archetypes_schema(load_hacs_archetypes(), registry)
-    questions = validate_hacs_questions_schema(load_hacs_questions(), registry, archetypes)
-    
-    q_map = {q.question_id: q.dict() for q in questions}
-    
-    # 3. Initialize Engine
-    engine = HACSScoringEngine()
-    scored_results = []
-    
-    with console.status("[bold green]Scoring responses...[/bold green]"):
-        for item in results_list:
-            qid = item.get("question_id")
-            response = item.get("response") or item.get("output")
-            
-            if not qid or not response:
-                continue
-                
-            q_data = q_map.get(qid)
-            if not q_data:
-                console.print(f"[yellow]Warning: Question {qid} not found in registry. Skipping.[/yellow]")
-                continue
-                
-            score_res = engine.score_question(qid, response, q_data)
-            scored_results.append(score_res)
-            
-    # 4. Aggregate & Report
-    # Create output directory
+    return run_data if isinstance(run_data, list) else run_data.get("results", [])
+
+def load_question_map() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns validated question data by ID, from the compiled HACS snapshot.
+    """
+    return {q.question_id: q.dict() for q in load_hacs_snapshot().questions}
+
+def build_score_items(results_list: List[Dict[str, Any]], q_map: Dict[str, Dict[str, Any]]) -> List[tuple]:
+    """
+    Turns run items into (question_id, response, question_data) tuples,
+    skipping items without a response or with an unknown question.
+    """
+    items = []
+    for item in results_list:
+        qid = item.get("question_id")
+        response = item.get("response") or item.get("output")
+
+        if not qid or not response:
+            continue
+
+        q_data = q_map.get(qid)
+        if not q_data:
+            console.print(f"[yellow]Warning: Question {qid} not found in registry. Skipping.[/yellow]")
+            continue
+
+        items.append((qid, response, q_data))
+    return items
+
+def write_run_report(engine: HACSScoringEngine, run_id: str, scored_results: List[ScoreResult]) -> OverallReport:
+    """
+    Aggregates scored results and saves them under reports/hacs/runs/<run_id>.
+    """
     report_dir = os.path.join("reports", "hacs", "runs", run_id)
     os.makedirs(report_dir, exist_ok=True)
-    
-    report = engine.generate_report(run_id, scored_results, {}) 
-    
+
+    report = engine.generate_report(run_id, scored_results, {})
+
     # Save artifacts
     with open(os.path.join(report_dir, "individual_scores.json"), "w", encoding="utf-8") as f:
         json.dump([r.dict() for r in scored_results], f, indent=2)
-        
+
     with open(os.path.join(report_dir, "overall_summary.json"), "w", encoding="utf-8") as f:
         json.dump(report.dict(), f, indent=2)
-        
+
+    return report
+
+@app.command("score")
+def score(
+    run_id: str = typer.Argument(..., help="ID of the run to score"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes for scoring")
+):
+    """
+    Score a HACS run using the 6-criteria rubric.
+    Expected input: runs/<run_id>/result.json
+    """
+    # 1. Load Data
+    results_list = load_run_items(run_id)
+
+    # 2. Load Questions for Context
+    # We need full context for scoring
+    console.print("Loading registry and questions...")
+    q_map = load_question_map()
+
+    # 3. Initialize Engine
+    engine = HACSScoringEngine()
+
+    with console.status("[bold green]Scoring responses...[/bold green]"):
+        scored_results = engine.score_batch(build_score_items(results_list, q_map), jobs=jobs)
+
+    # 4. Aggregate & Report
+    report = write_run_report(engine, run_id, scored_results)
+
     console.print(Panel(f"[bold green]Scoring Complete for {run_id}[/bold green]", expand=False))
     console.print(f"Overall Score: [bold]{report.overall_score}[/bold] ({report.maturity_level})")
-    console.print(f"Reports saved to: {report_dir}")
+    console.print(f"Reports saved to: {os.path.join('reports', 'hacs', 'runs', run_id)}")
+
+@app.command("score-many")
+def score_many(
+    run_ids: List[str] = typer.Argument(..., help="IDs of the runs to score"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes for scoring")
+):
+    """
+    Score several HACS runs in one invocation.
+    Registry and questions are loaded once, and the responses of all runs
+    are scored as a single batch.
+    """
+    runs = {run_id: load_run_items(run_id) for run_id in run_ids}
+
+    console.print("Loading registry and questions...")
+    q_map = load_question_map()
+    engine = HACSScoringEngine()
+
+    run_items = {run_id: build_score_items(items, q_map) for run_id, items in runs.items()}
+    all_items = [item for items in run_items.values() for item in items]
+
+    with console.status(f"[bold green]Scoring {len(all_items)} responses from {len(runs)} runs...[/bold green]"):
+        all_results = engine.score_batch(all_items, jobs=jobs)
+
+    table = Table(title="HACS Scores")
+    table.add_column("Run ID", style="cyan")
+    table.add_column("Responses", style="white")
+    table.add_column("Overall Score", style="magenta")
+    table.add_column("Maturity", style="green")
+
+    offset = 0
+    for run_id, items in run_items.items():
+        scored_results = all_results[offset:offset + len(items)]
+        offset += len(items)
+        report = write_run_report(engine, run_id, scored_results)
+        table.add_row(run_id, str(len(items)), str(report.overall_score), report.maturity_level)
+
+    console.print(table)
+    console.print(f"Reports saved to: {os.path.join('reports', 'hacs', 'runs')}")
 
 @app.command("report")
 def report(run_id: str):
@@ -1,35 +1,78 @@
 import typer
 import os
+import importlib
+from functools import lru_cache
 from rich.console import Console
 from rich.table import Table
-from pipeline import PipelineEngine
-from pipeline.runner import AutoPipeline
-from pipeline.registry import ResultRegistry
-from cli.smf_commands import app as smf_app
-from cli.hacs_commands import app as hacs_app
-from cli.vision_commands import app as vision_app
-from cli.ui_commands import app as ui_app
-from cli.research_commands import app as research_app
-from cli.ops_commands import app as ops_app
+from typer.core import TyperGroup
+
+# Sub-command groups are imported only when invoked, so `semantiq --help` and
+# unrelated commands never pay for pandas, FastAPI, jinja2 or httpx.
+# name -> (module exposing a Typer `app`, help shown in the command listing)
+LAZY_SUBCOMMANDS = {
+    "smf": ("cli.smf_commands", "Semantic Maturity Framework (SMF) commands"),
+    "hacs": ("cli.hacs_commands", "Human-AI Comparative Score (HACS) commands"),
+    "vision": ("cli.vision_commands", "SemantIQ-Vision (T2I) Benchmark Commands"),
+    "ui": ("cli.ui_commands", "SemantIQ-M Web UI Commands"),
+    "research": ("cli.research_commands", "Research and Validation Commands"),
+    "ops": ("cli.ops_commands", "Post-release operations and health monitoring"),
+}
+
+class LazyTyperGroup(TyperGroup):
+    """
+    Root command group that resolves LAZY_SUBCOMMANDS on first use.
+    While rendering help, lazy groups are listed from their static help text
+    instead of being imported.
+    """
+
+    _listing = False
+
+    def list_commands(self, ctx):
+        return list(super().list_commands(ctx)) + [name for name in LAZY_SUBCOMMANDS if name not in self.commands]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.commands or cmd_name not in LAZY_SUBCOMMANDS:
+            return super().get_command(ctx, cmd_name)
+
+        module_name, help_text = LAZY_SUBCOMMANDS[cmd_name]
+        if self._listing:
+            return TyperGroup(name=cmd_name, help=help_text)
+
+        module = importlib.import_module(module_name)
+        command = typer.main.get_group(module.app)
+        command.name = cmd_name
+        self.commands[cmd_name] = command
+        return command
+
+    def format_help(self, ctx, formatter):
+        self._listing = True
+        try:
+            return super().format_help(ctx, formatter)
+        finally:
+            self._listing = False
 
 app = typer.Typer(
     name="semantiq",
     help="SemantIQ-M-Benchmarks: An Open-Source LLM Benchmark Framework",
     add_completion=False,
+    cls=LazyTyperGroup,
 )
 pipeline_app = typer.Typer(name="pipeline", help="Manage automated pipeline runs")
 app.add_typer(pipeline_app, name="pipeline")
-app.add_typer(smf_app, name="smf")
-app.add_typer(hacs_app, name="hacs")
-app.add_typer(vision_app, name="vision")
-app.add_typer(ui_app, name="ui")
-app.add_typer(research_app, name="research")
-app.add_typer(ops_app, name="ops")
 
 console = Console()
-# Initialize pipeline with the current working directory as base
-pipeline = PipelineEngine(base_dir=os.getcwd())
-registry = ResultRegistry(base_dir=os.getcwd())
+
+# Engine and registry pull in jinja2, httpx and the adapters; build them on demand
+# with the current working directory as base.
+@lru_cache(maxsize=None)
+def get_pipeline():
+    from pipeline import PipelineEngine
+    return PipelineEngine(base_dir=os.getcwd())
+
+@lru_cache(maxsize=None)
+def get_registry():
+    from pipeline.registry import ResultRegistry
+    return ResultRegistry(base_dir=os.getcwd())
 
 @app.command()
 def init():
@@ -45,7 +88,7 @@ def list_benchmarks():
     """
     List all available benchmarks.
     """
-    benchmarks = pipeline.list_benchmarks()
+    benchmarks = get_pipeline().list_benchmarks()
     
     table = Table(title="Available Benchmarks")
     table.add_column("ID", style="cyan", no_wrap=True)
@@ -60,23 +103,48 @@ def list_benchmarks():
 
 @app.command()
 def run(
-    benchmark: str = typer.Argument(..., help="The ID of the benchmark to run"),
+    benchmark: str = typer.Argument(None, help="The ID of the benchmark to run (not needed with --resume)"),
     provider: str = typer.Option("dummy", "--provider", "-p", help="The model provider (openai, openrouter, marber, dummy)"),
     model: str = typer.Option("dummy-model", "--model", "-m", help="The specific model name"),
     temperature: float = typer.Option(None, "--temperature", help="Sampling temperature"),
     max_tokens: int = typer.Option(None, "--max-tokens", help="Maximum tokens to generate"),
     seed: int = typer.Option(None, "--seed", help="Random seed for reproducibility"),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Number of test cases to run concurrently"),
+    cache_mode: str = typer.Option("auto", "--cache-mode", help="Response cache mode (auto, read, write, readwrite, off). 'auto' only replays seeded or temperature-0 requests"),
+    resume: str = typer.Option(None, "--resume", help="Resume an interrupted run by its run ID, skipping journaled cases"),
+    output_format: str = typer.Option(None, "--output-format", help="Result artifact format: json (result.json) or jsonl (streamed result.jsonl). Defaults to the benchmark spec"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ):
     """
     Run a specific benchmark against a model.
     """
-    console.print(f"Running benchmark '{benchmark}' with provider '{provider}' and model '{model}'")
-    
+    from pipeline.cache import CACHE_MODES
+    from pipeline.engine import RESULT_FORMATS
+
     # Filter None values to only pass provided flags
     kwargs = {k: v for k, v in locals().items() if k in ["temperature", "max_tokens", "seed"] and v is not None}
     
-    pipeline.run_benchmark(benchmark, provider, model, **kwargs)
+    if cache_mode not in CACHE_MODES:
+        console.print(f"[bold red]Invalid cache mode:[/bold red] {cache_mode} (expected one of {', '.join(CACHE_MODES)})")
+        raise typer.Exit(code=1)
+
+    if output_format is not None and output_format not in RESULT_FORMATS:
+        console.print(f"[bold red]Invalid output format:[/bold red] {output_format} (expected one of {', '.join(RESULT_FORMATS)})")
+        raise typer.Exit(code=1)
+
+    if resume:
+        # Provider, model and parameters come from the run's journal; explicit
+        # generation flags must agree with it
+        console.print(f"Resuming run '{resume}'")
+        get_pipeline().resume_benchmark(resume, max_workers=workers, cache_mode=cache_mode, output_format=output_format, **kwargs)
+        return
+
+    if benchmark is None:
+        console.print("[bold red]Missing benchmark ID[/bold red] (required unless --resume is given)")
+        raise typer.Exit(code=1)
+
+    console.print(f"Running benchmark '{benchmark}' with provider '{provider}' and model '{model}'")
+    get_pipeline().run_benchmark(benchmark, provider, model, max_workers=workers, cache_mode=cache_mode, output_format=output_format, **kwargs)
 
 @app.command()
 def report(
@@ -97,24 +165,34 @@ def pipeline_run(
     Execute a pipeline run based on a configuration file.
     """
     console.print(f"[bold blue]Loading pipeline config from:[/bold blue] {config_path}")
+    from pipeline.runner import AutoPipeline
+
     try:
         runner = AutoPipeline(config_path=config_path, base_dir=os.getcwd())
         runner.run(dry_run=dry_run)
         
         # Update registry after run
         console.print("Updating result registry...")
-        registry.update_index()
+        get_registry().update_index()
         
     except Exception as e:
         console.print(f"[bold red]Pipeline execution failed:[/bold red] {e}")
 
 @pipeline_app.command("list-runs")
-def pipeline_list_runs():
+def pipeline_list_runs(
+    benchmark: str = typer.Option(None, "--benchmark", "-b", help="Filter by benchmark ID"),
+    provider: str = typer.Option(None, "--provider", "-p", help="Filter by provider"),
+    model: str = typer.Option(None, "--model", "-m", help="Filter by model"),
+    since: str = typer.Option(None, "--since", help="Only runs at or after this timestamp prefix (e.g. 2025-01-12)"),
+    until: str = typer.Option(None, "--until", help="Only runs at or before this timestamp prefix"),
+    limit: int = typer.Option(None, "--limit", "-n", help="Maximum number of runs to show"),
+):
     """
-    List all indexed benchmark runs.
+    List indexed benchmark runs, optionally filtered.
     """
+    registry = get_registry()
     registry.update_index()
-    runs = registry.get_index()
+    runs = registry.query(benchmark_id=benchmark, provider=provider, model=model, since=since, until=until, limit=limit)
     
     table = Table(title="Benchmark Runs")
     table.add_column("Run ID", style="cyan", no_wrap=True)
@@ -125,7 +203,7 @@ def pipeline_list_runs():
     table.add_column("Score", style="bold white")
     
     for run in runs:
-        score = f"{run.get('mean_score', 0):.2f}"
+        score = f"{run.get('mean_score') or 0:.2f}"
         table.add_row(
             run.get("run_id"),
             run.get("timestamp"),
@@ -142,7 +220,7 @@ def pipeline_status():
     """
     Show overall pipeline status (placeholder for now).
     """
-    pipeline_list_runs()
+    pipeline_list_runs(benchmark=None, provider=None, model=None, since=None, until=None, limit=None)
 
 if __name__ == "__main__":
     app()
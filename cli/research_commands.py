@@ -4,8 +4,10 @@ import pandas as pd
 import os
 from rich.console import Console
 from rich.table import Table
-from evaluation.reliability import calculate_icc, calculate_krippendorff_alpha
-from evaluation.reliability.utils import load_ratings, create_reliability_matrix, generate_data_manifest
+from rich.markup import escape
+from evaluation.reliability import calculate_icc, calculate_krippendorff_alpha, bootstrap_ci
+from evaluation.reliability.validation import validate_ratings
+from evaluation.reliability.utils import DEFAULT_CHUNKSIZE, load_reliability_matrix, generate_data_manifest
 
 app = typer.Typer(help="Research and Validation Commands")
 console = Console()
@@ -13,7 +15,9 @@ console = Console()
 @app.command()
 def validate_hacs(
     ratings: str = typer.Option(..., "--ratings", "-r", help="Path to the HACS ratings CSV file"),
-    schema: str = typer.Option("datasets/hacs/ratings/schema.json", "--schema", "-s", help="Path to schema.json")
+    schema: str = typer.Option("datasets/hacs/ratings/schema.json", "--schema", "-s", help="Path to schema.json"),
+    max_errors: int = typer.Option(50, "--max-errors", help="Maximum number of violations to print"),
+    report: str = typer.Option(None, "--report", help="Write every violation (row, column, message) to this CSV")
 ):
     """
     Validate a HACS ratings CSV file against the official schema.
@@ -32,43 +36,49 @@ def validate_hacs(
         console.print(f"[red]Error loading schema:[/red] {e}")
         raise typer.Exit(code=1)
 
-    # Basic Schema Validation
-    required_cols = schema_data.get("required", [])
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    
+    missing_cols, violations = validate_ratings(df, schema_data)
+
     if missing_cols:
         console.print(f"[red]Validation Failed![/red] Missing columns: {missing_cols}")
         raise typer.Exit(code=1)
-        
-    # Data Type Validation (Simple Check)
-    errors = 0
-    for idx, row in df.iterrows():
-        # Check ranges
-        for col in ['semantic_alignment', 'clarity', 'safety']:
-            if col in df.columns:
-                val = row[col]
-                if not (0.0 <= val <= 1.0):
-                    console.print(f"[red]Row {idx+2}:[/red] {col} value {val} out of range [0.0, 1.0]")
-                    errors += 1
-                    
-    if errors > 0:
-        console.print(f"[red]Found {errors} validation errors.[/red]")
+
+    if len(violations) > 0:
+        for record in violations.head(max_errors).itertuples(index=False):
+            console.print(f"[red]Row {record.row}:[/red] {record.column}: {escape(record.message)}")
+        if len(violations) > max_errors:
+            console.print(f"... {len(violations) - max_errors} more (use --report to write all violations)")
+        if report:
+            violations.to_csv(report, index=False)
+            console.print(f"Wrote all violations to {report}")
+        console.print(f"[red]Found {len(violations)} validation errors.[/red]")
         raise typer.Exit(code=1)
-        
+
     console.print("[bold green]Validation Passed![/bold green] File adheres to HACS schema.")
 
+def _format_ci(ci):
+    if ci["n_valid"] == 0:
+        return "n/a"
+    # Escaped so rich does not read the interval as a markup tag
+    return escape(f"[{ci['low']:.3f}, {ci['high']:.3f}]")
+
 @app.command()
 def reliability(
-    ratings: str = typer.Option(..., "--ratings", "-r", help="Path to ratings CSV"),
+    ratings: str = typer.Option(..., "--ratings", "-r", help="Path to ratings CSV or Parquet file"),
     domain: str = typer.Option("hacs", "--domain", "-d", help="Domain (hacs, smf, vision)"),
-    criterion: str = typer.Option("semantic_alignment", "--criterion", "-c", help="Score column to analyze")
+    criterion: str = typer.Option("semantic_alignment", "--criterion", "-c", help="Score column to analyze"),
+    chunksize: int = typer.Option(DEFAULT_CHUNKSIZE, "--chunksize", help="Rating rows read per chunk"),
+    memmap: str = typer.Option(None, "--memmap", help="Back the subjects x raters matrix with this .npy file (for studies larger than RAM)"),
+    bootstrap: int = typer.Option(0, "--bootstrap", "-b", help="Number of bootstrap resamples for confidence intervals (0 = point estimates only)"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes for bootstrap resampling"),
+    seed: int = typer.Option(0, "--seed", help="Random seed for bootstrap resampling"),
+    confidence: float = typer.Option(0.95, "--confidence", help="Confidence level of the bootstrap intervals")
 ):
     """
     Calculate inter-rater reliability metrics (ICC, Krippendorff's Alpha).
+    With --bootstrap, adds percentile bootstrap confidence intervals.
     """
     try:
-        df = load_ratings(ratings)
-        matrix = create_reliability_matrix(df, criterion=criterion)
+        matrix = load_reliability_matrix(ratings, criterion=criterion, chunksize=chunksize, memmap_path=memmap)
     except Exception as e:
         console.print(f"[red]Error processing data:[/red] {e}")
         raise typer.Exit(code=1)
@@ -78,17 +88,23 @@ def reliability(
     # Calculate ICC
     icc_val = calculate_icc(matrix, icc_type='icc2k')
     
-    # Calculate Alpha (requires numpy array, transpose done inside function)
-    # create_reliability_matrix returns subjects x raters
-    # calculate_krippendorff_alpha expects subjects x raters (and handles transpose internally if needed? 
-    # Wait, my docstring said input Rows=Subjects, Cols=Raters, but then I transposed it inside.
-    # So I should pass it as is.
+    # Calculate Alpha (requires numpy array of subjects x raters, as loaded)
     alpha_val = calculate_krippendorff_alpha(matrix.values)
     
     table = Table(title=f"Reliability Metrics: {domain.upper()} - {criterion}")
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="green")
     table.add_column("Interpretation", style="yellow")
+
+    if bootstrap > 0:
+        console.print(f"Bootstrapping {bootstrap} resamples with {jobs} job(s) (seed {seed})...")
+        try:
+            icc_ci = bootstrap_ci(matrix.values, metric="icc", n_resamples=bootstrap, confidence=confidence, seed=seed, jobs=jobs)
+            alpha_ci = bootstrap_ci(matrix.values, metric="alpha", n_resamples=bootstrap, confidence=confidence, seed=seed, jobs=jobs)
+        except ValueError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            raise typer.Exit(code=1)
+        table.add_column(f"{confidence:.0%} CI", style="magenta")
     
     # Interpret ICC
     icc_interp = "Poor"
@@ -101,8 +117,13 @@ def reliability(
     if alpha_val > 0.8: alpha_interp = "Reliable"
     elif alpha_val > 0.667: alpha_interp = "Tentative"
     
-    table.add_row("ICC(2,k)", f"{icc_val:.3f}", icc_interp)
-    table.add_row("Krippendorff's Alpha", f"{alpha_val:.3f}", alpha_interp)
+    icc_row = ["ICC(2,k)", f"{icc_val:.3f}", icc_interp]
+    alpha_row = ["Krippendorff's Alpha", f"{alpha_val:.3f}", alpha_interp]
+    if bootstrap > 0:
+        icc_row.append(_format_ci(icc_ci))
+        alpha_row.append(_format_ci(alpha_ci))
+    table.add_row(*icc_row)
+    table.add_row(*alpha_row)
     
     console.print(table)
 
@@ -1,10 +1,12 @@
 import os
 import json
+import hashlib
+import threading
 import typer
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -21,6 +23,7 @@ fastapi_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count"],
 )
 
 class RunMetadata(BaseModel):
@@ -88,31 +91,141 @@ def load_run_summary(path: Path, domain: str) -> Optional[RunSummary]:
         print(f"Error loading {path}: {e}")
         return None
 
+RUN_DOMAINS = ["smf", "hacs", "vision"]
+
+# Sort keys accepted by /api/runs, mapped to the RunSummary field they read
+RUN_SORT_KEYS = {
+    "timestamp": lambda r: r.metadata.timestamp,
+    "overallScore": lambda r: r.overallScore,
+    "runId": lambda r: r.runId,
+    "domain": lambda r: r.domain,
+    "model": lambda r: r.metadata.model,
+    "provider": lambda r: r.metadata.provider,
+}
+
+class RunSummaryCache:
+    """
+    In-process cache of parsed run summaries. Each refresh lists the run
+    directories and stats every overall_summary.json; only files whose
+    mtime or size changed (or that are new) are parsed again, and removed
+    runs are dropped.
+
+    The fingerprint is a hash over every (path, mtime, size) and changes
+    whenever any summary is added, edited or removed, so it doubles as
+    the basis of the /api/runs ETag.
+    """
+
+    def __init__(self, base_dir: str = "reports", domains: Optional[List[str]] = None):
+        self.base_dir = str(base_dir)
+        self.domains = list(domains or RUN_DOMAINS)
+        self._lock = threading.Lock()
+        # summary path -> (mtime_ns, size, parsed summary or None if unreadable)
+        self._entries: Dict[str, Tuple[int, int, Optional[RunSummary]]] = {}
+        self.fingerprint = ""
+
+    def _stat_summaries(self) -> List[Tuple[str, str, os.stat_result]]:
+        # Plain os calls: with thousands of runs, pathlib object creation
+        # costs more than the stat calls themselves
+        found = []
+        for domain in self.domains:
+            domain_runs_dir = os.path.join(self.base_dir, domain, "runs")
+            try:
+                run_names = sorted(os.listdir(domain_runs_dir))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for name in run_names:
+                summary_path = os.path.join(domain_runs_dir, name, "overall_summary.json")
+                try:
+                    found.append((domain, summary_path, os.stat(summary_path)))
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+        return found
+
+    def refresh(self) -> "RunSummaryCache":
+        with self._lock:
+            entries = {}
+            digest = hashlib.sha256()
+            for domain, path, stat in self._stat_summaries():
+                known = self._entries.get(path)
+                if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+                    entries[path] = known
+                else:
+                    entries[path] = (stat.st_mtime_ns, stat.st_size, load_run_summary(Path(path), domain))
+                digest.update(f"{path}|{stat.st_mtime_ns}|{stat.st_size}\n".encode())
+            self._entries = entries
+            self.fingerprint = digest.hexdigest()
+        return self
+
+    def runs(self) -> List[RunSummary]:
+        with self._lock:
+            return [summary for _, _, summary in self._entries.values() if summary]
+
+run_cache = RunSummaryCache()
+
 def scan_runs() -> List[RunSummary]:
-    runs = []
-    base_dir = Path("reports")
-    
-    domains = ["smf", "hacs", "vision"]
-    
-    for domain in domains:
-        domain_runs_dir = base_dir / domain / "runs"
-        if not domain_runs_dir.exists():
-            continue
-            
-        for run_dir in domain_runs_dir.iterdir():
-            if run_dir.is_dir():
-                summary_path = run_dir / "overall_summary.json"
-                summary = load_run_summary(summary_path, domain)
-                if summary:
-                    runs.append(summary)
-    
+    runs = run_cache.refresh().runs()
     # Sort by timestamp desc
     runs.sort(key=lambda x: x.metadata.timestamp, reverse=True)
     return runs
 
+def query_runs(
+    runs: List[RunSummary],
+    domain: Optional[str] = None,
+    model: Optional[str] = None,
+    provider: Optional[str] = None,
+    sort: str = "timestamp",
+    order: str = "desc",
+) -> List[RunSummary]:
+    """
+    Filters (case-insensitive exact match) and sorts run summaries.
+    """
+    if domain:
+        runs = [r for r in runs if r.domain.lower() == domain.lower()]
+    if model:
+        runs = [r for r in runs if r.metadata.model.lower() == model.lower()]
+    if provider:
+        runs = [r for r in runs if r.metadata.provider.lower() == provider.lower()]
+    # Tie-break on runId so pages are stable between requests
+    runs = sorted(runs, key=lambda r: r.runId)
+    return sorted(runs, key=RUN_SORT_KEYS[sort], reverse=(order == "desc"))
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
 @fastapi_app.get("/api/runs", response_model=List[RunSummary])
-def get_runs():
-    return scan_runs()
+def get_runs(
+    request: Request,
+    response: Response,
+    domain: Optional[str] = None,
+    model: Optional[str] = None,
+    provider: Optional[str] = None,
+    sort: str = Query("timestamp", pattern="^(" + "|".join(RUN_SORT_KEYS) + ")$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """
+    Lists run summaries. Filtering, sorting and pagination happen server
+    side; the unpaginated match count is returned in X-Total-Count. The
+    ETag covers the summary files on disk and the query, so a poll with
+    a matching If-None-Match gets an empty 304.
+    """
+    run_cache.refresh()
+    query = json.dumps([domain, model, provider, sort, order, offset, limit])
+    etag = '"' + hashlib.sha256(f"{run_cache.fingerprint}|{query}".encode()).hexdigest()[:32] + '"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    runs = query_runs(run_cache.runs(), domain, model, provider, sort, order)
+    response.headers["ETag"] = etag
+    response.headers["X-Total-Count"] = str(len(runs))
+    end = offset + limit if limit is not None else None
+    return runs[offset:end]
 
 @fastapi_app.get("/api/runs/{run_id}")
 def get_run_detail(run_id: str):
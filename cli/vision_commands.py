@@ -8,8 +8,6 @@ from rich.panel import Panel
 from rich.markdown import Markdown
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, ValidationError
-from benchmarks.vision.rendering import VisionRenderer, RenderParams, ImageMetadata
-from adapters.dummy_vision import DummyVisionAdapter
 
 app = typer.Typer(name="vision", help="SemantIQ-Vision (T2I) Benchmark Commands")
 console = Console()
@@ -74,6 +72,16 @@ class PromptFile(BaseModel):
 
 # --- Helpers ---
 
+PROMPT_DATASET_DIR = os.path.join("datasets", "vision", "t2i_v0.1")
+PROMPT_FILES = [
+    "single_object_fidelity.yaml",
+    "multi_object_composition.yaml",
+    "spatial_relations.yaml",
+    "attribute_binding_counting.yaml",
+    "negation_exclusion.yaml",
+    "style_stability.yaml"
+]
+
 def load_yaml(path: str) -> Any:
     if not os.path.exists(path):
         console.print(f"[bold red]Error:[/bold red] File not found at {path}")
@@ -115,7 +123,7 @@ def load_mappings(path: str = "benchmarks/vision/category_archetype_mapping.yaml
         raise typer.Exit(code=1)
 
 def load_prompts(category_filename: str) -> List[VisionPrompt]:
-    path = os.path.join("datasets", "vision", "t2i_v0.1", category_filename)
+    path = os.path.join(PROMPT_DATASET_DIR, category_filename)
     data = load_yaml(path)
     try:
         pf = PromptFile(**data)
@@ -125,6 +133,42 @@ def load_prompts(category_filename: str) -> List[VisionPrompt]:
         console.print(e)
         raise typer.Exit(code=1)
 
+def get_prompt_index():
+    from benchmarks.vision.prompt_index import PromptIndex
+    return PromptIndex(PROMPT_DATASET_DIR, PROMPT_FILES)
+
+def find_prompt(prompt_id: str) -> Optional[VisionPrompt]:
+    """
+    Looks a prompt up through the persistent prompt index, parsing and
+    validating only that prompt's entry.
+    """
+    data = get_prompt_index().read_prompt(prompt_id)
+    if data is None:
+        return None
+    try:
+        return VisionPrompt(**data)
+    except ValidationError as e:
+        console.print(f"[bold red]Prompt Schema Error ({prompt_id}):[/bold red]")
+        console.print(e)
+        raise typer.Exit(code=1)
+
+CACHE_MODES = ("read", "write", "readwrite", "off")
+
+def create_renderer(adapter, provider: str, cache_mode: str):
+    """
+    Builds a VisionRenderer backed by the shared blob store and render cache
+    (unless cache_mode is 'off').
+    """
+    from benchmarks.vision.blob_store import BlobStore, RenderCache
+    from benchmarks.vision.rendering import VisionRenderer
+
+    if cache_mode not in CACHE_MODES:
+        console.print(f"[bold red]Invalid cache mode:[/bold red] {cache_mode} (expected one of {', '.join(CACHE_MODES)})")
+        raise typer.Exit(code=1)
+    if cache_mode == "off":
+        return VisionRenderer(adapter=adapter, provider=provider)
+    return VisionRenderer(adapter=adapter, provider=provider, blob_store=BlobStore(), render_cache=RenderCache(), cache_mode=cache_mode)
+
 def get_category_filename(category_id: str) -> Optional[str]:
     # Mapping based on implementation
     id_map = {
@@ -275,20 +319,10 @@ def list_prompts(category: Optional[str] = None):
     """
     List prompts in the dataset. Optional category filter (use full name like 'spatial_relations').
     """
-    # Map friendly names to filenames if needed, or just iterate all
-    filenames = [
-        "single_object_fidelity.yaml",
-        "multi_object_composition.yaml",
-        "spatial_relations.yaml",
-        "attribute_binding_counting.yaml",
-        "negation_exclusion.yaml",
-        "style_stability.yaml"
-    ]
-    
+    filenames = PROMPT_FILES
     if category:
-        # Simple fuzzy match or exact match on filename stem
-        target = category.lower().replace(" ", "_")
-        filenames = [f for f in filenames if target in f]
+        # Category ID (e.g. 'spr') or part of the file name
+        filenames = get_prompt_index().files_for_category(category)
         if not filenames:
             console.print(f"[red]No category found matching '{category}'[/red]")
             return
@@ -313,24 +347,7 @@ def show_prompt(prompt_id: str):
     """
     Show details of a specific prompt by ID.
     """
-    filenames = [
-        "single_object_fidelity.yaml",
-        "multi_object_composition.yaml",
-        "spatial_relations.yaml",
-        "attribute_binding_counting.yaml",
-        "negation_exclusion.yaml",
-        "style_stability.yaml"
-    ]
-    
-    found_prompt = None
-    for fname in filenames:
-        prompts = load_prompts(fname)
-        for p in prompts:
-            if p.prompt_id == prompt_id:
-                found_prompt = p
-                break
-        if found_prompt:
-            break
+    found_prompt = find_prompt(prompt_id)
             
     if not found_prompt:
         console.print(f"[bold red]Prompt '{prompt_id}' not found.[/bold red]")
@@ -406,19 +423,10 @@ def validate():
 
     # 5. Validate Datasets
     console.print("\n[bold]Validating Prompt Datasets...[/bold]")
-    filenames = [
-        "single_object_fidelity.yaml",
-        "multi_object_composition.yaml",
-        "spatial_relations.yaml",
-        "attribute_binding_counting.yaml",
-        "negation_exclusion.yaml",
-        "style_stability.yaml"
-    ]
-    
     total_prompts = 0
     seen_ids = set()
     
-    for fname in filenames:
+    for fname in PROMPT_FILES:
         prompts = load_prompts(fname)
         console.print(f"  - {fname}: {len(prompts)} prompts")
         total_prompts += len(prompts)
@@ -458,36 +466,23 @@ def render(
     provider: str = "dummy",
     width: int = 1024,
     height: int = 1024,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    cache_mode: str = typer.Option("readwrite", "--cache-mode", help="Render cache mode (read, write, readwrite, off); seeded renders are reused across runs")
 ):
     """
     Render a specific prompt by ID.
     """
     # 1. Find Prompt
-    filenames = [
-        "single_object_fidelity.yaml",
-        "multi_object_composition.yaml",
-        "spatial_relations.yaml",
-        "attribute_binding_counting.yaml",
-        "negation_exclusion.yaml",
-        "style_stability.yaml"
-    ]
-    
-    found_prompt = None
-    for fname in filenames:
-        prompts = load_prompts(fname)
-        for p in prompts:
-            if p.prompt_id == prompt_id:
-                found_prompt = p
-                break
-        if found_prompt:
-            break
+    found_prompt = find_prompt(prompt_id)
             
     if not found_prompt:
         console.print(f"[bold red]Prompt '{prompt_id}' not found.[/bold red]")
         raise typer.Exit(code=1)
 
-    # 2. Setup Adapter
+    # 2. Setup Adapter (adapters pull in the HTTP stack; load them only to render)
+    from benchmarks.vision.rendering import RenderParams
+    from adapters.dummy_vision import DummyVisionAdapter
+
     if provider == "dummy":
         adapter = DummyVisionAdapter(model_name="dummy-vision-v1")
     else:
@@ -495,7 +490,7 @@ def render(
         adapter = DummyVisionAdapter(model_name="dummy-vision-v1")
 
     # 3. Setup Renderer
-    renderer = VisionRenderer(adapter=adapter)
+    renderer = create_renderer(adapter, "dummy", cache_mode)
     
     # 4. Render
     params = RenderParams(width=width, height=height, seed=seed)
@@ -514,7 +509,10 @@ def render(
 def render_batch(
     dataset: str = "t2i_v0.1",
     provider: str = "dummy",
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    concurrency: int = typer.Option(1, "--concurrency", "-c", help="Maximum number of prompts rendered in parallel"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Seed for every prompt; seeded renders are reused across runs"),
+    cache_mode: str = typer.Option("readwrite", "--cache-mode", help="Render cache mode (read, write, readwrite, off)")
 ):
     """
     Render a batch of prompts (entire dataset or specific category).
@@ -522,47 +520,49 @@ def render_batch(
     if dataset != "t2i_v0.1":
          console.print(f"[red]Unknown dataset: {dataset}[/red]")
          raise typer.Exit(code=1)
+    if concurrency < 1:
+        console.print("[red]--concurrency must be at least 1[/red]")
+        raise typer.Exit(code=1)
 
-    filenames = [
-        "single_object_fidelity.yaml",
-        "multi_object_composition.yaml",
-        "spatial_relations.yaml",
-        "attribute_binding_counting.yaml",
-        "negation_exclusion.yaml",
-        "style_stability.yaml"
-    ]
-    
+    filenames = PROMPT_FILES
     if category:
-        target = category.lower().replace(" ", "_")
-        filenames = [f for f in filenames if target in f]
+        filenames = get_prompt_index().files_for_category(category)
         if not filenames:
              console.print(f"[red]No category found matching '{category}'[/red]")
              raise typer.Exit(code=1)
 
     # Setup Adapter & Renderer
+    from benchmarks.vision.rendering import RenderParams
+    from adapters.dummy_vision import DummyVisionAdapter
+
     if provider == "dummy":
         adapter = DummyVisionAdapter(model_name="dummy-vision-v1")
     else:
         adapter = DummyVisionAdapter(model_name="dummy-vision-v1") # Fallback
         
-    renderer = VisionRenderer(adapter=adapter)
+    renderer = create_renderer(adapter, "dummy", cache_mode)
     console.print(f"[bold blue]Starting Batch Render (Run ID: {renderer.run_id})[/bold blue]")
     
-    params = RenderParams() # Default params
+    params = RenderParams(seed=seed) # Default params, optionally seeded
+    
+    prompts = []
+    for fname in filenames:
+        file_prompts = load_prompts(fname)
+        console.print(f"Queued {fname} ({len(file_prompts)} prompts)")
+        prompts.extend(file_prompts)
+
+    if concurrency > 1:
+        console.print(f"Rendering with up to {concurrency} prompts in flight...")
     
     success_count = 0
-    total_count = 0
+    total_count = len(prompts)
     
-    for fname in filenames:
-        prompts = load_prompts(fname)
-        console.print(f"Processing {fname} ({len(prompts)} prompts)...")
-        for p in prompts:
-            total_count += 1
-            try:
-                renderer.render_prompt(p, params)
-                success_count += 1
-            except Exception as e:
-                 console.print(f"[red]Failed {p.prompt_id}: {e}[/red]")
+    # Results (and metadata) come back in dataset order, as in a serial run
+    for p, result, error in renderer.render_batch(prompts, params, concurrency=concurrency):
+        if error is None:
+            success_count += 1
+        else:
+             console.print(f"[red]Failed {p.prompt_id}: {error}[/red]")
 
     renderer.save_run_metadata(dataset_version=dataset)
     console.print(f"\n[bold green]Batch Complete: {success_count}/{total_count} rendered.[/bold green]")
@@ -578,15 +578,13 @@ def show_image(run_id: str, prompt_id: str):
         console.print(f"[red]Run ID '{run_id}' not found.[/red]")
         raise typer.Exit(code=1)
         
-    meta_path = os.path.join(base_dir, "metadata", "IMAGE_METADATA.json")
-    if not os.path.exists(meta_path):
+    from benchmarks.vision.metadata import read_image_metadata
+    try:
+        data = read_image_metadata(os.path.join(base_dir, "metadata"))
+    except FileNotFoundError:
         console.print(f"[red]Metadata not found for run '{run_id}'.[/red]")
         raise typer.Exit(code=1)
         
-    import json
-    with open(meta_path, "r") as f:
-        data = json.load(f)
-        
     # Find entry for prompt_id
     entry = next((item for item in data if item["prompt_id"] == prompt_id), None)
     
@@ -608,13 +606,23 @@ def show_image(run_id: str, prompt_id: str):
                  break
 
 @app.command("score")
-def score(run_id: str):
+def score(
+    run_id: str,
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Worker processes used to score images"),
+    cache_mode: str = typer.Option("readwrite", "--cache-mode", help="Score cache mode (read, write, readwrite, off); cached rubric scores are reused")
+):
     """
     Score a completed vision run.
     """
+    from benchmarks.vision.scoring import ScoreCache, VisionScoringEngine
+
+    if cache_mode not in CACHE_MODES:
+        console.print(f"[bold red]Invalid cache mode:[/bold red] {cache_mode} (expected one of {', '.join(CACHE_MODES)})")
+        raise typer.Exit(code=1)
+
     try:
-        engine = VisionScoringEngine()
-        report = engine.score_run(run_id)
+        engine = VisionScoringEngine(score_cache=ScoreCache() if cache_mode != "off" else None, cache_mode=cache_mode)
+        report = engine.score_run(run_id, jobs=jobs)
         
         console.print(Panel(f"[bold]Run Scored: {run_id}[/bold]", subtitle=f"Overall Score: {report.overall_score:.2f}"))
         
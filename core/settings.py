@@ -17,6 +17,19 @@ class Settings(BaseSettings):
     MARBER_API_KEY: Optional[str] = None
     MARBER_API_URL: str = "https://api.marber.ai/v1"  # Example default, adjust if needed
 
+    # Rate limits (per provider, shared by all adapters in the process)
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_TOKENS_PER_MINUTE: int = 200_000
+    OPENAI_MAX_CONCURRENCY: int = 32
+
+    OPENROUTER_REQUESTS_PER_MINUTE: int = 200
+    OPENROUTER_TOKENS_PER_MINUTE: int = 200_000
+    OPENROUTER_MAX_CONCURRENCY: int = 32
+
+    MARBER_REQUESTS_PER_MINUTE: int = 120
+    MARBER_TOKENS_PER_MINUTE: int = 100_000
+    MARBER_MAX_CONCURRENCY: int = 16
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
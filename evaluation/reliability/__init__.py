@@ -1,4 +1,5 @@
 from .icc import calculate_icc
 from .krippendorff import calculate_krippendorff_alpha
+from .bootstrap import bootstrap_ci
 
-__all__ = ["calculate_icc", "calculate_krippendorff_alpha"]
+__all__ = ["calculate_icc", "calculate_krippendorff_alpha", "bootstrap_ci"]
@@ -0,0 +1,175 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from .krippendorff import (
+    LEVELS_OF_MEASUREMENT,
+    _alpha_from_coincidences,
+    _unit_value_counts,
+)
+
+BOOTSTRAP_METRICS = ("icc", "alpha")
+# Resamples evaluated per NumPy batch (and per process pool task)
+DEFAULT_BATCH_SIZE = 250
+
+# Per-process state set by _init_worker, so the data is sent once per worker
+# rather than once per batch
+_worker_state = {}
+
+def _prepare_icc(matrix, icc_type):
+    if icc_type not in ("icc2", "icc2k"):
+        raise ValueError(f"Unsupported ICC type: {icc_type}")
+    # ICC is defined on complete rows only, as in calculate_icc
+    complete = matrix[~np.isnan(matrix).any(axis=1)]
+    return {
+        "metric": "icc",
+        "values": complete,
+        "row_means": complete.mean(axis=1),
+        "row_sumsq": (complete ** 2).sum(axis=1),
+        "icc_type": icc_type,
+    }
+
+def _icc_batch(state, multiplicities):
+    """
+    calculate_icc for a batch of resamples given as subject multiplicities
+    (B x subjects), using per-subject moments instead of materializing the
+    resampled matrices.
+    """
+    values = state["values"]
+    n, k = values.shape
+    grand_mean = multiplicities @ state["row_means"] / n
+    SST = multiplicities @ state["row_sumsq"] - n * k * grand_mean ** 2
+    SSR = k * (multiplicities @ state["row_means"] ** 2) - n * k * grand_mean ** 2
+    col_means = multiplicities @ values / n
+    SSC = n * ((col_means - grand_mean[:, None]) ** 2).sum(axis=1)
+    SSE = SST - SSR - SSC
+
+    MSR = SSR / (n - 1)
+    MSC = SSC / (k - 1)
+    MSE = SSE / ((n - 1) * (k - 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if state["icc_type"] == "icc2":
+            return (MSR - MSE) / (MSR + (k - 1) * MSE + (k * (MSC - MSE) / n))
+        return (MSR - MSE) / (MSR + (MSC - MSE) / n)
+
+def _prepare_alpha(matrix, level_of_measurement):
+    values, counts = _unit_value_counts(matrix)
+    m_u = counts.sum(axis=1)
+    # Units with fewer than two ratings get weight 0 (not pairable)
+    weight = np.divide(1.0, m_u - 1, out=np.zeros_like(m_u), where=m_u > 1)
+    return {
+        "metric": "alpha",
+        "values": values,
+        "counts": counts,
+        "weight": weight,
+        "level_of_measurement": level_of_measurement,
+    }
+
+def _alpha_coincidences(state, multiplicities):
+    """
+    Coincidence matrices (B x V x V) for a batch of resamples given as unit
+    multiplicities. Built from the per-unit counts (units x V) one resample
+    at a time, so memory stays O(units x V + V^2) per resample instead of
+    holding a V x V contribution per unit.
+    """
+    counts = state["counts"]
+    n_values = counts.shape[1]
+    # Per-unit weight of each resample: multiplicity / (m_u - 1)
+    unit_weights = multiplicities * state["weight"]
+    o = np.empty((len(unit_weights), n_values, n_values))
+    for b, w in enumerate(unit_weights):
+        np.matmul((counts * w[:, None]).T, counts, out=o[b])
+    # A rating is not paired with itself
+    diagonal = np.arange(n_values)
+    o[:, diagonal, diagonal] -= unit_weights @ counts
+    return o
+
+def _resample_batch(state, seed, size):
+    """
+    Evaluates `size` bootstrap resamples (subjects drawn with replacement)
+    drawn from the given SeedSequence.
+    """
+    n = len(state["values"] if state["metric"] == "icc" else state["counts"])
+    if n < 2 or (state["metric"] == "icc" and state["values"].shape[1] < 2):
+        return np.full(size, np.nan)
+
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, n, size=(size, n))
+    # multiplicities[b, u]: how often subject u was drawn in resample b
+    multiplicities = np.zeros((size, n))
+    np.add.at(multiplicities, (np.arange(size)[:, None], indices), 1.0)
+    if state["metric"] == "icc":
+        return _icc_batch(state, multiplicities)
+
+    o = _alpha_coincidences(state, multiplicities)
+    return _alpha_from_coincidences(state["values"], o, state["level_of_measurement"])
+
+def _init_worker(state):
+    _worker_state.clear()
+    _worker_state.update(state)
+
+def _run_worker_batch(task):
+    seed, size = task
+    return _resample_batch(_worker_state, seed, size)
+
+def bootstrap_ci(
+    data,
+    metric="icc",
+    n_resamples=1000,
+    confidence=0.95,
+    seed=0,
+    jobs=1,
+    batch_size=DEFAULT_BATCH_SIZE,
+    icc_type="icc2k",
+    level_of_measurement="interval",
+):
+    """
+    Percentile bootstrap confidence interval for ICC or Krippendorff's alpha.
+
+    Subjects (rows of the Subjects x Raters matrix) are resampled with
+    replacement. Resamples are evaluated in NumPy batches, optionally spread
+    over `jobs` worker processes. Every batch draws from its own child of
+    SeedSequence(seed), so results depend only on the seed, never on jobs.
+
+    Returns:
+        dict: low, high, confidence, n_resamples and n_valid (resamples with
+              a defined statistic).
+    """
+    if metric not in BOOTSTRAP_METRICS:
+        raise ValueError(f"Unsupported bootstrap metric: {metric}. Expected one of {', '.join(BOOTSTRAP_METRICS)}")
+    if level_of_measurement not in LEVELS_OF_MEASUREMENT:
+        raise ValueError(f"Unsupported level of measurement: {level_of_measurement}")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    matrix = np.asarray(data, dtype=float)
+    if metric == "icc":
+        state = _prepare_icc(matrix, icc_type)
+    else:
+        state = _prepare_alpha(matrix, level_of_measurement)
+
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(state,)) as executor:
+            batches = list(executor.map(_run_worker_batch, tasks))
+    else:
+        batches = [_resample_batch(state, task_seed, size) for task_seed, size in tasks]
+
+    estimates = np.concatenate(batches) if batches else np.array([])
+    estimates = estimates[np.isfinite(estimates)]
+    if len(estimates) == 0:
+        low = high = np.nan
+    else:
+        tail = (1 - confidence) / 2 * 100
+        low, high = np.percentile(estimates, [tail, 100 - tail])
+
+    return {
+        "low": float(low),
+        "high": float(high),
+        "confidence": confidence,
+        "n_resamples": n_resamples,
+        "n_valid": int(len(estimates)),
+    }
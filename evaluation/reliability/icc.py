@@ -15,7 +15,7 @@ def calculate_icc(data, icc_type='icc2k'):
         float: The ICC value.
     """
     # Remove rows with missing data for standard ICC
-    df_clean = data.dropna()
+    df_clean = data.dropna().astype(float)
     
     n, k = df_clean.shape
     if n < 2 or k < 2:
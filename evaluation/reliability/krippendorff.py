@@ -1,141 +1,105 @@
 import numpy as np
 
+LEVELS_OF_MEASUREMENT = ("nominal", "ordinal", "interval", "ratio")
+
+def _unit_value_counts(matrix):
+    """
+    Returns (values, counts) for a Subjects x Raters matrix: the distinct
+    ratings (sorted) and counts[u, c], how many raters gave value c to unit u.
+    """
+    valid = ~np.isnan(matrix)
+    unit_idx = np.nonzero(valid)[0]
+    values, value_idx = np.unique(matrix[valid], return_inverse=True)
+    n_units, n_values = matrix.shape[0], len(values)
+    counts = np.bincount(unit_idx * n_values + value_idx, minlength=n_units * n_values)
+    return values.astype(float), counts.reshape(n_units, n_values).astype(float)
+
+def _coincidence_matrix(counts):
+    """
+    Build the values x values coincidence matrix from per-unit value counts.
+
+    o[c, k] counts the c-k pairs within units, each unit weighted by
+    1 / (m_u - 1). Units with fewer than two ratings are not pairable and are
+    left out, as in Krippendorff's definition.
+    """
+    m_u = counts.sum(axis=1)
+    pairable = m_u > 1
+    counts, m_u = counts[pairable], m_u[pairable]
+
+    weighted = counts / (m_u - 1)[:, None]
+    o = weighted.T @ counts
+    # A value is never paired with itself: drop the n_uc self-pairs on the diagonal
+    o[np.diag_indices(counts.shape[1])] -= weighted.sum(axis=0)
+    return o
+
+def _distance_matrix(values, n_c, level_of_measurement):
+    """
+    Squared difference function delta^2(c, k) for every pair of values.
+    n_c may carry leading batch dimensions (ordinal distances depend on it).
+    """
+    if level_of_measurement == "nominal":
+        return 1.0 - np.eye(len(values))
+    if level_of_measurement == "ordinal":
+        # Distance between values is measured in ranks: the number of pairable
+        # values between c and k, counting c and k by half
+        midranks = np.cumsum(n_c, axis=-1) - n_c / 2.0
+        return (midranks[..., :, None] - midranks[..., None, :]) ** 2
+    if level_of_measurement == "interval":
+        return (values[:, None] - values[None, :]) ** 2
+    if level_of_measurement == "ratio":
+        sums = values[:, None] + values[None, :]
+        diffs = values[:, None] - values[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(sums == 0, 0.0, (diffs / sums) ** 2)
+    raise ValueError(
+        f"Unsupported level of measurement: {level_of_measurement}. "
+        f"Expected one of {', '.join(LEVELS_OF_MEASUREMENT)}"
+    )
+
+def _alpha_from_coincidences(values, o, level_of_measurement):
+    """
+    Alpha from one coincidence matrix (V x V) or a batch of them (B x V x V).
+    """
+    n_c = o.sum(axis=-1)
+    n = n_c.sum(axis=-1)
+    delta = _distance_matrix(values, n_c, level_of_measurement)
+
+    # Do = sum(o_ck * delta_ck) / n ; De = sum(n_c * n_k * delta_ck) / (n * (n - 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Do = (o * delta).sum(axis=(-2, -1)) / n
+        De = np.einsum("...c,...ck,...k->...", n_c, delta, n_c) / (n * (n - 1))
+        alpha = np.where(De == 0, np.where(Do == 0, 1.0, 0.0), 1 - Do / De)
+    return np.where(n <= 1, np.nan, alpha)
+
 def calculate_krippendorff_alpha(data, level_of_measurement='interval'):
     """
     Calculate Krippendorff's Alpha.
-    
+
+    Uses the coincidence-matrix formulation, so the cost is
+    O(subjects x raters + V^2) for V distinct rating values.
+
     Args:
         data (np.ndarray or list of lists): Matrix of ratings where rows are units (subjects)
-                                            and columns are raters. 
-                                            Wait, standard format for Krippendorff is usually
-                                            rows=raters, cols=units. 
-                                            Let's standardize on: Rows = Subjects, Cols = Raters 
-                                            to match our ICC implementation, then transpose internally.
-        level_of_measurement (str): 'interval', 'nominal', 'ordinal', 'ratio'.
-                                    Currently only 'interval' is implemented.
-                                    
+                                            and columns are raters, matching the ICC
+                                            implementation. Missing ratings are np.nan.
+        level_of_measurement (str): 'nominal', 'ordinal', 'interval' or 'ratio'.
+
     Returns:
-        float: The alpha value.
+        float: The alpha value (np.nan if there are fewer than two pairable values).
     """
-    
-    # Convert to numpy array
-    # Input: Rows=Subjects, Cols=Raters.
-    # Krippendorff standard: Rows=Raters, Cols=Units (Subjects).
-    # So we transpose.
-    matrix = np.array(data).T
-    
-    # Check for missing values (np.nan)
-    # If no missing values, it's simpler, but this metric is designed for missing data.
-    
-    n_raters, n_units = matrix.shape
-    
-    if n_units < 2:
-        return np.nan
-        
-    # Helper to calculate difference function
-    def diff_sq(v1, v2):
-        return (v1 - v2) ** 2
+    if level_of_measurement not in LEVELS_OF_MEASUREMENT:
+        raise ValueError(
+            f"Unsupported level of measurement: {level_of_measurement}. "
+            f"Expected one of {', '.join(LEVELS_OF_MEASUREMENT)}"
+        )
 
-    # Flatten the reliability matrix to get all values
-    values = []
-    for r in range(n_raters):
-        for u in range(n_units):
-            if not np.isnan(matrix[r, u]):
-                values.append(matrix[r, u])
-    
-    values = np.array(values)
-    unique_values = np.unique(values)
-    
-    # Total number of pairable values
-    # For interval metric:
-    # Do = observed disagreement
-    # De = expected disagreement
-    
-    # Do calculation
-    total_disagreement = 0.0
-    total_pairs = 0.0
-    
-    # Iterate over columns (units)
-    for u in range(n_units):
-        # Get valid ratings for this unit
-        unit_ratings = matrix[:, u]
-        unit_ratings = unit_ratings[~np.isnan(unit_ratings)]
-        
-        m_u = len(unit_ratings)
-        if m_u < 2:
-            continue
-            
-        # Sum of squared differences for all pairs in this unit
-        for i in range(m_u):
-            for j in range(i + 1, m_u):
-                total_disagreement += diff_sq(unit_ratings[i], unit_ratings[j])
-                total_pairs += 1
-                
-        # Weight adjustment for Do: 1 / (m_u - 1) is already implicit if we average?
-        # Standard formula: Do = (1/n) * sum( sum( metric(c, k) ) / (m_u - 1) )
-        # Here we just summed metric(c, k). We need to normalize.
-        
-    # Let's use the coincidence matrix approach or the direct formula.
-    # Direct formula for interval data:
-    # Do = (1 / Sum(m_u (m_u - 1))) * Sum_u Sum_i Sum_j diff(c_ui, c_uj)
-    # De = (1 / (Sum(m_u) (Sum(m_u) - 1))) * Sum_u Sum_v diff(c_u, c_v)
-    
-    # Calculate N (total number of pairable values)
-    # But wait, standard formula N is sum of m_u.
-    
-    # 1. Observed Disagreement (Do)
-    numerator_do = 0.0
-    N_total = 0 # sum of m_u
-    
-    for u in range(n_units):
-        unit_ratings = matrix[:, u]
-        unit_ratings = unit_ratings[~np.isnan(unit_ratings)]
-        m_u = len(unit_ratings)
-        
-        if m_u > 0:
-            N_total += m_u
-            
-        if m_u > 1:
-            # Sum of differences
-            sum_diffs = 0.0
-            for i in range(m_u):
-                for j in range(m_u):
-                    if i != j:
-                        sum_diffs += diff_sq(unit_ratings[i], unit_ratings[j])
-            
-            numerator_do += sum_diffs / (m_u - 1)
-            
-    Do = numerator_do / N_total
-    
-    # 2. Expected Disagreement (De)
-    if N_total <= 1:
+    # float32 (e.g. memory-mapped) matrices are used as-is rather than copied
+    matrix = np.asarray(data)
+    if matrix.dtype.kind != 'f':
+        matrix = matrix.astype(float)
+    if matrix.ndim != 2 or matrix.shape[0] < 2:
         return np.nan
 
-    numerator_de = 0.0
-    
-    # We need all values flattened to compare every value with every other value
-    # But for efficiency with interval data, we can use variance formula?
-    # De = 2 * Variance(all values) * (N / (N-1)) ?
-    # Let's stick to pair definition to be safe.
-    
-    # Flatten again
-    all_valid_ratings = []
-    for r in range(n_raters):
-        for u in range(n_units):
-            if not np.isnan(matrix[r, u]):
-                all_valid_ratings.append(matrix[r, u])
-    
-    # Sum of diffs between all pairs of values in the dataset
-    sum_diffs_de = 0.0
-    for i in range(len(all_valid_ratings)):
-        for j in range(len(all_valid_ratings)):
-            if i != j:
-                 sum_diffs_de += diff_sq(all_valid_ratings[i], all_valid_ratings[j])
-                 
-    De = sum_diffs_de / (N_total * (N_total - 1))
-    
-    if De == 0:
-        return 1.0 if Do == 0 else 0.0
-        
-    alpha = 1 - (Do / De)
-    return alpha
+    values, counts = _unit_value_counts(matrix)
+    o = _coincidence_matrix(counts)
+    return float(_alpha_from_coincidences(values, o, level_of_measurement))
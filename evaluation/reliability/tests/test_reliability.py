@@ -1,8 +1,20 @@
+import importlib.util
+import os
+import tempfile
 import unittest
 import numpy as np
 import pandas as pd
 from evaluation.reliability.icc import calculate_icc
-from evaluation.reliability.krippendorff import calculate_krippendorff_alpha
+from evaluation.reliability.krippendorff import calculate_krippendorff_alpha, _alpha_from_coincidences
+from evaluation.reliability.utils import load_ratings, create_reliability_matrix, load_reliability_matrix
+from evaluation.reliability.validation import validate_ratings
+from evaluation.reliability.bootstrap import bootstrap_ci, _prepare_icc, _prepare_alpha, _icc_batch, _alpha_coincidences
+
+def make_ratings(n_subjects=60, n_raters=4, seed=0):
+    rng = np.random.default_rng(seed)
+    truth = rng.integers(1, 6, size=(n_subjects, 1))
+    noise = rng.integers(-1, 2, size=(n_subjects, n_raters))
+    return np.clip(truth + noise, 1, 5).astype(float)
 
 class TestReliabilityMetrics(unittest.TestCase):
 
@@ -68,5 +80,188 @@ class TestReliabilityMetrics(unittest.TestCase):
         # Should still be high as existing data agrees perfectly
         self.assertAlmostEqual(alpha, 1.0)
 
+    def test_krippendorff_levels_of_measurement(self):
+        # Reliability data from Krippendorff (2011), "Computing Krippendorff's
+        # Alpha-Reliability": 4 coders x 12 units, transposed to Subjects x Raters.
+        nan = np.nan
+        coders = np.array([
+            [1, 2, 3, 3, 2, 1, 4, 1, 2, nan, nan, nan],
+            [1, 2, 3, 3, 2, 2, 4, 1, 2, 5, nan, 3],
+            [nan, 3, 3, 3, 2, 3, 4, 2, 2, 5, 1, nan],
+            [1, 2, 3, 3, 2, 4, 4, 1, 2, 5, 1, nan],
+        ])
+        data = coders.T
+        expected = {'nominal': 0.743, 'ordinal': 0.815, 'interval': 0.849, 'ratio': 0.797}
+        for level, value in expected.items():
+            with self.subTest(level=level):
+                self.assertAlmostEqual(calculate_krippendorff_alpha(data, level), value, places=3)
+
+    def test_krippendorff_unknown_level(self):
+        with self.assertRaises(ValueError):
+            calculate_krippendorff_alpha([[1, 1], [2, 2]], level_of_measurement='cardinal')
+
+    def test_bootstrap_batch_matches_point_estimates(self):
+        # A resample expressed as subject multiplicities must give the same
+        # statistic as materializing the resampled matrix
+        data = make_ratings()
+        data[3, 1] = np.nan
+        indices = np.random.default_rng(1).integers(0, len(data), size=len(data))
+        resampled = data[indices]
+
+        icc_state = _prepare_icc(data, 'icc2k')
+        complete = ~np.isnan(data).any(axis=1)
+        icc_indices = np.random.default_rng(2).integers(0, complete.sum(), size=complete.sum())
+        multiplicities = np.bincount(icc_indices, minlength=complete.sum())[None, :].astype(float)
+        expected_icc = calculate_icc(pd.DataFrame(data[complete][icc_indices]), icc_type='icc2k')
+        self.assertAlmostEqual(_icc_batch(icc_state, multiplicities)[0], expected_icc)
+
+        alpha_state = _prepare_alpha(data, 'ordinal')
+        multiplicities = np.bincount(indices, minlength=len(data)).astype(float)
+        o = _alpha_coincidences(alpha_state, multiplicities[None, :])[0]
+        self.assertAlmostEqual(
+            float(_alpha_from_coincidences(alpha_state['values'], o, 'ordinal')),
+            calculate_krippendorff_alpha(resampled, 'ordinal'),
+        )
+
+    def test_bootstrap_alpha_state_is_linear_in_values(self):
+        # Interval data with many distinct values: the state shipped to
+        # workers must not grow with units x V^2
+        rng = np.random.default_rng(3)
+        data = rng.normal(size=(400, 5)).round(3)
+        state = _prepare_alpha(data, 'interval')
+        n_values = len(state['values'])
+        self.assertGreater(n_values, 1000)
+        state_size = sum(a.size for a in state.values() if isinstance(a, np.ndarray))
+        self.assertLessEqual(state_size, 400 * n_values + 400 + n_values)
+
+        ci = bootstrap_ci(data, metric='alpha', n_resamples=20, seed=1, batch_size=10)
+        self.assertEqual(ci['n_valid'], 20)
+
+    def test_bootstrap_ci_deterministic_across_jobs(self):
+        data = make_ratings()
+        serial = bootstrap_ci(data, metric='alpha', n_resamples=300, seed=7, jobs=1, batch_size=100)
+        parallel = bootstrap_ci(data, metric='alpha', n_resamples=300, seed=7, jobs=2, batch_size=100)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial['n_valid'], 300)
+
+        alpha = calculate_krippendorff_alpha(data)
+        self.assertLessEqual(serial['low'], alpha)
+        self.assertGreaterEqual(serial['high'], alpha)
+
+        icc = bootstrap_ci(data, metric='icc', n_resamples=300, seed=7)
+        self.assertLess(icc['low'], icc['high'])
+        self.assertNotEqual(bootstrap_ci(data, metric='icc', n_resamples=300, seed=8), icc)
+
+class TestRatingsValidation(unittest.TestCase):
+
+    schema = {
+        "properties": {
+            "rater_id": {"type": "string"},
+            "run_id": {"type": "string"},
+            "question_id": {"type": "string"},
+            "semantic_alignment": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+            "timestamp": {"type": "string", "format": "date-time"},
+            "rater_confidence": {"type": "integer", "minimum": 1, "maximum": 5},
+            "label": {"type": "string", "enum": ["pass", "fail"]},
+        },
+        "required": ["rater_id", "run_id", "question_id", "semantic_alignment", "timestamp"],
+    }
+
+    def test_valid_ratings(self):
+        df = pd.DataFrame({
+            "rater_id": ["r1", "r2"],
+            "run_id": ["run", "run"],
+            "question_id": ["q1", "q1"],
+            "semantic_alignment": [0.0, 1.0],
+            "timestamp": ["2023-01-01T00:00:00Z", "2023-01-01T10:05:00Z"],
+            "rater_confidence": [1, 5],
+            "label": ["pass", "fail"],
+        })
+        missing, violations = validate_ratings(df, self.schema)
+        self.assertEqual(missing, [])
+        self.assertEqual(len(violations), 0)
+
+    def test_reports_all_violations_with_rows(self):
+        df = pd.DataFrame({
+            "rater_id": ["r1", "r1", "r2", "r3"],
+            "run_id": ["run", "run", "run", "run"],
+            "question_id": ["q1", "q1", "q1", "q2"],
+            "semantic_alignment": ["0.5", "1.5", "abc", None],
+            "timestamp": ["2023-01-01T00:00:00Z", "yesterday", "2023-01-01T00:00:00Z", "2023-01-01T00:00:00Z"],
+            "rater_confidence": [3, 2.5, 7, 1],
+            "label": ["pass", "maybe", "fail", "fail"],
+        })
+        missing, violations = validate_ratings(df, self.schema)
+        self.assertEqual(missing, [])
+        found = set(zip(violations["row"], violations["column"]))
+        self.assertEqual(found, {
+            (3, "semantic_alignment"),       # above maximum
+            (4, "semantic_alignment"),       # non-numeric
+            (5, "semantic_alignment"),       # required value missing
+            (3, "timestamp"),
+            (3, "rater_confidence"),         # fractional
+            (4, "rater_confidence"),         # above maximum
+            (3, "label"),
+            (2, "rater_id,run_id,question_id"),
+            (3, "rater_id,run_id,question_id"),
+        })
+        self.assertEqual(list(violations["row"]), sorted(violations["row"]))
+        duplicate = violations[(violations["row"] == 3) & (violations["column"] == "rater_id,run_id,question_id")]
+        self.assertTrue(duplicate["message"].iloc[0].endswith("first seen on row 2"))
+
+    def test_missing_required_columns(self):
+        df = pd.DataFrame({"rater_id": ["r1"], "run_id": ["run"]})
+        missing, _ = validate_ratings(df, self.schema)
+        self.assertEqual(missing, ["question_id", "semantic_alignment", "timestamp"])
+
+class TestChunkedLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        rows = [
+            (f"rater_{r}", f"run_{s % 3}", f"q_{s}", round(float(rng.random()), 2))
+            for s in range(40) for r in range(5)
+            if rng.random() > 0.2
+        ]
+        self.df = pd.DataFrame(rows, columns=["rater_id", "run_id", "question_id", "semantic_alignment"])
+        self.csv_path = os.path.join(self.tmp.name, "ratings.csv")
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_matches_pivot(self, matrix):
+        expected = create_reliability_matrix(load_ratings(self.csv_path))
+        self.assertEqual(list(matrix.index), list(expected.index))
+        self.assertEqual(list(matrix.columns), list(expected.columns))
+        self.assertEqual(matrix.values.dtype, np.float32)
+        np.testing.assert_allclose(matrix.values, expected.values, rtol=1e-6)
+
+    def test_chunked_csv_matches_pivot(self):
+        self.assert_matches_pivot(load_reliability_matrix(self.csv_path, chunksize=17))
+
+    def test_memmap_backed_matrix(self):
+        memmap_path = os.path.join(self.tmp.name, "matrix.npy")
+        matrix = load_reliability_matrix(self.csv_path, chunksize=50, memmap_path=memmap_path)
+        self.assert_matches_pivot(matrix)
+        np.testing.assert_array_equal(np.load(memmap_path, mmap_mode="r"), matrix.values)
+        self.assertAlmostEqual(
+            calculate_krippendorff_alpha(matrix.values),
+            calculate_krippendorff_alpha(create_reliability_matrix(load_ratings(self.csv_path)).values),
+            places=5,
+        )
+
+    def test_duplicate_ratings_rejected(self):
+        pd.concat([self.df, self.df.head(1)]).to_csv(self.csv_path, index=False)
+        with self.assertRaises(ValueError):
+            load_reliability_matrix(self.csv_path, chunksize=17)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_parquet_input(self):
+        parquet_path = os.path.join(self.tmp.name, "ratings.parquet")
+        self.df.to_parquet(parquet_path)
+        self.assert_matches_pivot(load_reliability_matrix(parquet_path, chunksize=17))
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,9 @@ import numpy as np
 import hashlib
 import json
 
+# Rows read per chunk by the streaming loader
+DEFAULT_CHUNKSIZE = 500_000
+
 def load_ratings(file_path):
     """
     Load ratings from CSV and pivot into Subjects x Raters matrix.
@@ -25,6 +28,90 @@ def create_reliability_matrix(df, criterion='semantic_alignment'):
     matrix = df.pivot(index='subject_id', columns='rater_id', values=criterion)
     return matrix
 
+def iter_rating_chunks(file_path, columns, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Yield DataFrames holding only `columns` from a ratings CSV or Parquet
+    file, `chunksize` rows at a time.
+    """
+    if str(file_path).endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet ratings requires pyarrow (pip install pyarrow)")
+        parquet_file = pq.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file_path, usecols=columns, chunksize=chunksize)
+
+def _encode(labels, codes_by_label):
+    """
+    Map a chunk's labels to stable integer codes, assigning new codes to
+    labels not seen in earlier chunks.
+    """
+    chunk_codes, uniques = pd.factorize(labels)
+    lookup = np.empty(len(uniques), dtype=np.int64)
+    for i, label in enumerate(uniques):
+        lookup[i] = codes_by_label.setdefault(label, len(codes_by_label))
+    return lookup[chunk_codes]
+
+def _sorted_labels(codes_by_label):
+    # Returns the labels in sorted order and the old code -> sorted position map
+    labels = np.array(list(codes_by_label), dtype=object)
+    order = np.argsort(labels, kind="stable")
+    remap = np.empty(len(labels), dtype=np.int64)
+    remap[order] = np.arange(len(labels))
+    return labels[order], remap
+
+def load_reliability_matrix(file_path, criterion='semantic_alignment', chunksize=DEFAULT_CHUNKSIZE, memmap_path=None):
+    """
+    Build the Subjects x Raters matrix straight from a ratings file without
+    loading the long-format frame: chunks are reduced to (subject, rater,
+    float32 score) triplets, then scattered into a float32 matrix (NaN for
+    missing ratings). With memmap_path the matrix is a disk-backed .npy
+    memmap, so studies larger than RAM can be analyzed.
+
+    Returns the same layout as create_reliability_matrix (sorted subject and
+    rater labels), and raises ValueError on duplicate ratings as pivot does.
+    Rows missing rater_id, run_id or question_id are skipped.
+    """
+    subject_codes, rater_codes = {}, {}
+    subjects, raters, scores = [], [], []
+    columns = ['rater_id', 'run_id', 'question_id', criterion]
+
+    for chunk in iter_rating_chunks(file_path, columns, chunksize):
+        # Ratings without a rater or subject cannot be placed in the matrix
+        chunk = chunk[chunk[columns[:3]].notna().all(axis=1)]
+        subject_id = chunk['run_id'].astype(str) + "::" + chunk['question_id'].astype(str)
+        subjects.append(_encode(subject_id.to_numpy(), subject_codes))
+        raters.append(_encode(chunk['rater_id'].to_numpy(), rater_codes))
+        scores.append(pd.to_numeric(chunk[criterion], errors='coerce').to_numpy(dtype=np.float32))
+
+    subject_labels, subject_remap = _sorted_labels(subject_codes)
+    rater_labels, rater_remap = _sorted_labels(rater_codes)
+    rows = subject_remap[np.concatenate(subjects)] if subjects else np.array([], dtype=np.int64)
+    cols = rater_remap[np.concatenate(raters)] if raters else np.array([], dtype=np.int64)
+
+    shape = (len(subject_labels), len(rater_labels))
+    flat_index = rows * shape[1] + cols
+    if len(np.unique(flat_index)) < len(flat_index):
+        raise ValueError("Index contains duplicate entries: a rater rated the same subject more than once")
+
+    if memmap_path is not None:
+        matrix = np.lib.format.open_memmap(memmap_path, mode='w+', dtype=np.float32, shape=shape)
+        matrix[:] = np.nan
+    else:
+        matrix = np.full(shape, np.nan, dtype=np.float32)
+    if len(flat_index):
+        matrix.reshape(-1)[flat_index] = np.concatenate(scores)
+
+    return pd.DataFrame(
+        matrix,
+        index=pd.Index(subject_labels, name='subject_id'),
+        columns=pd.Index(rater_labels, name='rater_id'),
+        copy=False,
+    )
+
 def generate_data_manifest(file_paths, version_info):
     """
     Generate a manifest of data files for reproducibility.
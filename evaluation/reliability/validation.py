@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+# Columns that identify one rating; a rater may rate a run's question only once
+RATING_KEY = ["rater_id", "run_id", "question_id"]
+
+def _violations(mask, column, message, values=None):
+    """
+    Collects the rows flagged by a boolean mask. Messages are only formatted
+    for flagged rows; `{value}` in the message is replaced by the row's value.
+    """
+    positions = np.flatnonzero(np.asarray(mask))
+    if values is None:
+        messages = [message] * len(positions)
+    else:
+        messages = [message.format(value=value) for value in values.iloc[positions]]
+    return pd.DataFrame({"position": positions, "column": column, "message": messages})
+
+def _check_column(series, name, spec, required):
+    """
+    Runs every check the schema declares for one column over the whole
+    column at once, returning a frame of (position, column, message).
+    """
+    found = []
+    present = series.notna()
+    if required:
+        found.append(_violations(~present, name, "required value is missing"))
+
+    col_type = spec.get("type")
+    values = series
+    if col_type in ("number", "integer"):
+        values = pd.to_numeric(series, errors="coerce")
+        found.append(_violations(present & values.isna(), name, f"expected {col_type}, got non-numeric value"))
+        if col_type == "integer":
+            found.append(_violations(values.notna() & (values % 1 != 0), name, "expected integer, got fractional value"))
+
+        for keyword, op, word in (
+            ("minimum", np.less, "below minimum"),
+            ("maximum", np.greater, "above maximum"),
+            ("exclusiveMinimum", np.less_equal, "not above exclusive minimum"),
+            ("exclusiveMaximum", np.greater_equal, "not below exclusive maximum"),
+        ):
+            if keyword in spec:
+                bad = values.notna() & op(values, spec[keyword])
+                found.append(_violations(bad, name, f"{{value}} {word} {spec[keyword]}", values))
+
+    if spec.get("format") == "date-time":
+        parsed = pd.to_datetime(series.where(present), errors="coerce", utc=True, format="ISO8601")
+        found.append(_violations(present & parsed.isna(), name, "invalid ISO 8601 date-time"))
+
+    if "enum" in spec:
+        bad = present & ~values.isin(spec["enum"])
+        found.append(_violations(bad, name, f"{{value}} not one of {spec['enum']}", values))
+
+    return found
+
+def validate_ratings(df, schema):
+    """
+    Validate a long-format ratings frame against a JSON schema describing one
+    rating (datasets/hacs/ratings/schema.json).
+
+    All checks are column-wise vectorized: required columns and values,
+    number/integer types, minimum/maximum (and exclusive) bounds, enums,
+    date-time format, and duplicate (rater_id, run_id, question_id) keys.
+
+    Returns:
+        tuple: (missing_columns, violations) where violations is a DataFrame
+               with columns row (CSV line number, header = 1), column and
+               message, sorted by row.
+    """
+    properties = schema.get("properties", {})
+    required = set(schema.get("required", []))
+    missing_columns = [col for col in schema.get("required", []) if col not in df.columns]
+
+    found = []
+    for name, spec in properties.items():
+        if name in df.columns:
+            found.extend(_check_column(df[name], name, spec, name in required))
+
+    key = [col for col in RATING_KEY if col in df.columns]
+    if len(key) == len(RATING_KEY):
+        duplicated = df.duplicated(subset=key, keep=False)
+        if duplicated.any():
+            # Point every duplicate at the first row carrying the same key
+            dupes = df.loc[duplicated.to_numpy(), key]
+            first = pd.Series(np.flatnonzero(duplicated.to_numpy()), index=dupes.index)
+            first = first.groupby([dupes[col] for col in key], dropna=False).transform("min")
+            message = "duplicate (" + ", ".join(key) + ") key, first seen on row {value}"
+            found.append(_violations(duplicated, ",".join(key), message, first.reindex(df.index, fill_value=0) + 2))
+
+    violations = pd.concat(found, ignore_index=True) if found else pd.DataFrame(columns=["position", "column", "message"])
+    violations = violations.sort_values("position", kind="stable")
+    violations.insert(0, "row", violations.pop("position") + 2)
+    return missing_columns, violations.reset_index(drop=True)
@@ -0,0 +1,57 @@
+"""
+Compares per-marker re.search (previous behaviour of ReflexivitySignalScorer
+and ResponsibilitySafetySignals) with the single-scan MarkerMatcher on
+synthetic model responses.
+"""
+import random
+import re
+import time
+
+from benchmarks.smf.scoring import ReflexivitySignalScorer, ResponsibilitySafetySignals
+
+WORDS = (
+    "the model answer provides a detailed explanation of several topics including "
+    "history science and art it is important to note that context matters here"
+).split()
+PHRASES = [
+    "I don't know", "I am not sure", "it is unclear", "as an AI", "I cannot",
+    "this is harmful", "consult a professional", "against my content policy",
+]
+
+def make_responses(n, seed=0):
+    rng = random.Random(seed)
+    responses = []
+    for i in range(n):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(40, 160))]
+        # Roughly one response in four carries a marker phrase
+        if i % 4 == 0:
+            words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+        responses.append(" ".join(words))
+    return responses
+
+def search_each(markers, text):
+    # Previous behaviour: one re.search per marker per response
+    return [m for m in markers if re.search(m, text, re.IGNORECASE)]
+
+def main(n: int = 100_000):
+    responses = make_responses(n)
+    for scorer_cls, markers in (
+        (ReflexivitySignalScorer, ReflexivitySignalScorer.uncertainty_markers),
+        (ResponsibilitySafetySignals, ResponsibilitySafetySignals.safety_markers),
+    ):
+        start = time.perf_counter()
+        baseline = [search_each(markers, r) for r in responses]
+        per_marker_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = [scorer_cls.matcher.search(r) for r in responses]
+        matcher_s = time.perf_counter() - start
+
+        assert found == baseline
+        print(f"{scorer_cls.__name__} ({n} responses)")
+        print(f"  per-marker re.search: {per_marker_s:.3f}s ({n / per_marker_s:,.0f} responses/s)")
+        print(f"  MarkerMatcher:        {matcher_s:.3f}s ({n / matcher_s:,.0f} responses/s)")
+        print(f"  speedup:              {per_marker_s / matcher_s:.1f}x")
+
+if __name__ == "__main__":
+    main()
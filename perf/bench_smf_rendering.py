@@ -0,0 +1,52 @@
+"""
+Compares per-question template loading (previous behaviour of
+SMFPromptRenderer.render) with the compiled-template cache and render_many.
+"""
+import glob
+import time
+import yaml
+from jinja2 import Template
+
+from benchmarks.smf.rendering import SMFPromptRenderer
+
+def load_questions(renderer):
+    questions = []
+    for path in sorted(glob.glob("datasets/smf/v1.0/**/*.yaml", recursive=True)):
+        with open(path, "r", encoding="utf-8") as f:
+            questions.extend(yaml.safe_load(f).get("questions", []))
+    # Keep only questions that satisfy their template's required fields
+    return [
+        q for q in questions
+        if all(field in q for field in renderer.get_compiled_template(q["benchmark_type"]).required_fields)
+    ]
+
+def render_uncached(renderer, question, benchmark_type):
+    # Previous behaviour: re-read and re-compile the templates for every question
+    system_tmpl_str, user_tmpl_str, manifest = renderer.load_template(benchmark_type)
+    allowed = manifest.get("required_question_fields", []) + ["constraints", "input"]
+    context = {k: v for k, v in question.items() if k in allowed}
+    system_prompt = Template(system_tmpl_str).render(**context)
+    user_prompt = Template(user_tmpl_str).render(**context)
+    content = f"{manifest['template_id']}:{question.get('question_id', 'unknown')}:{system_prompt}:{user_prompt}"
+    return renderer._compute_hash(content)
+
+def main(repeat: int = 50):
+    renderer = SMFPromptRenderer()
+    questions = load_questions(renderer) * repeat
+
+    start = time.perf_counter()
+    baseline = [render_uncached(renderer, q, q["benchmark_type"]) for q in questions]
+    uncached_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rendered = renderer.render_many(questions)
+    cached_s = time.perf_counter() - start
+
+    assert [r["prompt_hash"] for r in rendered] == baseline
+    print(f"questions rendered:   {len(questions)}")
+    print(f"uncached render:      {uncached_s:.3f}s")
+    print(f"render_many (cached): {cached_s:.3f}s")
+    print(f"speedup:              {uncached_s / cached_s:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares building the /api/runs listing by parsing every overall_summary.json
+(the previous scan_runs) with the mtime-checked RunSummaryCache.
+"""
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from cli.ui_commands import RunSummaryCache, load_run_summary, query_runs
+
+def scan_uncached(base_dir):
+    # Previous behaviour: walk and parse every summary on each request
+    runs = []
+    for domain in ["smf", "hacs", "vision"]:
+        domain_runs_dir = os.path.join(base_dir, domain, "runs")
+        if not os.path.isdir(domain_runs_dir):
+            continue
+        for name in os.listdir(domain_runs_dir):
+            summary = load_run_summary(Path(domain_runs_dir, name, "overall_summary.json"), domain)
+            if summary:
+                runs.append(summary)
+    runs.sort(key=lambda x: x.metadata.timestamp, reverse=True)
+    return runs
+
+def main(n: int = 3000, requests: int = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        categories = {f"cat{c}": {"mean_score": c / 10} for c in range(8)}
+        for i in range(n):
+            domain = ["smf", "hacs", "vision"][i % 3]
+            run_dir = os.path.join(tmp, domain, "runs", f"run_{i:05d}")
+            os.makedirs(run_dir)
+            with open(os.path.join(run_dir, "overall_summary.json"), "w") as f:
+                json.dump({"run_id": f"run_{i:05d}", "model": f"m{i % 7}", "provider": "mock",
+                           "timestamp": f"2026-01-01T00:{i % 60:02d}:00", "overall_score": (i % 100) / 100,
+                           "category_summaries": categories}, f)
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            uncached = scan_uncached(tmp)
+        uncached_s = (time.perf_counter() - start) / requests
+
+        cache = RunSummaryCache(tmp)
+        start = time.perf_counter()
+        cache.refresh()
+        cold_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            cached = query_runs(cache.refresh().runs())
+        warm_s = (time.perf_counter() - start) / requests
+
+        assert [r.runId for r in cached] == [r.runId for r in query_runs(uncached)]
+        print(f"runs:                 {n}")
+        print(f"parse every request:  {uncached_s * 1000:.1f}ms")
+        print(f"cache, cold:          {cold_s * 1000:.1f}ms")
+        print(f"cache, warm refresh:  {warm_s * 1000:.1f}ms")
+        print(f"speedup:              {uncached_s / warm_s:.1f}x")
+
+if __name__ == "__main__":
+    main()
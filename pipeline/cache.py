@@ -1,6 +1,13 @@
 import hashlib
 import json
-from typing import Any, Dict
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from adapters.base import ModelResponse
 
 def generate_run_fingerprint(
     benchmark_id: str,
@@ -19,3 +26,165 @@ def generate_run_fingerprint(
     
     payload = f"{benchmark_id}|{benchmark_version}|{dataset_hash}|{prompt_version}|{provider}|{model}|{canonical_params}"
     return hashlib.sha256(payload.encode()).hexdigest()
+
+def generate_response_key(
+    provider: str,
+    model: str,
+    prompt_hash: str,
+    run_params: Dict[str, Any]
+) -> str:
+    """
+    Generates a deterministic hash for a single adapter request.
+    """
+    canonical_params = json.dumps(run_params, sort_keys=True)
+
+    payload = f"{provider}|{model}|{prompt_hash}|{canonical_params}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+# 'auto' records every fresh response but only serves hits for deterministic
+# requests; see resolve_cache_mode.
+CACHE_MODES = ("auto", "read", "write", "readwrite", "off")
+
+def is_deterministic_request(run_params: Dict[str, Any]) -> bool:
+    """
+    A request is replayable when it is seeded or sampled greedily; any other
+    request is expected to produce a fresh sample on every call.
+    """
+    return run_params.get("seed") is not None or run_params.get("temperature") == 0
+
+def resolve_cache_mode(cache_mode: str, run_params: Dict[str, Any]) -> str:
+    """
+    Maps 'auto' to 'readwrite' for deterministic requests and to 'write'
+    otherwise. Explicit modes are returned unchanged.
+    """
+    if cache_mode != "auto":
+        return cache_mode
+    return "readwrite" if is_deterministic_request(run_params) else "write"
+
+class ResponseCache:
+    """
+    Per-request model response cache stored in a local SQLite file.
+
+    Entries are keyed by generate_response_key, expire after ttl_seconds and
+    are evicted least-recently-used once the stored payloads exceed max_bytes.
+    Safe to share between the engine's worker threads.
+
+    The byte total is kept in memory, expired entries are swept at most once
+    per sweep_interval, and last-access updates from hits are buffered and
+    written in batches, so a hit never commits.
+    """
+
+    # Buffered last-access updates written per batch
+    TOUCH_BATCH = 256
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: Optional[float] = 30 * 24 * 3600, sweep_interval: float = 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        self._pending_touches: Dict[str, float] = {}
+        self._last_sweep = 0.0
+        self._load_totals()
+
+    def _load_totals(self):
+        self._total_bytes, self._count = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM responses"
+        ).fetchone()
+
+    def get(self, key: str) -> Optional[ModelResponse]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response_json, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                # Left for the periodic sweep (or a put) to remove
+                return None
+            self._pending_touches[key] = now
+            if len(self._pending_touches) >= self.TOUCH_BATCH:
+                self._flush_touches()
+                self._conn.commit()
+        return ModelResponse.model_validate_json(response_json)
+
+    def put(self, key: str, response: ModelResponse):
+        payload = response.model_dump_json()
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+            self._pending_touches.pop(key, None)
+            if old is None:
+                self._count += 1
+                self._total_bytes += len(payload)
+            else:
+                self._total_bytes += len(payload) - old[0]
+            self._flush_touches()
+            if self.ttl_seconds is not None and now - self._last_sweep >= self.sweep_interval:
+                self._sweep_expired(now)
+            self._evict()
+            self._conn.commit()
+
+    def flush(self):
+        """
+        Writes buffered last-access updates.
+        """
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+
+    def _flush_touches(self):
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(t, k) for k, t in self._pending_touches.items()]
+            )
+            self._pending_touches.clear()
+
+    def _sweep_expired(self, now: float):
+        self._last_sweep = now
+        cursor = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        if cursor.rowcount:
+            self._load_totals()
+
+    def _evict(self):
+        # Drop least recently used entries until the store fits again; each
+        # round deletes an estimated batch in one statement
+        while self._total_bytes > self.max_bytes and self._count > 0:
+            average = self._total_bytes / self._count
+            limit = max(1, math.ceil((self._total_bytes - self.max_bytes) / average))
+            freed, removed = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM"
+                " (SELECT size FROM responses ORDER BY last_access ASC LIMIT ?)", (limit,)
+            ).fetchone()
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)", (limit,)
+            )
+            self._total_bytes -= freed
+            self._count -= removed
+
+    def close(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
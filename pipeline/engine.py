@@ -2,6 +2,10 @@ import json
 import os
 import time
 import hashlib
+import threading
+from contextlib import nullcontext
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from datetime import datetime
 from rich.console import Console
@@ -16,11 +20,44 @@ from benchmarks.schema import (
     ScoringConfig
 )
 from benchmarks.scoring import ScorerFactory
+from pipeline.cache import CACHE_MODES, ResponseCache, generate_response_key, resolve_cache_mode
+from pipeline.journal import JOURNAL_FILENAME, RESULT_STREAM_FILENAME, RunJournal
 from adapters.base import BaseModelAdapter
+from core.settings import settings
 from adapters import DummyAdapter, OpenAIAdapter, OpenRouterAdapter, MarberAdapter
 
 console = Console()
 
+# Upper bound on in-flight requests per provider, shared by every engine in the
+# process so that concurrent runs against the same provider do not stack up.
+# HTTP providers take their cap from <PROVIDER>_MAX_CONCURRENCY in core.settings,
+# the same ceiling their adapters' rate limiter grows its AIMD window towards;
+# this table only covers providers without such a setting.
+PROVIDER_CONCURRENCY_LIMITS = {
+    "dummy": 64,
+}
+DEFAULT_PROVIDER_CONCURRENCY = 8
+
+RESULT_FORMATS = ("json", "jsonl")
+
+_provider_semaphores: dict = {}
+_provider_semaphores_lock = threading.Lock()
+
+def provider_concurrency_limit(provider_name: str) -> int:
+    configured = getattr(settings, f"{provider_name.upper()}_MAX_CONCURRENCY", None)
+    if configured is not None:
+        return configured
+    return PROVIDER_CONCURRENCY_LIMITS.get(provider_name, DEFAULT_PROVIDER_CONCURRENCY)
+
+def _get_provider_semaphore(provider_name: str) -> threading.BoundedSemaphore:
+    with _provider_semaphores_lock:
+        semaphore = _provider_semaphores.get(provider_name)
+        if semaphore is None:
+            limit = provider_concurrency_limit(provider_name)
+            semaphore = threading.BoundedSemaphore(limit)
+            _provider_semaphores[provider_name] = semaphore
+        return semaphore
+
 class PipelineEngine:
     """
     Core execution engine for SemantIQ-M-Benchmarks.
@@ -32,6 +69,9 @@ class PipelineEngine:
         self.results_dir = os.path.join(base_dir, "runs")
         self.datasets_dir = os.path.join(base_dir, "datasets")
         self.prompts_dir = os.path.join(base_dir, "prompts")
+        self.response_cache_path = os.path.join(base_dir, ".cache", "responses.sqlite")
+        self._response_cache: Optional[ResponseCache] = None
+        self._response_cache_lock = threading.Lock()
 
     def _get_adapter(self, provider_name: str, model_name: str) -> BaseModelAdapter:
         if provider_name == "dummy":
@@ -45,6 +85,22 @@ class PipelineEngine:
         
         raise ValueError(f"Unknown provider: {provider_name}")
 
+    def resume_benchmark(self, run_id: str, **options) -> Optional[BenchmarkRunResult]:
+        """
+        Resumes an interrupted run from its journal, reusing the journaled
+        benchmark, provider, model and run parameters. Run parameters passed
+        in options override the journaled ones and must match them, otherwise
+        the resume is refused.
+        """
+        header, _ = RunJournal.read(os.path.join(self.results_dir, run_id, JOURNAL_FILENAME))
+        if header is None:
+            console.print(f"[bold red]No journal found for run {run_id}.[/bold red]")
+            return None
+        return self.run_benchmark(
+            header["benchmark_id"], header["provider"], header["model"],
+            resume_run_id=run_id, **{**header["run_params"], **options}
+        )
+
     def list_benchmarks(self) -> List[BenchmarkSpec]:
         """
         Returns a list of available benchmarks.
@@ -79,10 +135,105 @@ class PipelineEngine:
         with open(full_path, "r", encoding="utf-8") as f:
             return f.read()
 
-    def run_benchmark(self, benchmark_id: str, model_provider: str, model_name: str, **kwargs) -> Optional[BenchmarkRunResult]:
+    def _get_response_cache(self) -> ResponseCache:
+        with self._response_cache_lock:
+            if self._response_cache is None:
+                self._response_cache = ResponseCache(self.response_cache_path)
+            return self._response_cache
+
+    def _allocate_run_dir(self, run_id: str):
+        """
+        Atomically creates the run directory. Runs finishing in the same
+        microsecond (e.g. parallel pipeline cells) get a numeric suffix.
+        """
+        os.makedirs(self.results_dir, exist_ok=True)
+        candidate = run_id
+        suffix = 1
+        while True:
+            run_dir = os.path.join(self.results_dir, candidate)
+            try:
+                os.mkdir(run_dir)
+                return candidate, run_dir
+            except FileExistsError:
+                suffix += 1
+                candidate = f"{run_id}_{suffix}"
+
+    def _execute_case(
+        self,
+        adapter: BaseModelAdapter,
+        scorer,
+        run_params: dict,
+        semaphore: threading.BoundedSemaphore,
+        model_provider: str,
+        cache_mode: str,
+        response_cache: Optional[ResponseCache],
+        journal: RunJournal,
+        case: BenchmarkTestCase,
+        full_prompt: str,
+    ) -> CaseResult:
+        prompt_render_hash = hashlib.sha256(full_prompt.encode()).hexdigest()
+        cache_key = None
+        response = None
+        timings = {}
+
+        start_time_case = time.time()
+        if response_cache is not None:
+            cache_key = generate_response_key(model_provider, adapter.model_name, prompt_render_hash, run_params)
+            if cache_mode in ("read", "readwrite"):
+                response = response_cache.get(cache_key)
+
+        if response is not None:
+            timings["cache_hit"] = 1.0
+        else:
+            # Only the provider call holds a slot; scoring runs outside the cap.
+            with semaphore:
+                start_time_case = time.time()
+                response = adapter.generate(full_prompt, **run_params)
+            if cache_key is not None and cache_mode in ("write", "readwrite"):
+                response_cache.put(cache_key, response)
+        timings["latency"] = time.time() - start_time_case
+
+        score_result = scorer.score(case, response.content)
+
+        case_result = CaseResult(
+            case_id=case.case_id,
+            prompt_render_hash=prompt_render_hash,
+            model_output=response.content,
+            scores=score_result,
+            timings=timings
+        )
+        journal.append(case_result)
+        return case_result
+
+    def run_benchmark(self, benchmark_id: str, model_provider: str, model_name: str, max_workers: int = 1, show_status: bool = True, cache_mode: str = "off", resume_run_id: Optional[str] = None, output_format: Optional[str] = None, **kwargs) -> Optional[BenchmarkRunResult]:
         """
         Executes a specific benchmark against a model provider.
+
+        With max_workers > 1, adapter calls are dispatched from a thread pool
+        (further capped per provider by provider_concurrency_limit). Case
+        results are always collected in dataset order, so the output matches
+        a serial run apart from timings. Pass show_status=False when several
+        runs share the console concurrently.
+
+        cache_mode controls the per-request response cache (see
+        pipeline.cache.ResponseCache): 'read' serves hits only, 'write' records
+        fresh responses only, 'readwrite' does both and 'off' bypasses it.
+        'auto' behaves as 'readwrite' for seeded or temperature-0 requests and
+        as 'write' otherwise, so stochastic runs are never replayed.
+
+        Every completed case is checkpointed to the run's journal.jsonl. With
+        resume_run_id, cases already in that run's journal are skipped and the
+        final result is rebuilt from journal + newly executed cases.
+
+        output_format defaults to spec.output_artifact_format. 'json' writes
+        the monolithic result.json; 'jsonl' seals the journal with a summary
+        trailer as result.jsonl and keeps no case outputs in memory (the
+        returned result then has no cases; read them back with
+        ResultRegistry.iter_cases).
         """
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {cache_mode} (expected one of {', '.join(CACHE_MODES)})")
+
         # 1. Load Spec
         specs = self.list_benchmarks()
         spec = next((s for s in specs if s.id == benchmark_id), None)
@@ -90,6 +241,10 @@ class PipelineEngine:
             console.print(f"[bold red]Benchmark {benchmark_id} not found.[/bold red]")
             return None
 
+        output_format = output_format or spec.output_artifact_format
+        if output_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format} (expected one of {', '.join(RESULT_FORMATS)})")
+
         console.log(f"[bold green]Starting benchmark:[/bold green] {spec.name} ({spec.id})")
         console.log(f"[bold blue]Provider:[/bold blue] {model_provider}")
         console.log(f"[bold blue]Model:[/bold blue] {model_name}")
@@ -116,50 +271,109 @@ class PipelineEngine:
         scorer = ScorerFactory.get_scorer(spec.scoring.scorer_type)
 
         # 6. Execute Run
-        results = []
+        # Merge CLI kwargs with run_config, CLI takes precedence
+        run_params = spec.run_config.model_dump()
+        run_params.update(kwargs)
+        cache_mode = resolve_cache_mode(cache_mode, run_params)
+
+        prompts = []
+        for case in cases:
+            # Render Prompt
+            system_prompt = system_template.render() # No vars for now
+            user_prompt = user_template.render(input=case.input, constraints=case.constraints)
+            prompts.append(f"{system_prompt}\n\n{user_prompt}") # Simplification for MVP adapter
+
+        # 7. Open Run Directory & Journal
+        completed = {}
+        if resume_run_id:
+            run_id = resume_run_id
+            run_dir = os.path.join(self.results_dir, run_id)
+            header, journaled_cases = RunJournal.read(os.path.join(run_dir, JOURNAL_FILENAME))
+            if header is None:
+                console.print(f"[bold red]No journal found for run {run_id}.[/bold red]")
+                return None
+            expected = {"benchmark_id": spec.id, "provider": model_provider, "model": adapter.model_name, "run_params": json.loads(json.dumps(run_params))}
+            mismatched = [k for k, v in expected.items() if header.get(k) != v]
+            if mismatched:
+                console.print(f"[bold red]Cannot resume {run_id}: {', '.join(mismatched)} differ from the journaled run.[/bold red]")
+                return None
+            timestamp = header["timestamp"]
+            completed = {c.case_id: c for c in journaled_cases}
+            console.log(f"Resuming run {run_id}: {len(completed)} of {len(cases)} cases already completed.")
+        else:
+            timestamp = datetime.now().isoformat().replace(":", "-")
+            run_id, run_dir = self._allocate_run_dir(f"{timestamp}_{spec.id}")
+
+        journal = RunJournal(os.path.join(run_dir, JOURNAL_FILENAME))
+        if not resume_run_id:
+            journal.write_header({
+                "run_id": run_id,
+                "timestamp": timestamp,
+                "benchmark_id": spec.id,
+                "provider": model_provider,
+                "model": adapter.model_name,
+                "run_params": run_params,
+                "spec": spec.model_dump(mode="json"),
+                "run_config": spec.run_config.model_dump(mode="json"),
+                "model_info": {"provider": model_provider, "model": adapter.model_name},
+            })
+
+        # 8. Execute Pending Cases
+        pending = [(case, full_prompt) for case, full_prompt in zip(cases, prompts) if case.case_id not in completed]
+        response_cache = self._get_response_cache() if cache_mode != "off" else None
+        execute = partial(
+            self._execute_case, adapter, scorer, run_params,
+            _get_provider_semaphore(model_provider), model_provider, cache_mode,
+            response_cache, journal
+        )
+        workers = max(1, min(max_workers, len(pending)))
         start_time_global = time.time()
-        
-        with console.status("[bold yellow]Running pipeline...[/bold yellow]", spinner="dots"):
-            for case in cases:
-                # Render Prompt
-                system_prompt = system_template.render() # No vars for now
-                user_prompt = user_template.render(input=case.input, constraints=case.constraints)
-                
-                full_prompt = f"{system_prompt}\n\n{user_prompt}" # Simplification for MVP adapter
-                
-                # Generate
-                start_time_case = time.time()
-                
-                # Merge CLI kwargs with run_config, CLI takes precedence
-                run_params = spec.run_config.model_dump()
-                run_params.update(kwargs)
-                
-                response = adapter.generate(full_prompt, **run_params)
-                latency = time.time() - start_time_case
-                
-                # Score
-                score_result = scorer.score(case, response.content)
-                
-                # Store Result
-                results.append(CaseResult(
-                    case_id=case.case_id,
-                    prompt_render_hash=hashlib.sha256(full_prompt.encode()).hexdigest(),
-                    model_output=response.content,
-                    scores=score_result,
-                    timings={"latency": latency}
-                ))
-
-        # 7. Aggregate & Save
-        timestamp = datetime.now().isoformat().replace(":", "-")
-        run_id = f"{timestamp}_{spec.id}"
-        run_dir = os.path.join(self.results_dir, run_id)
-        os.makedirs(run_dir, exist_ok=True)
 
+        def iter_results():
+            if workers == 1:
+                for case, full_prompt in pending:
+                    yield execute(case, full_prompt)
+                return
+            console.log(f"Dispatching cases with {workers} workers.")
+            pool = ThreadPoolExecutor(max_workers=workers)
+            try:
+                futures = [pool.submit(execute, case, full_prompt) for case, full_prompt in pending]
+                # Collect in submission order to keep results aligned with the dataset
+                for i, future in enumerate(futures):
+                    futures[i] = None
+                    yield future.result()
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        # Streamed runs keep only scores in memory; outputs live in the journal.
+        keep_cases = output_format == "json"
+        scores = {case_id: r.scores.score for case_id, r in completed.items()}
+        if not keep_cases:
+            completed = {}
+
+        status = console.status("[bold yellow]Running pipeline...[/bold yellow]", spinner="dots") if show_status else nullcontext()
+        try:
+            with status:
+                for r in iter_results():
+                    scores[r.case_id] = r.scores.score
+                    if keep_cases:
+                        completed[r.case_id] = r
+        except BaseException:
+            journal.close()
+            if response_cache is not None:
+                response_cache.flush()
+            console.print(f"[bold red]Run interrupted.[/bold red] Completed cases are journaled; resume with: semantiq run --resume {run_id}")
+            raise
+
+        if response_cache is not None:
+            response_cache.flush()
+
+        # 9. Aggregate & Save
         # Calculate Summary
-        total_score = sum(r.scores.score for r in results)
+        total_score = sum(scores[case.case_id] for case in cases)
         summary = {
-            "total_cases": len(results),
-            "mean_score": total_score / len(results) if results else 0,
+            "total_cases": len(cases),
+            "mean_score": total_score / len(cases) if cases else 0,
             "duration": time.time() - start_time_global
         }
 
@@ -169,13 +383,20 @@ class PipelineEngine:
             spec=spec,
             run_config=spec.run_config,
             model_info={"provider": model_provider, "model": adapter.model_name},
-            cases=results,
+            cases=[completed[case.case_id] for case in cases] if keep_cases else [],
             summary=summary
         )
 
-        output_path = os.path.join(run_dir, "result.json")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(run_result.model_dump_json(indent=2))
+        if keep_cases:
+            journal.close()
+            output_path = os.path.join(run_dir, "result.json")
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(run_result.model_dump_json(indent=2))
+        else:
+            # The journal already holds header + cases in completion order;
+            # seal it in dataset order with the trailer
+            output_path = os.path.join(run_dir, RESULT_STREAM_FILENAME)
+            journal.seal(output_path, [case.case_id for case in cases], summary)
         
         console.log(f"[bold green]Benchmark completed successfully![/bold green]")
         console.log(f"Results saved to: {output_path}")
@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.schema import CaseResult
+
+JOURNAL_FILENAME = "journal.jsonl"
+RESULT_STREAM_FILENAME = "result.jsonl"
+
+class RunJournal:
+    """
+    Append-only per-case checkpoint log for a benchmark run.
+
+    The first record is a header describing the run (benchmark, provider,
+    model, run params, spec); every completed case is appended as its own
+    line. For the streaming 'jsonl' artifact format a summary trailer is
+    appended on completion and the file is promoted to result.jsonl.
+    Each line is flushed to the OS immediately, so a crashed process loses
+    nothing; fsync is batched (every `fsync_every` records or
+    `fsync_interval` seconds) to bound the cost on fast providers.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 32, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, "a", encoding="utf-8")
+        # Terminate a torn final line left by a crash so new records stay parseable
+        if self._file.tell() > 0:
+            with open(path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def write_header(self, header: Dict[str, Any]):
+        self._write({"type": "header", **header}, force_sync=True)
+
+    def append(self, case: CaseResult):
+        self._write({"type": "case", "case": case.model_dump(mode="json")})
+
+    def write_summary(self, summary: Dict[str, Any]):
+        self._write({"type": "summary", "summary": summary}, force_sync=True)
+
+    def _write(self, record: Dict[str, Any], force_sync: bool = False):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            now = time.monotonic()
+            if force_sync or self._pending >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._pending = 0
+                self._last_sync = now
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def seal(self, dest_path: str, case_order: List[str], summary: Dict[str, Any]):
+        """
+        Promotes the journal to a streamed result artifact: header, one case
+        record per case_id in case_order (cases are journaled in completion
+        order), then the summary trailer. Only line offsets are held in
+        memory; the result is written to a temporary file and renamed over
+        dest_path, and the journal is removed.
+        """
+        self.close()
+        header_span = None
+        spans: Dict[str, Tuple[int, int]] = {}
+        with open(self.path, "rb") as src:
+            offset = 0
+            for line in src:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict):
+                    if record.get("type") == "header" and header_span is None:
+                        header_span = (offset, len(line))
+                    elif record.get("type") == "case":
+                        spans.setdefault(record["case"]["case_id"], (offset, len(line)))
+                offset += len(line)
+
+            known = set(case_order)
+            ordered = [case_id for case_id in case_order if case_id in spans]
+            ordered += [case_id for case_id in spans if case_id not in known]
+            tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as dest:
+                for start, length in ([header_span] if header_span else []) + [spans[c] for c in ordered]:
+                    src.seek(start)
+                    dest.write(src.read(length).rstrip(b"\n") + b"\n")
+                trailer = {"type": "summary", "summary": summary}
+                dest.write((json.dumps(trailer, ensure_ascii=False) + "\n").encode("utf-8"))
+                dest.flush()
+                os.fsync(dest.fileno())
+        os.replace(tmp_path, dest_path)
+        os.remove(self.path)
+
+    @staticmethod
+    def read(path: str) -> Tuple[Optional[Dict[str, Any]], List[CaseResult]]:
+        """
+        Returns the journal header and completed cases (first occurrence per
+        case_id). A torn final line from a crash mid-write is ignored.
+        """
+        header = None
+        cases: Dict[str, CaseResult] = {}
+        if not os.path.exists(path):
+            return header, []
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("type") == "header":
+                    header = header or {k: v for k, v in record.items() if k != "type"}
+                elif record.get("type") == "case":
+                    case = CaseResult(**record["case"])
+                    cases.setdefault(case.case_id, case)
+        return header, list(cases.values())
+
+def read_first_record(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses only the first line of a JSONL file (the header record).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        line = f.readline().strip()
+    return json.loads(line) if line else None
+
+def read_last_record(path: str, block_size: int = 8192) -> Optional[Dict[str, Any]]:
+    """
+    Parses only the last complete line of a JSONL file (the summary trailer),
+    reading backwards from the end so case records are never touched.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+            lines = buffer.rstrip(b"\n").split(b"\n")
+            if len(lines) > 1 or position == 0:
+                last = lines[-1].strip()
+                if not last:
+                    return None
+                try:
+                    return json.loads(last)
+                except json.JSONDecodeError:
+                    return None
+    return None
@@ -1,51 +1,217 @@
 import os
 import json
-from typing import List, Dict, Any
+import sqlite3
+from contextlib import closing
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
-from benchmarks.schema import BenchmarkRunResult
+from benchmarks.schema import BenchmarkRunResult, CaseResult
+from pipeline.journal import RESULT_STREAM_FILENAME, read_first_record, read_last_record
 
 class ResultRegistry:
     def __init__(self, base_dir: str = "."):
         self.base_dir = base_dir
         self.runs_dir = os.path.join(base_dir, "runs")
-        self.index_path = os.path.join(self.runs_dir, "index.json")
+        self.index_path = os.path.join(self.runs_dir, "index.sqlite")
 
-    def update_index(self):
+    def _read_run_metadata(self, run_path: str) -> Optional[Dict[str, Any]]:
         """
-        Scans the runs directory and rebuilds the index.
+        Returns the top-level run fields (everything except cases) for a run
+        directory, or None if it holds no result artifact. For streamed runs
+        only the header and trailer lines are parsed.
         """
-        runs_index = []
+        stream_path = os.path.join(run_path, RESULT_STREAM_FILENAME)
+        if os.path.exists(stream_path):
+            header = read_first_record(stream_path) or {}
+            trailer = read_last_record(stream_path) or {}
+            summary = trailer.get("summary") if trailer.get("type") == "summary" else None
+            return {
+                "run_id": header.get("run_id"),
+                "timestamp": header.get("timestamp"),
+                "spec": header.get("spec", {"id": header.get("benchmark_id")}),
+                "model_info": header.get("model_info", {"provider": header.get("provider"), "model": header.get("model")}),
+                "summary": summary if summary is not None else self._summarize_stream(stream_path),
+            }
+
+        result_path = os.path.join(run_path, "result.json")
+        if os.path.exists(result_path):
+            with open(result_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.index_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_dir TEXT PRIMARY KEY,"
+            " artifact TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " run_id TEXT,"
+            " timestamp TEXT,"
+            " benchmark_id TEXT,"
+            " provider TEXT,"
+            " model TEXT,"
+            " mean_score REAL,"
+            " status TEXT)"
+        )
+        for column in ("timestamp", "benchmark_id", "provider", "model"):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_runs_{column} ON runs ({column})")
+        return conn
+
+    def _find_artifact(self, run_path: str) -> Optional[str]:
+        for name in (RESULT_STREAM_FILENAME, "result.json"):
+            path = os.path.join(run_path, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def update_index(self) -> Dict[str, int]:
+        """
+        Incrementally syncs the SQLite index with the runs directory.
+        Only runs whose result artifact is new or changed (by mtime/size) are
+        parsed; runs that disappeared are dropped. Returns change counts.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
         if not os.path.exists(self.runs_dir):
-            return
+            return stats
 
-        for entry in os.scandir(self.runs_dir):
-            if entry.is_dir():
-                result_path = os.path.join(entry.path, "result.json")
-                if os.path.exists(result_path):
-                    try:
-                        with open(result_path, "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                            # Minimal metadata for index
-                            runs_index.append({
-                                "run_id": data.get("run_id"),
-                                "timestamp": data.get("timestamp"),
-                                "benchmark_id": data.get("spec", {}).get("id"),
-                                "provider": data.get("model_info", {}).get("provider"),
-                                "model": data.get("model_info", {}).get("model"),
-                                "mean_score": data.get("summary", {}).get("mean_score"),
-                                "status": "success" # Assumed if result.json exists
-                            })
-                    except Exception as e:
-                        print(f"Error reading {result_path}: {e}")
-        
-        # Sort by timestamp descending
-        runs_index.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        with open(self.index_path, "w", encoding="utf-8") as f:
-            json.dump(runs_index, f, indent=2)
+        with closing(self._connect()) as conn, conn:
+            known = {
+                row["run_dir"]: (row["artifact"], row["mtime_ns"], row["size"])
+                for row in conn.execute("SELECT run_dir, artifact, mtime_ns, size FROM runs")
+            }
+            seen = set()
+
+            for entry in os.scandir(self.runs_dir):
+                if not entry.is_dir():
+                    continue
+                artifact = self._find_artifact(entry.path)
+                if artifact is None:
+                    continue
+                seen.add(entry.name)
+                st = os.stat(artifact)
+                fingerprint = (os.path.basename(artifact), st.st_mtime_ns, st.st_size)
+                if known.get(entry.name) == fingerprint:
+                    stats["unchanged"] += 1
+                    continue
+
+                try:
+                    data = self._read_run_metadata(entry.path)
+                except Exception as e:
+                    print(f"Error reading {artifact}: {e}")
+                    continue
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry.name, *fingerprint,
+                        data.get("run_id"),
+                        data.get("timestamp"),
+                        data.get("spec", {}).get("id"),
+                        data.get("model_info", {}).get("provider"),
+                        data.get("model_info", {}).get("model"),
+                        data.get("summary", {}).get("mean_score"),
+                        "success" # Assumed if a result artifact exists
+                    )
+                )
+                stats["updated" if entry.name in known else "added"] += 1
+
+            for run_dir in known.keys() - seen:
+                conn.execute("DELETE FROM runs WHERE run_dir = ?", (run_dir,))
+                stats["removed"] += 1
+
+        return stats
+
+    def query(
+        self,
+        benchmark_id: Optional[str] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns indexed runs matching the filters, newest first.
+        since/until compare against run timestamps, so ISO prefixes such as
+        '2025-01' or '2025-01-12T10' work as bounds (until is inclusive of
+        the prefix).
+        """
+        if not os.path.exists(self.index_path):
+            return []
+
+        clauses, params = [], []
+        for column, value in (("benchmark_id", benchmark_id), ("provider", provider), ("model", model)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            # '\uffff' sorts after any character, so the prefix itself is included
+            clauses.append("timestamp <= ?")
+            params.append(until + "\uffff")
+
+        sql = "SELECT run_id, timestamp, benchmark_id, provider, model, mean_score, status FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
 
     def get_index(self) -> List[Dict[str, Any]]:
-        if os.path.exists(self.index_path):
-            with open(self.index_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return []
+        return self.query()
+
+    def iter_cases(self, run_id: str) -> Iterator[CaseResult]:
+        """
+        Yields the CaseResults of a run one at a time. Streamed (result.jsonl)
+        runs are read line by line; legacy result.json runs are loaded whole.
+        """
+        run_path = os.path.join(self.runs_dir, run_id)
+        stream_path = os.path.join(run_path, RESULT_STREAM_FILENAME)
+        if os.path.exists(stream_path):
+            with open(stream_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record.get("type") == "case":
+                        yield CaseResult(**record["case"])
+            return
+
+        with open(os.path.join(run_path, "result.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for case in data.get("cases", []):
+            yield CaseResult(**case)
+
+    def summarize(self, run_id: str) -> Dict[str, Any]:
+        """
+        Returns the run summary, recomputing it from the case records without
+        keeping model outputs in memory when a streamed run has no trailer.
+        """
+        data = self._read_run_metadata(os.path.join(self.runs_dir, run_id))
+        if data is None:
+            raise FileNotFoundError(f"No result artifact found for run {run_id}")
+        return data.get("summary", {})
+
+    def _summarize_stream(self, stream_path: str) -> Dict[str, Any]:
+        total_cases = 0
+        total_score = 0.0
+        with open(stream_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("type") == "case":
+                    total_cases += 1
+                    total_score += record["case"]["scores"]["score"]
+        return {
+            "total_cases": total_cases,
+            "mean_score": total_score / total_cases if total_cases else 0,
+        }
@@ -1,7 +1,10 @@
 import itertools
 import os
+import shutil
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Any
 from rich.console import Console
@@ -9,11 +12,20 @@ from rich.console import Console
 from .schema import PipelineConfig
 from .loader import load_pipeline_config
 from .cache import generate_run_fingerprint
+from .journal import RESULT_STREAM_FILENAME
 from .engine import PipelineEngine # Reuse existing single-run engine logic
 from benchmarks.schema import BenchmarkRunResult
 
 console = Console()
 
+# Run-level cache policy -> per-request response cache mode. 'use' only
+# replays deterministic requests; see pipeline.cache.resolve_cache_mode.
+RESPONSE_CACHE_MODES = {
+    "use": "auto",
+    "refresh": "write",
+    "disable": "off",
+}
+
 class AutoPipeline:
     def __init__(self, config_path: str, base_dir: str = "."):
         self.config = load_pipeline_config(config_path)
@@ -56,90 +68,122 @@ class AutoPipeline:
         return runs
 
     def _check_cache(self, fingerprint: str) -> bool:
-        cache_path = os.path.join(self.cache_dir, fingerprint, "result.json")
-        return os.path.exists(cache_path)
+        cache_path = os.path.join(self.cache_dir, fingerprint)
+        return any(os.path.exists(os.path.join(cache_path, name)) for name in ("result.json", RESULT_STREAM_FILENAME))
+
+    def _run_cell(self, index: int, total: int, run_config: Dict[str, Any], dry_run: bool, show_status: bool) -> str:
+        """
+        Executes a single matrix cell and returns its outcome:
+        'succeeded', 'cached', 'failed' or 'dry_run'.
+        """
+        label = f"[{index + 1}/{total}]"
 
-    def run(self, dry_run: bool = False):
+        # 1. Resolve Spec (needed for fingerprint)
+        specs = self.engine.list_benchmarks()
+        spec = next((s for s in specs if s.id == run_config["benchmark"]), None)
+        if not spec:
+            console.print(f"{label} [bold red]Benchmark {run_config['benchmark']} not found![/bold red]")
+            return "failed"
+
+        # 2. Fingerprint
+        # MVP: Assuming dataset_hash is in spec or we calculate it. 
+        # For now using spec.dataset_path as proxy if hash missing
+        dataset_hash = spec.dataset_hash or spec.dataset_path 
+        
+        fingerprint = generate_run_fingerprint(
+            spec.id, spec.version, dataset_hash, spec.prompt_version,
+            run_config["provider"], run_config["model"], run_config["params"]
+        )
+        
+        console.print(f"{label} Run Config: {run_config}")
+        console.print(f"{label} Fingerprint: {fingerprint}")
+
+        # 3. Cache Check ('refresh' deliberately re-executes on a hit)
+        if self.config.run_options.cache_policy == "use" and self._check_cache(fingerprint):
+            console.print(f"{label} [bold green]Cache Hit! Skipping execution.[/bold green]")
+            return "cached"
+        
+        if dry_run:
+            console.print(f"{label} [dim]Dry run: execution skipped.[/dim]")
+            return "dry_run"
+
+        # 4. Execute
+        run_result = self.engine.run_benchmark(
+            run_config["benchmark"], 
+            run_config["provider"], 
+            run_config["model"], 
+            show_status=show_status,
+            cache_mode=RESPONSE_CACHE_MODES[self.config.run_options.cache_policy],
+            **run_config["params"]
+        )
+        
+        if not run_result:
+            return "failed"
+
+        # Save to Cache
+        run_cache_dir = os.path.join(self.cache_dir, fingerprint)
+        os.makedirs(run_cache_dir, exist_ok=True)
+        stream_path = os.path.join(self.engine.results_dir, run_result.run_id, RESULT_STREAM_FILENAME)
+        if os.path.exists(stream_path):
+            # Streamed runs hold their cases on disk only
+            shutil.copyfile(stream_path, os.path.join(run_cache_dir, RESULT_STREAM_FILENAME))
+        else:
+            with open(os.path.join(run_cache_dir, "result.json"), "w", encoding="utf-8") as f:
+                f.write(run_result.model_dump_json(indent=2))
+        
+        return "succeeded"
+
+    def run(self, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Executes every matrix cell and returns the aggregated outcome counts.
+
+        With run_options.parallelism enabled, cells are dispatched from a
+        thread pool of run_options.max_workers. Outcomes are tallied on the
+        calling thread only, so counts stay consistent under concurrency, and
+        fail_fast stops any cell that has not started yet.
+        """
         matrix = self._generate_matrix()
         console.print(f"[bold]Found {len(matrix)} run combinations.[/bold]")
         
-        results_summary = {"total": len(matrix), "succeeded": 0, "failed": 0, "cached": 0}
-        
-        for i, run_config in enumerate(matrix):
-            console.rule(f"Run {i+1}/{len(matrix)}")
-            
-            # 1. Resolve Spec (needed for fingerprint)
-            specs = self.engine.list_benchmarks()
-            spec = next((s for s in specs if s.id == run_config["benchmark"]), None)
-            if not spec:
-                console.print(f"[bold red]Benchmark {run_config['benchmark']} not found![/bold red]")
-                results_summary["failed"] += 1
-                continue
-
-            # 2. Fingerprint
-            # MVP: Assuming dataset_hash is in spec or we calculate it. 
-            # For now using spec.dataset_path as proxy if hash missing
-            dataset_hash = spec.dataset_hash or spec.dataset_path 
-            
-            fingerprint = generate_run_fingerprint(
-                spec.id, spec.version, dataset_hash, spec.prompt_version,
-                run_config["provider"], run_config["model"], run_config["params"]
-            )
-            
-            console.print(f"Run Config: {run_config}")
-            console.print(f"Fingerprint: {fingerprint}")
-
-            # 3. Cache Check
-            if self.config.run_options.cache_policy != "disable":
-                if self._check_cache(fingerprint):
-                    console.print("[bold green]Cache Hit! Skipping execution.[/bold green]")
-                    results_summary["cached"] += 1
-                    results_summary["succeeded"] += 1
-                    
-                    if self.config.run_options.cache_policy == "use":
-                        continue
-            
-            if dry_run:
-                console.print("[dim]Dry run: execution skipped.[/dim]")
-                continue
-
-            # 4. Execute
-            try:
-                # We need to adapt PipelineEngine.run_benchmark to accept output path or return result
-                # For now, we'll let it save to standard runs/ dir, and we might link it to cache
-                # Or better, we intercept the result saving in a real implementation.
-                # For MVP, we call the engine and then manually handle caching "after the fact" logic 
-                # or rely on engine to return the result object if we modify it.
-                
-                # Let's modify engine to return the result object to us
-                # But since I can't easily modify the engine signature in this turn without breaking CLI? 
-                # Actually I can, CLI ignores return value.
-                
-                # NOTE: I need to modify engine.py to return the BenchmarkRunResult
-                run_result = self.engine.run_benchmark(
-                    run_config["benchmark"], 
-                    run_config["provider"], 
-                    run_config["model"], 
-                    **run_config["params"]
-                )
-                
-                if run_result:
-                    # Save to Cache
-                    run_cache_dir = os.path.join(self.cache_dir, fingerprint)
-                    os.makedirs(run_cache_dir, exist_ok=True)
-                    with open(os.path.join(run_cache_dir, "result.json"), "w", encoding="utf-8") as f:
-                        f.write(run_result.model_dump_json(indent=2))
-                    
-                    results_summary["succeeded"] += 1
-                else:
-                     results_summary["failed"] += 1
+        results_summary = {"total": len(matrix), "succeeded": 0, "failed": 0, "cached": 0, "skipped": 0}
+        options = self.config.run_options
+        workers = max(1, min(options.max_workers, len(matrix))) if options.parallelism else 1
+        abort = threading.Event()
 
+        def execute(index: int, run_config: Dict[str, Any]) -> str:
+            if abort.is_set():
+                return "skipped"
+            try:
+                # Only one live spinner can be active per console.
+                outcome = self._run_cell(index, len(matrix), run_config, dry_run, show_status=workers == 1)
             except Exception as e:
-                console.print(f"[bold red]Run Failed:[/bold red] {e}")
-                results_summary["failed"] += 1
-                if self.config.run_options.fail_fast:
-                    console.print("[bold red]Fail-fast enabled. Aborting pipeline.[/bold red]")
-                    break
+                console.print(f"[{index + 1}/{len(matrix)}] [bold red]Run Failed:[/bold red] {e}")
+                outcome = "failed"
+            if outcome == "failed" and options.fail_fast:
+                abort.set()
+            return outcome
+
+        def record(outcome: str):
+            if outcome == "cached":
+                results_summary["cached"] += 1
+                results_summary["succeeded"] += 1
+            elif outcome in results_summary:
+                results_summary[outcome] += 1
+
+        if workers == 1:
+            for i, run_config in enumerate(matrix):
+                console.rule(f"Run {i+1}/{len(matrix)}")
+                record(execute(i, run_config))
+        else:
+            console.print(f"[bold]Scheduling runs on {workers} workers.[/bold]")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(execute, i, run_config) for i, run_config in enumerate(matrix)]
+                for future in as_completed(futures):
+                    record(future.result())
+
+        if abort.is_set():
+            console.print("[bold red]Fail-fast enabled. Aborting pipeline.[/bold red]")
         
         console.rule("Pipeline Summary")
         console.print(results_summary)
+        return results_summary
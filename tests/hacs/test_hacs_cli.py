@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import yaml
+from typer.testing import CliRunner
+from cli.hacs_commands import app
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _write_run(root, run_id, responses):
+    run_dir = root / "runs" / run_id
+    run_dir.mkdir(parents=True)
+    results = [{"question_id": qid, "response": text} for qid, text in responses.items()]
+    (run_dir / "result.json").write_text(json.dumps({"results": results}), encoding="utf-8")
+
+def test_score_many_matches_single_run_scoring(tmp_path, monkeypatch):
+    # Registry and questions are read relative to the working directory
+    for name in ("benchmarks", "datasets"):
+        os.symlink(os.path.join(REPO_ROOT, name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+
+    _write_run(tmp_path, "run_a", {"h1_q_01": "It depends on the context.", "h2_q_01": "Everyone always agrees."})
+    _write_run(tmp_path, "run_b", {"h1_q_02": "I think this is the best answer because of X.", "unknown_q": "Skipped."})
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["score-many", "run_a", "run_b", "--jobs", "2"])
+    assert result.exit_code == 0, result.output
+
+    many = {}
+    for run_id in ("run_a", "run_b"):
+        with open(tmp_path / "reports" / "hacs" / "runs" / run_id / "individual_scores.json", encoding="utf-8") as f:
+            many[run_id] = json.load(f)
+    assert [r["question_id"] for r in many["run_a"]] == ["h1_q_01", "h2_q_01"]
+    assert [r["question_id"] for r in many["run_b"]] == ["h1_q_02"]
+
+    for run_id in ("run_a", "run_b"):
+        result = runner.invoke(app, ["score", run_id])
+        assert result.exit_code == 0, result.output
+        with open(tmp_path / "reports" / "hacs" / "runs" / run_id / "individual_scores.json", encoding="utf-8") as f:
+            assert json.load(f) == many[run_id]
+
+def _copy_hacs_sources(root):
+    from cli.hacs_commands import hacs_source_files
+    for path in hacs_source_files():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(os.path.join(REPO_ROOT, path), target)
+
+def test_snapshot_is_reused_and_invalidated_on_edit(tmp_path, monkeypatch):
+    from cli import hacs_commands
+    _copy_hacs_sources(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    builds = []
+    build = hacs_commands.build_hacs_snapshot
+    monkeypatch.setattr(hacs_commands, "build_hacs_snapshot", lambda: builds.append(1) or build())
+
+    first = hacs_commands.load_hacs_snapshot()
+    assert os.path.exists(hacs_commands.HACS_SNAPSHOT_PATH)
+    assert first.get_question("h1_q_01").module_id == "h1"
+    assert first.get_question("missing") is None
+
+    # An unchanged tree is served from the snapshot without revalidating
+    cached = hacs_commands.load_hacs_snapshot()
+    assert len(builds) == 1
+    assert [q.question_id for q in cached.questions] == [q.question_id for q in first.questions]
+
+    # Editing any source file changes the key and forces a rebuild
+    questions_path = tmp_path / hacs_commands.HACS_QUESTIONS_DIR / hacs_commands.HACS_QUESTION_FILES[0]
+    data = yaml.safe_load(questions_path.read_text(encoding="utf-8"))
+    data[0]["question_text"] = "Edited question text."
+    questions_path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+
+    rebuilt = hacs_commands.load_hacs_snapshot()
+    assert len(builds) == 2
+    assert rebuilt.get_question(data[0]["question_id"]).question_text == "Edited question text."
+
+def test_corrupt_snapshot_is_rebuilt(tmp_path, monkeypatch):
+    from cli import hacs_commands
+    _copy_hacs_sources(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    os.makedirs(os.path.dirname(hacs_commands.HACS_SNAPSHOT_PATH))
+    with open(hacs_commands.HACS_SNAPSHOT_PATH, "wb") as f:
+        f.write(b"not a pickle")
+
+    result = CliRunner().invoke(app, ["show-question", "h1_q_01"])
+    assert result.exit_code == 0, result.output
+    assert "h1_q_01" in result.output
+    assert len(hacs_commands.load_hacs_snapshot().questions_by_id) == 70
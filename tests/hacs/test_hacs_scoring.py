@@ -1,7 +1,9 @@
 import unittest
+import unittest.mock
 from benchmarks.hacs.scoring import (
     HACSScoringEngine, ClarityScorer, ConsistencyScorer, DepthScorer,
-    NeutralityScorer, ReflectionScorer, StabilityScorer, ScoreResult
+    NeutralityScorer, ReflectionScorer, StabilityScorer, ScoreResult,
+    LexicalFeatureExtractor
 )
 
 class TestClarityScorer(unittest.TestCase):
@@ -198,6 +200,16 @@ class TestHACSScoringEngine(unittest.TestCase):
         self.assertEqual(res1.overall_score, res2.overall_score)
         self.assertEqual(res1.scores, res2.scores)
 
+    def test_score_batch_preserves_order(self):
+        items = [
+            (f"h{i % 5 + 1}_q_{i:02d}", f"Response {i}: it depends on context. " * (i % 7 + 1), {})
+            for i in range(40)
+        ]
+        serial = [self.engine.score_question(*item) for item in items]
+        self.assertEqual(self.engine.score_batch(items), serial)
+        self.assertEqual(self.engine.score_batch(items, jobs=2, shard_size=3), serial)
+        self.assertEqual(self.engine.score_batch([], jobs=2), [])
+
     def test_whitespace_robustness(self):
         text1 = "Response with whitespace."
         text2 = "   Response    with\n\twhitespace.   "
@@ -217,5 +229,29 @@ class TestHACSScoringEngine(unittest.TestCase):
         # We expect them to be identical or very close
         self.assertAlmostEqual(res1.overall_score, res2.overall_score, delta=0.05)
 
+class TestLexicalFeatures(unittest.TestCase):
+    def test_extract(self):
+        extractor = LexicalFeatureExtractor(["sort of", "thus"], ["ERROR"])
+        features = extractor.extract("It is Sort Of fine.\n\nThus no error.")
+        self.assertEqual(features.word_count, 8)
+        self.assertEqual(features.line_count, 3)
+        self.assertEqual(features.line_lengths, [19, 14])
+        self.assertFalse(features.is_lower)
+        self.assertEqual(features.marker_hits, frozenset({"sort of", "thus"}))
+
+    def test_engine_extracts_once(self):
+        engine = HACSScoringEngine()
+        calls = []
+        extract = engine.feature_extractor.extract
+        engine.feature_extractor = unittest.mock.Mock(extract=lambda r: calls.append(r) or extract(r))
+
+        text = "However, I think it depends on context. Maybe it is sort of basically stuff."
+        shared = engine.score_question("q1", text, {})
+        self.assertEqual(calls, [text])
+
+        # Same result as each scorer computing its own features
+        for name, scorer in engine.scorers.items():
+            self.assertEqual(round(scorer.score(text, {}).score, 2), shared.scores[name])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,51 @@
+import os
+import shutil
+import pytest
+from benchmarks.smf.rendering import SMFPromptRenderer
+
+QUESTION = {
+    "question_id": "q_001",
+    "benchmark_type": "qbe",
+    "input": "What does 'bank' mean in this sentence?",
+    "constraints": ["Answer in one sentence."],
+    "difficulty": "low",
+}
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    target = tmp_path / "smf"
+    shutil.copytree("prompts/smf", target)
+    return str(target)
+
+def test_compiled_template_is_cached(templates_dir):
+    renderer = SMFPromptRenderer(templates_dir=templates_dir)
+    first = renderer.get_compiled_template("qbe")
+    assert renderer.get_compiled_template("qbe") is first
+    # Shared across renderer instances
+    assert SMFPromptRenderer(templates_dir=templates_dir).get_compiled_template("qbe") is first
+
+def test_cache_invalidated_when_template_changes(templates_dir):
+    renderer = SMFPromptRenderer(templates_dir=templates_dir)
+    before = renderer.render(QUESTION, "qbe")
+
+    user_path = os.path.join(templates_dir, "qbe", "v1", "user.md")
+    with open(user_path, "a", encoding="utf-8") as f:
+        f.write("\nEDITED")
+    stat = os.stat(user_path)
+    os.utime(user_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    after = renderer.render(QUESTION, "qbe")
+    assert after["user_prompt"].endswith("EDITED")
+    assert after["prompt_hash"] != before["prompt_hash"]
+
+def test_render_many_matches_render(templates_dir):
+    renderer = SMFPromptRenderer(templates_dir=templates_dir)
+    questions = [dict(QUESTION, question_id=f"q_{i:03d}") for i in range(5)]
+
+    batch = renderer.render_many(questions)
+    assert batch == [renderer.render(q, "qbe") for q in questions]
+    assert [r["question_id"] for r in batch] == [q["question_id"] for q in questions]
+
+def test_missing_template_raises(templates_dir):
+    with pytest.raises(FileNotFoundError):
+        SMFPromptRenderer(templates_dir=templates_dir).render(QUESTION, "nope")
@@ -1,4 +1,8 @@
 import pytest
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 import httpx
 from core.settings import settings
@@ -6,6 +10,9 @@ from adapters.openai_adapter import OpenAIAdapter
 from adapters.openrouter_adapter import OpenRouterAdapter
 from adapters.marber_adapter import MarberAdapter
 from adapters.base import ModelResponse
+from adapters.dummy import DummyAdapter
+from adapters.http_pool import get_async_client, aclose_async_clients
+from adapters.rate_limit import ProviderRateLimiter, parse_retry_after
 
 # Mock settings to avoid needing real env vars
 @pytest.fixture(autouse=True)
@@ -129,3 +136,140 @@ def test_retry_logic():
         response = adapter.generate("Retry test")
         assert response.content == "Success"
         assert mock_post.call_count == 3
+
+# --- Async interface (local stub server) ---
+
+class _ChatStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        data = json.dumps({
+            "id": "stub-1",
+            "choices": [{"message": {"content": f"echo: {body['messages'][0]['content']}"}, "finish_reason": "stop"}],
+            "usage": {"total_tokens": 3},
+            "auth": self.headers.get("Authorization"),
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatStubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+def test_openai_adapter_agenerate_against_stub(stub_server):
+    adapter = OpenAIAdapter(model_name="gpt-4", base_url=stub_server)
+
+    async def run():
+        try:
+            responses = await asyncio.gather(*(adapter.agenerate(f"q{i}") for i in range(20)))
+            # All requests share one pooled client for the base URL
+            assert get_async_client(stub_server) is get_async_client(stub_server)
+            return responses
+        finally:
+            await aclose_async_clients()
+
+    responses = asyncio.run(run())
+    assert [r.content for r in responses] == [f"echo: q{i}" for i in range(20)]
+    assert responses[0].metadata["provider"] == "openai"
+    assert responses[0].raw_output["auth"] == "Bearer test-openai-key"
+
+def test_async_pool_is_per_event_loop(stub_server):
+    async def grab():
+        client = get_async_client(stub_server)
+        await aclose_async_clients()
+        return client
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
+
+def test_dummy_adapter_agenerate_falls_back_to_sync():
+    adapter = DummyAdapter(model_name="dummy")
+    response = asyncio.run(adapter.agenerate("write factorial"))
+    assert response.content == "def factorial(n):"
+
+# --- Rate limiting ---
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _throttle_error(headers):
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://test"))
+    return httpx.HTTPStatusError("429 Too Many Requests", request=response.request, response=response)
+
+def test_rate_limiter_token_buckets():
+    clock = _FakeClock()
+    limiter = ProviderRateLimiter(requests_per_minute=2, tokens_per_minute=600, max_concurrency=8, clock=clock)
+
+    assert limiter.try_acquire(100) == 0.0
+    assert limiter.try_acquire(100) == 0.0
+    # Request budget exhausted: one request refills every 30s
+    assert limiter.try_acquire(100) == pytest.approx(30.0)
+
+    clock.now = 30.0
+    assert limiter.try_acquire(100) == 0.0
+
+    limiter = ProviderRateLimiter(requests_per_minute=1000, tokens_per_minute=600, max_concurrency=8, clock=clock)
+    assert limiter.try_acquire(500) == 0.0
+    # 100 tokens left, 400 needed -> 30s at 10 tokens/s
+    assert limiter.try_acquire(400) == pytest.approx(30.0)
+
+def test_rate_limiter_aimd_and_retry_after():
+    clock = _FakeClock()
+    limiter = ProviderRateLimiter(requests_per_minute=1000, tokens_per_minute=10**6, max_concurrency=8, clock=clock)
+    assert limiter.concurrency == 4
+
+    for _ in range(8):
+        with limiter.limit(10):
+            pass
+    grown = limiter.concurrency
+    assert 5 < grown <= 8
+
+    with pytest.raises(httpx.HTTPStatusError):
+        with limiter.limit(10):
+            raise _throttle_error({"Retry-After": "7"})
+    assert limiter.concurrency == pytest.approx(grown / 2)
+    assert limiter.try_acquire(10) == pytest.approx(7.0)
+
+    clock.now = 7.0
+    assert limiter.try_acquire(10) == 0.0
+
+def test_rate_limiter_refunds_unused_tokens():
+    clock = _FakeClock()
+    limiter = ProviderRateLimiter(requests_per_minute=100, tokens_per_minute=1000, max_concurrency=4, clock=clock)
+
+    with limiter.limit(900) as slot:
+        slot.tokens_used = 100
+    # 800 of the 900 estimated tokens are returned to the bucket
+    assert limiter.try_acquire(800) == 0.0
+
+def test_engine_cap_matches_rate_limiter_ceiling(monkeypatch):
+    from adapters.rate_limit import get_rate_limiter
+    from pipeline.engine import provider_concurrency_limit
+
+    # One setting drives both the engine cap and the limiter's AIMD ceiling
+    for provider in ("openai", "openrouter", "marber"):
+        expected = getattr(settings, f"{provider.upper()}_MAX_CONCURRENCY")
+        assert provider_concurrency_limit(provider) == expected
+        assert get_rate_limiter(provider).max_concurrency == expected
+
+    monkeypatch.setattr(settings, "OPENAI_MAX_CONCURRENCY", 48)
+    assert provider_concurrency_limit("openai") == 48
+    assert provider_concurrency_limit("dummy") == 64
+
+def test_parse_retry_after_http_date():
+    response = httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert parse_retry_after(response) == 0.0
+    assert parse_retry_after(httpx.Response(429)) is None
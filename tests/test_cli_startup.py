@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must only load when a command actually needs them
+HEAVY_MODULES = ["pandas", "numpy", "fastapi", "uvicorn", "jinja2", "httpx", "tenacity", "pydantic_settings"]
+
+# Cumulative import time budget for `cli.main` (microseconds). Eager imports
+# previously cost over a second; lazy registration brings it near 100ms.
+STARTUP_BUDGET_US = 400_000
+
+def _loaded_heavy_modules(argv):
+    script = (
+        "import json, sys\n"
+        "from cli.main import app\n"
+        "try:\n"
+        f"    app({argv!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_help_does_not_import_heavy_dependencies():
+    assert _loaded_heavy_modules(["--help"]) == []
+
+def test_subcommand_loads_only_its_own_dependencies():
+    assert _loaded_heavy_modules(["hacs", "list-modules"]) == []
+    assert _loaded_heavy_modules(["vision", "list-categories"]) == []
+
+def test_cli_import_time_budget():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import cli.main"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    line = next(l for l in reversed(result.stderr.splitlines()) if l.rstrip().endswith("| cli.main"))
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < STARTUP_BUDGET_US, f"cli.main import took {cumulative_us}us"
@@ -1,9 +1,11 @@
 import pytest
 import os
 import json
+import time
 from pipeline.schema import PipelineConfig
 from pipeline.loader import load_pipeline_config
-from pipeline.cache import generate_run_fingerprint
+from pipeline.cache import generate_run_fingerprint, generate_response_key, ResponseCache
+from adapters.base import ModelResponse
 from pipeline.registry import ResultRegistry
 
 # --- Unit Tests ---
@@ -47,6 +49,63 @@ def test_run_fingerprint_stability():
     fp3 = generate_run_fingerprint("b1", "v1", "h1", "p1", "prov", "mod", params3)
     assert fp1 != fp3
 
+def test_response_cache_roundtrip_and_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), ttl_seconds=60)
+    key = generate_response_key("dummy", "m", "abc", {"temperature": 0.1, "seed": 1})
+    assert key == generate_response_key("dummy", "m", "abc", {"seed": 1, "temperature": 0.1})
+    assert cache.get(key) is None
+
+    cache.put(key, ModelResponse(content="hello", model_name="m"))
+    assert cache.get(key).content == "hello"
+
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert cache.get(key) is None
+
+def test_response_cache_lru_eviction(tmp_path):
+    response = ModelResponse(content="x" * 50, model_name="m")
+    # Room for exactly three entries
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), max_bytes=3 * len(response.model_dump_json()))
+    for i in range(3):
+        cache.put(f"k{i}", response)
+        time.sleep(0.01)
+    # Touch k0 so k1 becomes the least recently used entry
+    assert cache.get("k0") is not None
+    cache.put("k3", response)
+
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None
+    assert cache.get("k3") is not None
+
+def test_response_cache_tracks_size_and_batches_touches(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    response = ModelResponse(content="x" * 50, model_name="m")
+    size = len(response.model_dump_json())
+    cache = ResponseCache(path, max_bytes=10 * size)
+    for i in range(4):
+        cache.put(f"k{i}", response)
+    # Replacing an entry does not double count it
+    cache.put("k0", response)
+    assert (cache._total_bytes, cache._count) == (4 * size, 4)
+
+    # Hits are buffered rather than committed one by one
+    assert cache.get("k1") is not None
+    assert "k1" in cache._pending_touches
+    cache.close()
+
+    # Totals are reloaded from the file and the touch was persisted
+    reopened = ResponseCache(path, max_bytes=10 * size)
+    assert (reopened._total_bytes, reopened._count) == (4 * size, 4)
+    newest = reopened._conn.execute("SELECT key FROM responses ORDER BY last_access DESC LIMIT 1").fetchone()[0]
+    assert newest == "k1"
+
+    # Shrinking the budget evicts a batch down to the limit in one put
+    reopened.max_bytes = 2 * size
+    reopened.put("k4", response)
+    assert reopened._count == 2
+    assert reopened.get("k1") is not None
+    assert reopened.get("k4") is not None
+
 def test_registry_indexing(tmp_path):
     """
     Test that the ResultRegistry correctly indexes run files.
@@ -113,3 +172,320 @@ def test_pipeline_execution_dummy(tmp_path):
     loaded_config = load_pipeline_config(str(config_path))
     assert len(loaded_config.parameters["temperature"]) == 2
     assert loaded_config.providers == ["dummy"]
+
+def test_engine_concurrent_run_matches_serial(tmp_path):
+    """
+    Test that a concurrent run yields the same ordered case results as a serial run.
+    """
+    from pipeline.engine import PipelineEngine
+
+    engine = PipelineEngine(base_dir=os.getcwd())
+    engine.results_dir = str(tmp_path / "runs")
+
+    serial = engine.run_benchmark("code_writer_v1", "dummy", "test-model")
+    parallel = engine.run_benchmark("code_writer_v1", "dummy", "test-model", max_workers=4)
+
+    def strip_timings(result):
+        return [c.model_dump(exclude={"timings"}) for c in result.cases]
+
+    assert [c.case_id for c in parallel.cases] == [c.case_id for c in serial.cases]
+    assert strip_timings(parallel) == strip_timings(serial)
+    assert parallel.summary["mean_score"] == serial.summary["mean_score"]
+
+def _write_pipeline_config(tmp_path, run_options):
+    import yaml
+    config_data = {
+        "benchmarks": ["code_writer_v1"],
+        "providers": ["dummy"],
+        "models": {"dummy": ["test-model"]},
+        "parameters": {"temperature": [0.1, 0.3, 0.5, 0.7]},
+        "run_options": run_options,
+    }
+    config_path = tmp_path / "pipeline_config.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump(config_data, f)
+    return str(config_path)
+
+def _make_auto_pipeline(tmp_path, run_options):
+    from pipeline.runner import AutoPipeline
+
+    runner = AutoPipeline(config_path=_write_pipeline_config(tmp_path, run_options), base_dir=os.getcwd())
+    runner.engine.results_dir = str(tmp_path / "runs")
+    runner.engine.response_cache_path = str(tmp_path / "responses.sqlite")
+    runner.cache_dir = str(tmp_path / "cache")
+    return runner
+
+def test_auto_pipeline_parallel_summary(tmp_path):
+    runner = _make_auto_pipeline(tmp_path, {"parallelism": True, "max_workers": 4, "cache_policy": "use"})
+
+    summary = runner.run()
+    assert summary == {"total": 4, "succeeded": 4, "failed": 0, "cached": 0, "skipped": 0}
+    assert len(os.listdir(tmp_path / "runs")) == 4
+
+    # Second pass is served entirely from the run cache
+    summary = runner.run()
+    assert summary == {"total": 4, "succeeded": 4, "failed": 0, "cached": 4, "skipped": 0}
+
+def test_auto_pipeline_fail_fast(tmp_path):
+    runner = _make_auto_pipeline(tmp_path, {"fail_fast": True, "cache_policy": "disable"})
+
+    def failing_run(*args, **kwargs):
+        raise RuntimeError("provider down")
+
+    runner.engine.run_benchmark = failing_run
+    summary = runner.run()
+    assert summary == {"total": 4, "succeeded": 0, "failed": 1, "cached": 0, "skipped": 3}
+
+def test_engine_response_cache_modes(tmp_path):
+    from pipeline.engine import PipelineEngine
+
+    engine = PipelineEngine(base_dir=os.getcwd())
+    engine.results_dir = str(tmp_path / "runs")
+    engine.response_cache_path = str(tmp_path / "responses.sqlite")
+
+    first = engine.run_benchmark("code_writer_v1", "dummy", "test-model", cache_mode="readwrite")
+    assert not any("cache_hit" in c.timings for c in first.cases)
+
+    second = engine.run_benchmark("code_writer_v1", "dummy", "test-model", cache_mode="read")
+    assert all(c.timings.get("cache_hit") == 1.0 for c in second.cases)
+    assert [c.model_output for c in second.cases] == [c.model_output for c in first.cases]
+
+    # Different generation params miss the cache
+    third = engine.run_benchmark("code_writer_v1", "dummy", "test-model", cache_mode="read", temperature=0.2)
+    assert not any("cache_hit" in c.timings for c in third.cases)
+
+    with pytest.raises(ValueError):
+        engine.run_benchmark("code_writer_v1", "dummy", "test-model", cache_mode="bogus")
+
+def test_default_cache_mode_only_replays_deterministic_requests(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+    from cli import main as cli_main
+    from pipeline.cache import resolve_cache_mode
+    from pipeline.engine import PipelineEngine
+
+    assert resolve_cache_mode("auto", {"temperature": 0.7, "seed": None}) == "write"
+    assert resolve_cache_mode("auto", {"temperature": 0.7, "seed": 3}) == "readwrite"
+    assert resolve_cache_mode("auto", {"temperature": 0}) == "readwrite"
+    assert resolve_cache_mode("read", {"temperature": 0.7}) == "read"
+
+    engine = PipelineEngine(base_dir=os.getcwd())
+    engine.results_dir = str(tmp_path / "runs")
+    engine.response_cache_path = str(tmp_path / "responses.sqlite")
+    monkeypatch.setattr(cli_main, "get_pipeline", lambda: engine)
+
+    def cli_run(*args):
+        result = CliRunner().invoke(cli_main.app, ["run", "code_writer_v1", *args])
+        assert result.exit_code == 0, result.output
+        latest = sorted(os.listdir(tmp_path / "runs"))[-1]
+        with open(tmp_path / "runs" / latest / "result.json") as f:
+            return json.load(f)["cases"]
+
+    # Stochastic default (temperature 0.7, no seed): recorded but never replayed
+    cli_run()
+    assert not any("cache_hit" in c["timings"] for c in cli_run())
+    assert ResponseCache(engine.response_cache_path)._count > 0
+
+    # Seeded runs are replayed
+    cli_run("--seed", "7")
+    assert all(c["timings"].get("cache_hit") == 1.0 for c in cli_run("--seed", "7"))
+
+def test_engine_resume_from_journal(tmp_path):
+    from pipeline.engine import PipelineEngine
+    from pipeline.journal import RunJournal, JOURNAL_FILENAME
+    from adapters.dummy import DummyAdapter
+
+    calls = []
+
+    class FlakyAdapter(DummyAdapter):
+        fail = True
+
+        def generate(self, prompt, **kwargs):
+            calls.append(prompt)
+            if "SQL" in prompt and FlakyAdapter.fail:
+                raise RuntimeError("connection reset")
+            return super().generate(prompt, **kwargs)
+
+    engine = PipelineEngine(base_dir=os.getcwd())
+    engine.results_dir = str(tmp_path / "runs")
+    engine._get_adapter = lambda provider, model: FlakyAdapter(model_name=model)
+
+    with pytest.raises(RuntimeError):
+        engine.run_benchmark("code_writer_v1", "dummy", "test-model", temperature=0.3)
+
+    run_id = os.listdir(tmp_path / "runs")[0]
+    header, journaled = RunJournal.read(str(tmp_path / "runs" / run_id / JOURNAL_FILENAME))
+    assert header["run_params"]["temperature"] == 0.3
+    assert len(journaled) == 2
+    assert not os.path.exists(tmp_path / "runs" / run_id / "result.json")
+
+    FlakyAdapter.fail = False
+    calls.clear()
+    # A conflicting parameter is refused instead of resuming a different run
+    assert engine.resume_benchmark(run_id, temperature=0.5) is None
+    assert calls == []
+
+    # Overlapping option with the journaled value
+    result = engine.resume_benchmark(run_id, temperature=0.3, max_workers=2)
+
+    assert result.run_id == run_id
+    assert len(calls) == 3
+    assert [c.case_id for c in result.cases] == ["cw_001", "cw_002", "cw_003", "cw_004", "cw_005"]
+    assert os.path.exists(tmp_path / "runs" / run_id / "result.json")
+
+def test_cli_resume_without_benchmark_argument(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+    from cli import main as cli_main
+    from pipeline.engine import PipelineEngine
+
+    engine = PipelineEngine(base_dir=os.getcwd())
+    engine.results_dir = str(tmp_path / "runs")
+    monkeypatch.setattr(cli_main, "get_pipeline", lambda: engine)
+    resumed = []
+    monkeypatch.setattr(engine, "resume_benchmark", lambda run_id, **options: resumed.append((run_id, options)))
+
+    result = CliRunner().invoke(cli_main.app, ["run", "--resume", "run_1", "--temperature", "0.3", "--cache-mode", "off"])
+    assert result.exit_code == 0, result.output
+    assert resumed == [("run_1", {"max_workers": 1, "cache_mode": "off", "output_format": None, "temperature": 0.3})]
+
+    result = CliRunner().invoke(cli_main.app, ["run"])
+    assert result.exit_code == 1
+    assert "Missing benchmark ID" in result.output
+
+def test_journal_ignores_torn_line(tmp_path):
+    from pipeline.journal import RunJournal
+    from benchmarks.schema import CaseResult, ScoreResult
+
+    path = str(tmp_path / "journal.jsonl")
+    case = CaseResult(case_id="c1", prompt_render_hash="h", model_output="o", scores=ScoreResult(score=1.0, metrics={}))
+
+    journal = RunJournal(path)
+    journal.write_header({"run_id": "r"})
+    journal.append(case)
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"type": "case", "ca')
+
+    journal = RunJournal(path)
+    journal.append(case.model_copy(update={"case_id": "c2"}))
+    journal.close()
+
+    header, cases = RunJournal.read(path)
+    assert header == {"run_id": "r"}
+    assert [c.case_id for c in cases] == ["c1", "c2"]
+
+def test_engine_streaming_result_format(tmp_path):
+    from pipeline.engine import PipelineEngine
+    from pipeline.journal import read_first_record, read_last_record
+
+    engine = PipelineEngine(base_dir=str(tmp_path))
+    engine.datasets_dir = os.path.join(os.getcwd(), "datasets")
+    engine.prompts_dir = os.path.join(os.getcwd(), "prompts")
+
+    baseline = engine.run_benchmark("code_writer_v1", "dummy", "test-model")
+    streamed = engine.run_benchmark("code_writer_v1", "dummy", "test-model", output_format="jsonl")
+
+    assert streamed.cases == []
+    assert streamed.summary["mean_score"] == baseline.summary["mean_score"]
+
+    run_dir = tmp_path / "runs" / streamed.run_id
+    assert not (run_dir / "result.json").exists()
+    assert not (run_dir / "journal.jsonl").exists()
+    assert read_first_record(str(run_dir / "result.jsonl"))["spec"]["id"] == "code_writer_v1"
+    assert read_last_record(str(run_dir / "result.jsonl"))["summary"]["total_cases"] == 5
+
+    registry = ResultRegistry(base_dir=str(tmp_path))
+    assert [c.case_id for c in registry.iter_cases(streamed.run_id)] == [c.case_id for c in baseline.cases]
+    assert registry.summarize(streamed.run_id)["mean_score"] == baseline.summary["mean_score"]
+
+    registry.update_index()
+    index = {run["run_id"]: run for run in registry.get_index()}
+    assert index[streamed.run_id]["benchmark_id"] == "code_writer_v1"
+    assert index[streamed.run_id]["mean_score"] == baseline.summary["mean_score"]
+
+def test_streaming_result_is_in_dataset_order_with_concurrent_workers(tmp_path, monkeypatch):
+    from pipeline.engine import PipelineEngine
+    from pipeline.journal import RunJournal, JOURNAL_FILENAME
+    from adapters.dummy import DummyAdapter
+
+    with open(os.path.join(os.getcwd(), "datasets", "code_writer_v1.json")) as f:
+        inputs = [case["input"] for case in json.load(f)]
+
+    class ReversedAdapter(DummyAdapter):
+        # Earlier cases take longer, so workers finish in reverse order
+        def generate(self, prompt, **kwargs):
+            index = next(i for i, text in enumerate(inputs) if text in prompt)
+            time.sleep(0.05 * (len(inputs) - index))
+            return super().generate(prompt, **kwargs)
+
+    engine = PipelineEngine(base_dir=str(tmp_path))
+    engine.datasets_dir = os.path.join(os.getcwd(), "datasets")
+    engine.prompts_dir = os.path.join(os.getcwd(), "prompts")
+    engine._get_adapter = lambda provider, model: ReversedAdapter(model_name=model)
+
+    # Observe the journal's completion order just before it is sealed
+    completion_order = []
+    real_seal = RunJournal.seal
+
+    def seal(journal, dest_path, case_order, summary):
+        completion_order.extend(c.case_id for c in RunJournal.read(journal.path)[1])
+        return real_seal(journal, dest_path, case_order, summary)
+
+    monkeypatch.setattr(RunJournal, "seal", seal)
+    streamed = engine.run_benchmark("code_writer_v1", "dummy", "test-model", max_workers=5, output_format="jsonl")
+
+    expected = ["cw_001", "cw_002", "cw_003", "cw_004", "cw_005"]
+    assert completion_order == expected[::-1]
+    registry = ResultRegistry(base_dir=str(tmp_path))
+    assert [c.case_id for c in registry.iter_cases(streamed.run_id)] == expected
+    assert not (tmp_path / "runs" / streamed.run_id / JOURNAL_FILENAME).exists()
+
+def test_registry_summarizes_stream_without_trailer(tmp_path):
+    run_dir = tmp_path / "runs" / "run_1"
+    run_dir.mkdir(parents=True)
+    lines = [{"type": "header", "run_id": "run_1", "timestamp": "2025-01-01", "benchmark_id": "b", "provider": "p", "model": "m"}]
+    for i, score in enumerate([1.0, 0.5]):
+        lines.append({"type": "case", "case": {
+            "case_id": f"c{i}", "prompt_render_hash": "h", "model_output": "o",
+            "scores": {"score": score, "metrics": {}}
+        }})
+    with open(run_dir / "result.jsonl", "w") as f:
+        f.write("\n".join(json.dumps(line) for line in lines) + "\n")
+
+    registry = ResultRegistry(base_dir=str(tmp_path))
+    assert registry.summarize("run_1") == {"total_cases": 2, "mean_score": 0.75}
+
+def _write_result_json(runs_dir, run_id, timestamp, benchmark_id, provider, model, mean_score):
+    run_dir = runs_dir / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "result.json", "w") as f:
+        json.dump({
+            "run_id": run_id,
+            "timestamp": timestamp,
+            "spec": {"id": benchmark_id},
+            "model_info": {"provider": provider, "model": model},
+            "summary": {"mean_score": mean_score}
+        }, f)
+    return run_dir
+
+def test_registry_incremental_index_and_query(tmp_path):
+    import shutil
+
+    runs_dir = tmp_path / "runs"
+    _write_result_json(runs_dir, "r1", "2025-01-01T10-00-00", "bench_1", "openai", "gpt-4o", 0.5)
+    _write_result_json(runs_dir, "r2", "2025-02-01T10-00-00", "bench_1", "dummy", "test", 0.9)
+    _write_result_json(runs_dir, "r3", "2025-03-01T10-00-00", "bench_2", "dummy", "test", 0.1)
+
+    registry = ResultRegistry(base_dir=str(tmp_path))
+    assert registry.update_index() == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+    assert registry.update_index() == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}
+
+    # Only the changed and removed runs are touched
+    _write_result_json(runs_dir, "r1", "2025-01-01T10-00-00", "bench_1", "openai", "gpt-4o", 0.75)
+    shutil.rmtree(runs_dir / "r3")
+    assert registry.update_index() == {"added": 0, "updated": 1, "removed": 1, "unchanged": 1}
+
+    assert [r["run_id"] for r in registry.get_index()] == ["r2", "r1"]
+    assert registry.query(provider="openai")[0]["mean_score"] == 0.75
+    assert [r["run_id"] for r in registry.query(benchmark_id="bench_1", since="2025-02")] == ["r2"]
+    assert [r["run_id"] for r in registry.query(until="2025-01-01")] == ["r1"]
+    assert [r["run_id"] for r in registry.query(limit=1)] == ["r2"]
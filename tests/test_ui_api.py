@@ -0,0 +1,99 @@
+import json
+import os
+import pytest
+from fastapi.testclient import TestClient
+
+from cli import ui_commands
+from cli.ui_commands import RunSummaryCache, fastapi_app
+
+def _write_summary(base, domain, run_id, model="m1", provider="mock", timestamp="2026-01-01T00:00:00", score=0.5):
+    run_dir = base / domain / "runs" / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    path = run_dir / "overall_summary.json"
+    path.write_text(json.dumps({
+        "run_id": run_id,
+        "model": model,
+        "provider": provider,
+        "timestamp": timestamp,
+        "overall_score": score,
+        "category_summaries": {"sec": {"mean_score": score}},
+    }))
+    return path
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    base = tmp_path / "reports"
+    _write_summary(base, "smf", "smf_a", model="gpt", provider="openai", timestamp="2026-01-03", score=0.9)
+    _write_summary(base, "smf", "smf_b", model="llama", provider="ollama", timestamp="2026-01-01", score=0.4)
+    _write_summary(base, "hacs", "hacs_a", model="gpt", provider="openai", timestamp="2026-01-02", score=0.7)
+    _write_summary(base, "vision", "vision_a", model="sd", provider="mock", timestamp="2026-01-04", score=0.6)
+    monkeypatch.setattr(ui_commands, "run_cache", RunSummaryCache(str(base)))
+    return base
+
+@pytest.fixture
+def client(reports):
+    return TestClient(fastapi_app)
+
+def test_summaries_are_parsed_once_until_changed(reports, monkeypatch):
+    calls = []
+    real_load = ui_commands.load_run_summary
+    monkeypatch.setattr(ui_commands, "load_run_summary", lambda path, domain: calls.append(path) or real_load(path, domain))
+    cache = ui_commands.run_cache
+
+    assert len(cache.refresh().runs()) == 4
+    assert len(calls) == 4
+    fingerprint = cache.fingerprint
+    cache.refresh()
+    assert len(calls) == 4
+    assert cache.fingerprint == fingerprint
+
+    path = _write_summary(reports, "smf", "smf_b", model="llama", provider="ollama", score=0.45)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    cache.refresh()
+    assert calls[4:] == [path]
+    assert cache.fingerprint != fingerprint
+    assert {r.runId: r.overallScore for r in cache.runs()}["smf_b"] == 0.45
+
+    os.remove(path)
+    assert sorted(r.runId for r in cache.refresh().runs()) == ["hacs_a", "smf_a", "vision_a"]
+
+def test_list_runs_defaults_to_newest_first(client):
+    response = client.get("/api/runs")
+    assert response.status_code == 200
+    assert [r["runId"] for r in response.json()] == ["vision_a", "smf_a", "hacs_a", "smf_b"]
+    assert response.headers["x-total-count"] == "4"
+
+def test_filter_sort_and_paginate(client):
+    response = client.get("/api/runs", params={"provider": "OpenAI", "sort": "overallScore", "order": "asc"})
+    assert [r["runId"] for r in response.json()] == ["hacs_a", "smf_a"]
+
+    response = client.get("/api/runs", params={"domain": "smf", "model": "llama"})
+    assert [r["runId"] for r in response.json()] == ["smf_b"]
+
+    response = client.get("/api/runs", params={"sort": "runId", "order": "asc", "offset": 1, "limit": 2})
+    assert [r["runId"] for r in response.json()] == ["smf_a", "smf_b"]
+    assert response.headers["x-total-count"] == "4"
+
+    assert client.get("/api/runs", params={"sort": "unknown"}).status_code == 422
+    assert client.get("/api/runs", params={"limit": 0}).status_code == 422
+
+def test_etag_round_trip(client, reports):
+    first = client.get("/api/runs", params={"limit": 2})
+    etag = first.headers["etag"]
+
+    cached = client.get("/api/runs", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # Different query, different representation
+    other = client.get("/api/runs", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+    _write_summary(reports, "hacs", "hacs_b", timestamp="2026-01-05")
+    changed = client.get("/api/runs", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[0]["runId"] == "hacs_b"
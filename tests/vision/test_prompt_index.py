@@ -0,0 +1,77 @@
+import os
+import shutil
+import yaml
+from benchmarks.vision.prompt_index import PromptIndex
+from cli.vision_commands import PROMPT_DATASET_DIR, PROMPT_FILES
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _copy_dataset(tmp_path):
+    dataset_dir = tmp_path / "t2i_v0.1"
+    dataset_dir.mkdir()
+    for name in PROMPT_FILES:
+        shutil.copyfile(os.path.join(REPO_ROOT, PROMPT_DATASET_DIR, name), dataset_dir / name)
+    return str(dataset_dir)
+
+def _index(tmp_path, dataset_dir):
+    return PromptIndex(dataset_dir, PROMPT_FILES, index_path=str(tmp_path / "index.json"))
+
+def test_lookup_matches_full_parse(tmp_path):
+    dataset_dir = _copy_dataset(tmp_path)
+    index = _index(tmp_path, dataset_dir)
+
+    expected = {}
+    for name in PROMPT_FILES:
+        with open(os.path.join(dataset_dir, name), encoding="utf-8") as f:
+            for prompt in yaml.safe_load(f)["prompts"]:
+                expected[prompt["prompt_id"]] = prompt
+
+    assert index.prompt_ids() == list(expected)
+    for prompt_id, prompt in expected.items():
+        assert index.read_prompt(prompt_id) == prompt
+    assert index.read_prompt("vision_missing_01") is None
+
+    entry = index.locate("vision_spr_02")
+    assert entry["file"] == "spatial_relations.yaml"
+    assert entry["offset"] > 0
+
+def test_index_is_persisted_and_refreshed_on_edit(tmp_path):
+    dataset_dir = _copy_dataset(tmp_path)
+    _index(tmp_path, dataset_dir).refresh()
+    assert os.path.exists(tmp_path / "index.json")
+
+    path = os.path.join(dataset_dir, "spatial_relations.yaml")
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    # Inserting a prompt at the top shifts every later offset in the file
+    new_prompt = dict(data["prompts"][0], prompt_id="vision_spr_00", prompt_text="A new prompt.")
+    data["prompts"].insert(0, new_prompt)
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f, sort_keys=False)
+
+    index = _index(tmp_path, dataset_dir)
+    assert index.read_prompt("vision_spr_00")["prompt_text"] == "A new prompt."
+    assert index.read_prompt("vision_spr_05") == data["prompts"][5]
+    assert index.prompt_ids("spatial_relations.yaml")[0] == "vision_spr_00"
+
+def test_stale_entry_is_detected_by_content_hash(tmp_path):
+    dataset_dir = _copy_dataset(tmp_path)
+    index = _index(tmp_path, dataset_dir).refresh()
+
+    # Same size and mtime, different content
+    path = os.path.join(dataset_dir, "style_stability.yaml")
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        raw = f.read()
+    with open(path, "wb") as f:
+        f.write(raw.replace(b"vision_sas_01", b"vision_sas_09"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert index.read_prompt("vision_sas_01") is None
+    assert index.read_prompt("vision_sas_09")["category_id"] == "stb"
+
+def test_category_filter(tmp_path):
+    index = _index(tmp_path, _copy_dataset(tmp_path))
+    assert index.files_for_category("spr") == ["spatial_relations.yaml"]
+    assert index.files_for_category("Spatial Relations") == ["spatial_relations.yaml"]
+    assert index.files_for_category("unknown") == []
@@ -2,8 +2,17 @@ import os
 import shutil
 import pytest
 import json
+import time
 from benchmarks.vision.rendering import VisionRenderer, RenderParams
 from adapters.dummy_vision import DummyVisionAdapter
+from benchmarks.vision.blob_store import BlobStore, RenderCache
+from benchmarks.vision.metadata import (
+    IMAGE_METADATA_FILE,
+    IMAGE_METADATA_LOG,
+    append_image_metadata,
+    compact_image_metadata,
+    read_image_metadata,
+)
 
 # Mock prompt
 class MockPrompt:
@@ -45,16 +54,179 @@ def test_image_capture():
     assert result.image_path is not None
     assert os.path.exists(result.image_path)
     
-    # Check metadata
-    meta_path = os.path.join(renderer.metadata_dir, "IMAGE_METADATA.json")
-    assert os.path.exists(meta_path)
+    # Check metadata (appended to the log until the run is compacted)
+    assert os.path.exists(os.path.join(renderer.metadata_dir, IMAGE_METADATA_LOG))
     
-    with open(meta_path, "r") as f:
-        data = json.load(f)
-        assert len(data) == 1
-        assert data[0]["prompt_id"] == "test_prompt_01"
-        assert data[0]["prompt_hash"] == renderer.generate_prompt_hash(prompt.prompt_text, prompt.prompt_id, params)
+    data = read_image_metadata(renderer.metadata_dir)
+    assert len(data) == 1
+    assert data[0]["prompt_id"] == "test_prompt_01"
+    assert data[0]["prompt_hash"] == renderer.generate_prompt_hash(prompt.prompt_text, prompt.prompt_id, params)
 
     # Cleanup
     if os.path.exists(renderer.base_dir):
         shutil.rmtree(renderer.base_dir)
+
+def _entry(prompt_id, timestamp="2026-01-01T00:00:00"):
+    return {"prompt_id": prompt_id, "prompt_hash": f"hash_{prompt_id}", "timestamp": timestamp}
+
+def test_metadata_log_compaction(tmp_path):
+    metadata_dir = str(tmp_path)
+    for i in range(3):
+        append_image_metadata(metadata_dir, _entry(f"p{i}"))
+    # An interrupted append leaves a partial last line behind
+    with open(tmp_path / IMAGE_METADATA_LOG, "a") as f:
+        f.write('{"prompt_id": "p3", "prompt_ha')
+
+    assert [e["prompt_id"] for e in read_image_metadata(metadata_dir)] == ["p0", "p1", "p2"]
+
+    assert compact_image_metadata(metadata_dir) == 3
+    assert not os.path.exists(tmp_path / IMAGE_METADATA_LOG)
+    with open(tmp_path / IMAGE_METADATA_FILE) as f:
+        assert [e["prompt_id"] for e in json.load(f)] == ["p0", "p1", "p2"]
+
+    # New renders append after the compacted entries
+    append_image_metadata(metadata_dir, _entry("p4"))
+    assert [e["prompt_id"] for e in read_image_metadata(metadata_dir)] == ["p0", "p1", "p2", "p4"]
+
+def test_metadata_reader_accepts_legacy_format(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_image_metadata(str(tmp_path))
+
+    legacy = [_entry("p0"), _entry("p1")]
+    with open(tmp_path / IMAGE_METADATA_FILE, "w") as f:
+        json.dump(legacy, f, indent=2)
+    assert read_image_metadata(str(tmp_path)) == legacy
+
+    # Log entries already folded into the JSON file are not read twice
+    append_image_metadata(str(tmp_path), _entry("p1"))
+    append_image_metadata(str(tmp_path), _entry("p2"))
+    assert [e["prompt_id"] for e in read_image_metadata(str(tmp_path))] == ["p0", "p1", "p2"]
+
+def test_save_run_metadata_compacts_log():
+    renderer = VisionRenderer(adapter=DummyVisionAdapter(model_name="test"), run_id="test_run_compact")
+    try:
+        for i in range(3):
+            prompt = MockPrompt()
+            prompt.prompt_id = f"test_prompt_{i:02d}"
+            renderer.render_prompt(prompt, RenderParams(seed=i))
+        renderer.save_run_metadata(dataset_version="t2i_v0.1")
+
+        assert not os.path.exists(os.path.join(renderer.metadata_dir, IMAGE_METADATA_LOG))
+        with open(os.path.join(renderer.metadata_dir, IMAGE_METADATA_FILE)) as f:
+            assert [e["prompt_id"] for e in json.load(f)] == ["test_prompt_00", "test_prompt_01", "test_prompt_02"]
+    finally:
+        shutil.rmtree(renderer.base_dir, ignore_errors=True)
+
+class SlowVisionAdapter(DummyVisionAdapter):
+    """Later prompts finish first; one prompt fails."""
+    def render_image(self, prompt: str, **params):
+        if prompt == "fail":
+            raise RuntimeError("provider error")
+        time.sleep(0.005 * (12 - int(prompt.rsplit(" ", 1)[-1])))
+        result = super().render_image(prompt, **params)
+        result.image_bytes = prompt.encode("utf-8")
+        return result
+
+def _batch_prompts(n):
+    prompts = []
+    for i in range(n):
+        prompt = MockPrompt()
+        prompt.prompt_id = f"batch_prompt_{i:02d}"
+        prompt.prompt_text = "fail" if i == 3 else f"A test prompt {i}"
+        prompts.append(prompt)
+    return prompts
+
+def _rendered_run(run_id, concurrency):
+    renderer = VisionRenderer(adapter=SlowVisionAdapter(model_name="test"), run_id=run_id)
+    outcomes = [
+        (p.prompt_id, error is None)
+        for p, result, error in renderer.render_batch(_batch_prompts(12), RenderParams(seed=1), concurrency=concurrency)
+    ]
+    renderer.save_run_metadata(dataset_version="t2i_v0.1")
+    metadata = [{k: v for k, v in e.items() if k != "timestamp"} for e in read_image_metadata(renderer.metadata_dir)]
+    images = {}
+    for name in sorted(os.listdir(renderer.images_dir)):
+        with open(os.path.join(renderer.images_dir, name), "rb") as f:
+            images[name] = f.read()
+    shutil.rmtree(renderer.base_dir)
+    return outcomes, metadata, images
+
+def test_concurrent_batch_matches_serial():
+    serial = _rendered_run("test_run_batch_serial", concurrency=1)
+    concurrent = _rendered_run("test_run_batch_concurrent", concurrency=6)
+
+    assert concurrent == serial
+    outcomes, metadata, images = serial
+    assert [ok for _, ok in outcomes].count(False) == 1
+    assert [m["prompt_id"] for m in metadata] == [pid for pid, ok in outcomes if ok]
+    assert len(images) == 11
+
+class CountingVisionAdapter(DummyVisionAdapter):
+    calls = 0
+    def render_image(self, prompt: str, **params):
+        CountingVisionAdapter.calls += 1
+        return super().render_image(prompt, **params)
+
+def test_seeded_renders_are_deduplicated_across_runs(tmp_path):
+    blob_store = BlobStore(str(tmp_path / "blobs"))
+    render_cache = RenderCache(str(tmp_path / "render_cache.sqlite"))
+    CountingVisionAdapter.calls = 0
+
+    paths = []
+    run_dirs = []
+    try:
+        for run_id in ("test_run_blob_a", "test_run_blob_b"):
+            renderer = VisionRenderer(
+                adapter=CountingVisionAdapter(model_name="test"), run_id=run_id, provider="dummy",
+                blob_store=blob_store, render_cache=render_cache
+            )
+            run_dirs.append(renderer.base_dir)
+            paths.append(renderer.render_prompt(MockPrompt(), RenderParams(seed=7)).image_path)
+
+        # The second run reused the first render without calling the adapter
+        assert CountingVisionAdapter.calls == 1
+        assert os.path.samefile(paths[0], paths[1])
+        meta = read_image_metadata(os.path.join(run_dirs[1], "metadata"))[0]
+        assert meta["render_cache_hit"] is True
+        assert os.path.samefile(paths[1], blob_store.path(meta["image_sha256"]))
+
+        # Unseeded renders always call the adapter, but still share the blob
+        renderer = VisionRenderer(
+            adapter=CountingVisionAdapter(model_name="test"), run_id="test_run_blob_c", provider="dummy",
+            blob_store=blob_store, render_cache=render_cache
+        )
+        run_dirs.append(renderer.base_dir)
+        renderer.render_prompt(MockPrompt(), RenderParams())
+        renderer.render_prompt(MockPrompt(), RenderParams())
+        assert CountingVisionAdapter.calls == 3
+        assert len(os.listdir(renderer.images_dir)) == 1
+    finally:
+        render_cache.close()
+        for run_dir in run_dirs:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+def test_render_cache_modes(tmp_path):
+    blob_store = BlobStore(str(tmp_path / "blobs"))
+    render_cache = RenderCache(str(tmp_path / "render_cache.sqlite"))
+    CountingVisionAdapter.calls = 0
+    renderer = VisionRenderer(
+        adapter=CountingVisionAdapter(model_name="test"), run_id="test_run_cache_modes", provider="dummy",
+        blob_store=blob_store, render_cache=render_cache, cache_mode="read"
+    )
+    try:
+        # 'read' never records renders, so nothing is reused
+        renderer.render_prompt(MockPrompt(), RenderParams(seed=7))
+        renderer.render_prompt(MockPrompt(), RenderParams(seed=7))
+        assert CountingVisionAdapter.calls == 2
+
+        renderer.cache_mode = "write"
+        renderer.render_prompt(MockPrompt(), RenderParams(seed=7))
+        renderer.render_prompt(MockPrompt(), RenderParams(seed=7))
+        assert CountingVisionAdapter.calls == 4
+
+        renderer.cache_mode = "readwrite"
+        renderer.render_prompt(MockPrompt(), RenderParams(seed=7))
+        assert CountingVisionAdapter.calls == 4
+    finally:
+        render_cache.close()
+        shutil.rmtree(renderer.base_dir, ignore_errors=True)
@@ -5,8 +5,24 @@ import { RunSummary } from './types';
 
 const API_BASE = '/api';
 
-export async function fetchRuns(): Promise<RunSummary[]> {
-  const response = await fetch(`${API_BASE}/runs`);
+export interface RunQuery {
+  domain?: string;
+  model?: string;
+  provider?: string;
+  sort?: 'timestamp' | 'overallScore' | 'runId' | 'domain' | 'model' | 'provider';
+  order?: 'asc' | 'desc';
+  offset?: number;
+  limit?: number;
+}
+
+export async function fetchRuns(query: RunQuery = {}): Promise<RunSummary[]> {
+  const params = new URLSearchParams();
+  Object.entries(query).forEach(([key, value]) => {
+    if (value !== undefined) params.set(key, String(value));
+  });
+  const suffix = params.toString() ? `?${params}` : '';
+  // The browser revalidates with If-None-Match, so unchanged listings come back as 304s
+  const response = await fetch(`${API_BASE}/runs${suffix}`);
   if (!response.ok) {
     throw new Error('Failed to fetch runs');
   }